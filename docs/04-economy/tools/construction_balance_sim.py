@@ -5,16 +5,34 @@ Usage:
   python3 04-economy/tools/construction_balance_sim.py
   python3 04-economy/tools/construction_balance_sim.py --check
   python3 04-economy/tools/construction_balance_sim.py --format json --scenario growth
+  python3 04-economy/tools/construction_balance_sim.py --config axes.json --format ndjson --check
+  python3 04-economy/tools/construction_balance_sim.py --uncertainty --samples 200000 --check
+
+Configs may declare `scenario_axes`: every base scenario is expanded lazily
+into the cartesian product of the axis levels (for example biome x tier x
+demand regime). `--format ndjson` streams one row per line and `--check`
+then evaluates thresholds row by row, so memory stays flat however many rows
+the axes produce.
+
+`--uncertainty` replaces point estimates with the distributions declared in
+the config's `uncertainty` section and reports, per (scenario, building),
+net-benefit and payback quantiles plus the probability of breaching each
+`default_targets` band. `--check` then fails when any breach probability
+exceeds `uncertainty.max_breach_probability`.
 """
 
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
+import math
 import pathlib
+import random
 import sys
+from array import array
 from collections import defaultdict
-from typing import Any
+from typing import Any, Iterable, Iterator, TextIO
 
 DEFAULT_CONFIG_PATH = pathlib.Path(__file__).with_name("construction_balance_config.v1.json")
 
@@ -38,119 +56,162 @@ def capex_energy_equivalent(building: dict[str, Any], resource_energy_values: di
     return total
 
 
-def gross_benefit_per_100(
-    building: dict[str, Any],
-    scenario: dict[str, Any],
-    effect_coefficients: dict[str, float],
-) -> float:
+def benefit_terms(building: dict[str, Any]) -> list[tuple[str, str | None, float]]:
+    """A building's gross benefit as `(scenario field, effect coefficient, factor)` terms.
+
+    Gross benefit per 100 blocks is the sum of `scenario[field] * coefficient *
+    factor`, with a missing coefficient counting as 1.
+    """
     effect = building["effect"]
     kind = effect["kind"]
-
-    if kind == "ore_conversion_multiplier":
-        return float(scenario["ore_energy_base_per_100"]) * delta_from_bp(float(effect["bp"]))
-
-    if kind == "plant_conversion_multiplier":
-        return float(scenario["plant_energy_base_per_100"]) * delta_from_bp(float(effect["bp"]))
-
-    if kind == "plant_regrowth_multiplier":
-        realization = float(effect_coefficients.get("greenhouse_realization", 1.0))
-        base = float(scenario["plant_energy_base_per_100"]) * realization
-        return base * delta_from_bp(float(effect["bp"]))
-
-    if kind == "mining_stress_reduction":
-        capture = float(effect_coefficients.get("shoring_risk_capture", 1.0))
-        base = float(scenario["collapse_risk_loss_energy_per_100"])
-        return base * capture * delta_from_bp(float(effect["bp"]))
-
     if kind == "construction_efficiency":
-        spend_gain = float(scenario["construction_spend_energy_per_100"]) * float(effect["discount_bp"]) / 10_000.0
-        delay_gain = float(scenario["build_delay_value_energy_per_100"]) * float(effect["time_cut_bp"]) / 10_000.0
-        return spend_gain + delay_gain
-
-    if kind == "logistics_capacity":
-        base = float(scenario["capacity_choke_energy_per_100"])
-        return base * delta_from_bp(float(effect["bp"]))
-
-    if kind == "defense_efficiency":
-        capture = float(effect_coefficients.get("watchtower_loss_capture", 1.0))
-        base = float(scenario["claim_loss_energy_per_100"])
-        return base * capture * delta_from_bp(float(effect["bp"]))
+        return [
+            ("construction_spend_energy_per_100", None, float(effect["discount_bp"]) / 10_000.0),
+            ("build_delay_value_energy_per_100", None, float(effect["time_cut_bp"]) / 10_000.0),
+        ]
+    terms = {
+        "ore_conversion_multiplier": ("ore_energy_base_per_100", None),
+        "plant_conversion_multiplier": ("plant_energy_base_per_100", None),
+        "plant_regrowth_multiplier": ("plant_energy_base_per_100", "greenhouse_realization"),
+        "mining_stress_reduction": ("collapse_risk_loss_energy_per_100", "shoring_risk_capture"),
+        "logistics_capacity": ("capacity_choke_energy_per_100", None),
+        "defense_efficiency": ("claim_loss_energy_per_100", "watchtower_loss_capture"),
+    }
+    if kind not in terms:
+        raise ValueError(f"Unsupported effect kind: {kind}")
+    field, coefficient = terms[kind]
+    return [(field, coefficient, delta_from_bp(float(effect["bp"])))]
 
-    raise ValueError(f"Unsupported effect kind: {kind}")
 
-
-def simulate(config: dict[str, Any]) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+def gross_benefit_per_100(
+    building: dict[str, Any],
+    scenario: dict[str, Any],
+    effect_coefficients: dict[str, float],
+) -> float:
+    gross = 0.0
+    for field, coefficient, factor in benefit_terms(building):
+        value = float(scenario[field])
+        if coefficient is not None:
+            value *= float(effect_coefficients.get(coefficient, 1.0))
+        gross += value * factor
+    return gross
+
+
+def iter_scenarios(config: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield each base scenario expanded over the declared `scenario_axes`.
+
+    `scenario_axes` is a list of `{"name", "levels"}`; each level has an `id`
+    and optional `multipliers` (field -> factor) and `overrides` (field ->
+    value), applied in axis order. Expanded ids are `base/level/level/...`.
+    Without axes the base scenarios are yielded unchanged.
+    """
+    axes = config.get("scenario_axes", [])
+    for axis in axes:
+        if not axis.get("levels"):
+            raise ValueError(f"Scenario axis {axis.get('name')!r} declares no levels")
+    for base in config["scenarios"]:
+        if not axes:
+            yield base
+            continue
+        for levels in itertools.product(*(axis["levels"] for axis in axes)):
+            scenario = dict(base)
+            for level in levels:
+                for field, factor in level.get("multipliers", {}).items():
+                    scenario[field] = float(scenario[field]) * float(factor)
+                scenario.update(level.get("overrides", {}))
+            scenario["id"] = "/".join([base["id"], *(level["id"] for level in levels)])
+            scenario["base_id"] = base["id"]
+            yield scenario
+
+
+def iter_rows(config: dict[str, Any], scenario_ids: set[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Lazily yield one row per (scenario, building), optionally for matching scenario or base ids."""
     resource_values: dict[str, float] = config["resource_energy_values"]
     effect_coeffs: dict[str, float] = config.get("effect_coefficients", {})
+    buildings = [
+        (
+            building,
+            capex_energy_equivalent(building, resource_values),
+            float(building.get("upkeep_per_100_blocks", 0.0)),
+        )
+        for building in config["buildings"]
+    ]
 
-    for scenario in config["scenarios"]:
+    for scenario in iter_scenarios(config):
         scenario_id = scenario["id"]
-        for building in config["buildings"]:
-            building_id = building["id"]
-            capex = capex_energy_equivalent(building, resource_values)
+        if scenario_ids and scenario_id not in scenario_ids and scenario.get("base_id") not in scenario_ids:
+            continue
+        for building, capex, upkeep in buildings:
             gross = gross_benefit_per_100(building, scenario, effect_coeffs)
-            upkeep = float(building.get("upkeep_per_100_blocks", 0.0))
             net = gross - upkeep
 
             payback_blocks = None
             if net > 0:
                 payback_blocks = float(building.get("build_time_blocks", 0.0)) + (capex / net) * 100.0
 
-            rows.append(
-                {
-                    "scenario_id": scenario_id,
-                    "building_id": building_id,
-                    "capex_energy_equivalent": capex,
-                    "gross_benefit_per_100": gross,
-                    "upkeep_per_100": upkeep,
-                    "net_benefit_per_100": net,
-                    "payback_blocks": payback_blocks,
-                }
-            )
+            yield {
+                "scenario_id": scenario_id,
+                "building_id": building["id"],
+                "capex_energy_equivalent": capex,
+                "gross_benefit_per_100": gross,
+                "upkeep_per_100": upkeep,
+                "net_benefit_per_100": net,
+                "payback_blocks": payback_blocks,
+            }
 
-    return rows
 
+def simulate(config: dict[str, Any]) -> list[dict[str, Any]]:
+    return list(iter_rows(config))
 
-def assess_thresholds(rows: list[dict[str, Any]], targets: dict[str, Any]) -> list[dict[str, Any]]:
-    violations: list[dict[str, Any]] = []
+
+def assess_row(row: dict[str, Any], targets: dict[str, Any]) -> dict[str, Any] | None:
+    """Threshold violation for one row, or None if it is within the targets."""
     payback_min = targets.get("payback_min_blocks")
     payback_max = targets.get("payback_max_blocks")
     min_net = targets.get("min_net_benefit_per_100")
 
-    for row in rows:
-        reasons: list[str] = []
-        if min_net is not None and row["net_benefit_per_100"] < float(min_net):
-            reasons.append(
-                f"net below target ({row['net_benefit_per_100']:.2f} < {float(min_net):.2f})"
-            )
+    reasons: list[str] = []
+    if min_net is not None and row["net_benefit_per_100"] < float(min_net):
+        reasons.append(
+            f"net below target ({row['net_benefit_per_100']:.2f} < {float(min_net):.2f})"
+        )
+
+    payback = row["payback_blocks"]
+    if payback is None:
+        reasons.append("payback undefined (non-positive net)")
+    else:
+        if payback_min is not None and payback < float(payback_min):
+            reasons.append(f"payback below floor ({payback:.2f} < {float(payback_min):.2f})")
+        if payback_max is not None and payback > float(payback_max):
+            reasons.append(f"payback above ceiling ({payback:.2f} > {float(payback_max):.2f})")
+
+    if not reasons:
+        return None
+    return {
+        "scenario_id": row["scenario_id"],
+        "building_id": row["building_id"],
+        "reason": "; ".join(reasons),
+        "row": row,
+    }
 
-        payback = row["payback_blocks"]
-        if payback is None:
-            reasons.append("payback undefined (non-positive net)")
-        else:
-            if payback_min is not None and payback < float(payback_min):
-                reasons.append(f"payback below floor ({payback:.2f} < {float(payback_min):.2f})")
-            if payback_max is not None and payback > float(payback_max):
-                reasons.append(f"payback above ceiling ({payback:.2f} > {float(payback_max):.2f})")
-
-        if reasons:
-            violations.append(
-                {
-                    "scenario_id": row["scenario_id"],
-                    "building_id": row["building_id"],
-                    "reason": "; ".join(reasons),
-                    "row": row,
-                }
-            )
 
+def assess_thresholds(rows: list[dict[str, Any]], targets: dict[str, Any]) -> list[dict[str, Any]]:
+    violations: list[dict[str, Any]] = []
+    for row in rows:
+        violation = assess_row(row, targets)
+        if violation is not None:
+            violations.append(violation)
     return violations
 
 
 def filter_rows(rows: list[dict[str, Any]], scenario_ids: set[str]) -> list[dict[str, Any]]:
     if not scenario_ids:
         return rows
-    return [row for row in rows if row["scenario_id"] in scenario_ids]
+    return [
+        row
+        for row in rows
+        if row["scenario_id"] in scenario_ids or row["scenario_id"].split("/", 1)[0] in scenario_ids
+    ]
 
 
 def render_markdown(rows: list[dict[str, Any]], precision: int = 2) -> str:
@@ -184,20 +245,327 @@ def render_markdown(rows: list[dict[str, Any]], precision: int = 2) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
+# Monte Carlo uncertainty mode ------------------------------------------------
+
+DISTRIBUTIONS = ("fixed", "uniform", "triangular", "normal", "lognormal")
+QUANTILES = (("p05", 0.05), ("p50", 0.5), ("p95", 0.95))
+DEFAULT_SAMPLES = 100_000
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_RESERVOIR_SIZE = 20_000
+DEFAULT_MAX_BREACH_PROBABILITY = 0.1
+
+
+def draw(spec: dict[str, Any] | float, count: int, rng: random.Random) -> list[float]:
+    """`count` samples of a declared distribution (normal draws are floored at 0)."""
+    if not isinstance(spec, dict):
+        return [float(spec)] * count
+    dist = spec.get("dist")
+    if dist == "fixed":
+        return [float(spec["value"])] * count
+    if dist == "uniform":
+        low, high = float(spec["low"]), float(spec["high"])
+        return [low + (high - low) * rng.random() for _ in range(count)]
+    if dist == "triangular":
+        low, mode, high = float(spec["low"]), float(spec["mode"]), float(spec["high"])
+        return [rng.triangular(low, high, mode) for _ in range(count)]
+    if dist == "normal":
+        mean, sd = float(spec["mean"]), float(spec["sd"])
+        return [max(0.0, rng.gauss(mean, sd)) for _ in range(count)]
+    if dist == "lognormal":
+        mu, sigma = math.log(float(spec["median"])), float(spec["sigma"])
+        return [rng.lognormvariate(mu, sigma) for _ in range(count)]
+    raise ValueError(f"Unsupported distribution {dist!r}; expected one of {', '.join(DISTRIBUTIONS)}")
+
+
+class Reservoir:
+    """Uniform fixed-size sample of parallel columns (Algorithm L).
+
+    Holds every row until `size` rows have been seen, so quantiles are exact up
+    to that and sampled beyond it. Skips are drawn geometrically, so the cost of
+    a batch is about `size * log(seen / size)` draws in total, not one per row.
+    """
+
+    def __init__(self, size: int, width: int, rng: random.Random) -> None:
+        self.size = size
+        self.columns = [array("d") for _ in range(width)]
+        self.seen = 0
+        self._rng = rng
+        self._weight = 1.0
+        self._next = size - 1
+
+    def extend(self, *columns: list[float]) -> None:
+        start, rng, size = self.seen, self._rng, self.size
+        self.seen += len(columns[0])
+        room = size - len(self.columns[0])
+        if room > 0:
+            for kept, column in zip(self.columns, columns):
+                kept.extend(column[:room])
+            if len(self.columns[0]) == size:
+                self._skip()
+        while self._next < self.seen:
+            slot = rng.randrange(size)
+            for kept, column in zip(self.columns, columns):
+                kept[slot] = column[self._next - start]
+            self._skip()
+
+    def _skip(self) -> None:
+        rng = self._rng
+        self._weight *= math.exp(math.log(max(rng.random(), 1e-300)) / self.size)
+        self._next += int(math.log(max(rng.random(), 1e-300)) / math.log1p(-self._weight)) + 1
+
+
+def _quantile(ordered: array, q: float) -> float | None:
+    value = ordered[int(q * (len(ordered) - 1))]
+    return None if math.isinf(value) else value
+
+
+def iter_uncertainty(
+    config: dict[str, Any],
+    *,
+    samples: int | None = None,
+    seed: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    reservoir_size: int | None = None,
+    scenario_ids: set[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Lazily yield Monte Carlo payback and net-benefit rows per (scenario, building).
+
+    `config["uncertainty"]` declares distributions for `resource_energy_values`
+    and `effect_coefficients` (absolute values) and `scenario_multipliers`
+    (a factor on each scenario's point estimate, drawn per scenario). Inputs
+    without a distribution keep their point value. Every scenario replays the
+    same value and coefficient draws, so scenarios differ only by their own
+    multipliers. Samples are drawn in column batches of `batch_size`.
+
+    Scenarios are expanded one at a time and their rows yielded when done.
+    Breach counts and the mean are running totals, and quantiles come from a
+    `reservoir_size` sample per (scenario, building), so memory does not grow
+    with `samples` or with the number of scenarios.
+    """
+    uncertainty = config.get("uncertainty")
+    if not uncertainty:
+        raise ValueError("Config declares no `uncertainty` section")
+    samples = int(samples if samples is not None else uncertainty.get("samples", DEFAULT_SAMPLES))
+    reservoir_size = int(
+        reservoir_size if reservoir_size is not None else uncertainty.get("reservoir_size", DEFAULT_RESERVOIR_SIZE)
+    )
+    if samples <= 0 or batch_size <= 0 or reservoir_size <= 0:
+        raise ValueError("samples, batch_size and reservoir_size must be positive")
+    seed = seed if seed is not None else uncertainty.get("seed", 0)
+    targets = config.get("default_targets", {})
+    min_net = targets.get("min_net_benefit_per_100")
+    floor = targets.get("payback_min_blocks")
+    ceiling = targets.get("payback_max_blocks")
+    min_net = -math.inf if min_net is None else float(min_net)
+    floor = -math.inf if floor is None else float(floor)
+    ceiling = math.inf if ceiling is None else float(ceiling)
+
+    value_specs = {**config["resource_energy_values"], **uncertainty.get("resource_energy_values", {})}
+    coefficient_specs = {**config.get("effect_coefficients", {}), **uncertainty.get("effect_coefficients", {})}
+    multiplier_specs = uncertainty.get("scenario_multipliers", {})
+    buildings = [
+        (
+            building,
+            benefit_terms(building),
+            float(building.get("upkeep_per_100_blocks", 0.0)),
+            float(building.get("build_time_blocks", 0.0)),
+        )
+        for building in config["buildings"]
+    ]
+    for building in config["buildings"]:
+        capex_energy_equivalent(building, config["resource_energy_values"])  # validates recipe items
+
+    for scenario in iter_scenarios(config):
+        if scenario_ids and scenario["id"] not in scenario_ids and scenario.get("base_id") not in scenario_ids:
+            continue
+        rng = random.Random(seed)
+        multiplier_rng = random.Random(f"{seed}/{scenario['id']}")
+        stats = {
+            b["id"]: {
+                "sample": Reservoir(reservoir_size, 2, random.Random(f"{seed}/{scenario['id']}/{b['id']}")),
+                "net_sum": 0.0,
+                "counts": [0, 0, 0, 0, 0],
+            }
+            for b, *_ in buildings
+        }
+        drawn = 0
+        while drawn < samples:
+            n = min(batch_size, samples - drawn)
+            drawn += n
+            values = {item: draw(spec, n, rng) for item, spec in value_specs.items()}
+            coefficients = {name: draw(spec, n, rng) for name, spec in coefficient_specs.items()}
+            fields: dict[str, list[float]] = {}
+            for building, terms, upkeep, build_time in buildings:
+                capex = [float(building.get("energy_stake", 0.0))] * n
+                for item, qty in building.get("recipe", {}).items():
+                    qty = float(qty)
+                    capex = [c + qty * v for c, v in zip(capex, values[item])]
+                gross = [0.0] * n
+                for field, coefficient, factor in terms:
+                    if field not in fields:
+                        base = float(scenario[field])
+                        spec = multiplier_specs.get(field)
+                        fields[field] = [base * m for m in draw(spec, n, multiplier_rng)] if spec else [base] * n
+                    column = fields[field]
+                    if coefficient is not None:
+                        column = [x * c for x, c in zip(column, coefficients.get(coefficient, [1.0] * n))]
+                    gross = [g + x * factor for g, x in zip(gross, column)]
+                net = [g - upkeep for g in gross]
+                payback = [build_time + c / x * 100.0 if x > 0 else math.inf for c, x in zip(capex, net)]
+                entry = stats[building["id"]]
+                entry["sample"].extend(net, payback)
+                entry["net_sum"] += math.fsum(net)
+                counts = entry["counts"]
+                counts[0] += sum(1 for x in net if x < min_net)
+                counts[1] += sum(1 for p in payback if math.isinf(p))
+                counts[2] += sum(1 for p in payback if p < floor)
+                counts[3] += sum(1 for p in payback if ceiling < p < math.inf)
+                counts[4] += sum(
+                    1 for x, p in zip(net, payback) if x < min_net or math.isinf(p) or p < floor or p > ceiling
+                )
+
+        for building_id, entry in stats.items():
+            net, payback = (array("d", sorted(column)) for column in entry["sample"].columns)
+            row: dict[str, Any] = {"scenario_id": scenario["id"], "building_id": building_id, "samples": samples}
+            row["net_mean"] = entry["net_sum"] / samples
+            for name, q in QUANTILES:
+                row[f"net_{name}"] = _quantile(net, q)
+            for name, q in QUANTILES:
+                row[f"payback_{name}"] = _quantile(payback, q)
+            for key, count in zip(
+                (
+                    "p_net_below_target",
+                    "p_payback_undefined",
+                    "p_payback_below_floor",
+                    "p_payback_above_ceiling",
+                    "p_breach",
+                ),
+                entry["counts"],
+            ):
+                row[key] = count / samples
+            yield row
+
+
+def simulate_uncertainty(config: dict[str, Any], **kwargs: Any) -> list[dict[str, Any]]:
+    return list(iter_uncertainty(config, **kwargs))
+
+
+def assess_uncertainty(rows: list[dict[str, Any]], max_breach_probability: float) -> list[dict[str, Any]]:
+    """Rows whose probability of breaching any target band exceeds `max_breach_probability`."""
+    return [
+        {
+            "scenario_id": row["scenario_id"],
+            "building_id": row["building_id"],
+            "reason": f"breach probability {row['p_breach']:.3f} > {max_breach_probability:.3f}",
+            "row": row,
+        }
+        for row in rows
+        if row["p_breach"] > max_breach_probability
+    ]
+
+
+def render_uncertainty_markdown(rows: list[dict[str, Any]], precision: int = 2) -> str:
+    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        grouped[row["scenario_id"]].append(row)
+
+    def fmt(value: float | None) -> str:
+        return "n/a" if value is None else f"{value:.{precision}f}"
+
+    lines: list[str] = []
+    for scenario_id in sorted(grouped):
+        lines.append(f"## Scenario: {scenario_id} (Monte Carlo)")
+        lines.append(
+            "| Building | Net/100 p05 | p50 | p95 | Payback p05 | p50 | p95 "
+            "| P(net < target) | P(payback < floor) | P(payback > ceiling) | P(undefined) | P(breach) |"
+        )
+        lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+        for row in sorted(grouped[scenario_id], key=lambda item: item["building_id"]):
+            cells = [row["building_id"]]
+            cells += [fmt(row[f"net_{name}"]) for name, _ in QUANTILES]
+            cells += [fmt(row[f"payback_{name}"]) for name, _ in QUANTILES]
+            cells += [
+                f"{row[key]:.3f}"
+                for key in (
+                    "p_net_below_target",
+                    "p_payback_below_floor",
+                    "p_payback_above_ceiling",
+                    "p_payback_undefined",
+                    "p_breach",
+                )
+            ]
+            lines.append("| " + " | ".join(cells) + " |")
+        lines.append("")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run construction balance simulations")
     parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Path to JSON config")
-    parser.add_argument("--scenario", action="append", default=[], help="Scenario id filter (repeatable)")
-    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    parser.add_argument(
+        "--scenario", action="append", default=[], help="Scenario or base scenario id filter (repeatable)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=("markdown", "json", "ndjson"),
+        default="markdown",
+        help="ndjson streams rows (and --check results) without holding them in memory",
+    )
     parser.add_argument("--round", type=int, default=2, dest="precision")
-    parser.add_argument("--check", action="store_true", help="Exit non-zero if thresholds are violated")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit non-zero if thresholds are violated (with --uncertainty: if any breach probability is too high)",
+    )
+    parser.add_argument(
+        "--uncertainty", action="store_true", help="Monte Carlo over the config's `uncertainty` distributions"
+    )
+    parser.add_argument("--samples", type=int, default=None, help="Monte Carlo samples (default: config or 100000)")
+    parser.add_argument("--seed", type=int, default=None, help="Monte Carlo seed (default: config or 0)")
     return parser.parse_args(argv)
 
 
+def write_ndjson(
+    rows: Iterable[dict[str, Any]],
+    out: TextIO,
+    targets: dict[str, Any] | None = None,
+    errors: TextIO | None = None,
+) -> int:
+    """Stream rows as NDJSON; with `targets`, report violations as they appear.
+
+    Returns the number of threshold violations (0 when not checking).
+    """
+    violations = 0
+    for row in rows:
+        out.write(json.dumps(row) + "\n")
+        if targets is None:
+            continue
+        violation = assess_row(row, targets)
+        if violation is not None:
+            if violations == 0 and errors is not None:
+                print("Threshold violations:", file=errors)
+            violations += 1
+            if errors is not None:
+                print(
+                    f"- {violation['scenario_id']}::{violation['building_id']}: {violation['reason']}",
+                    file=errors,
+                )
+    return violations
+
+
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
     config = load_config(args.config)
 
+    if args.uncertainty:
+        return run_uncertainty(config, args)
+
+    if args.format == "ndjson":
+        targets = config.get("default_targets", {}) if args.check else None
+        violations = write_ndjson(iter_rows(config, set(args.scenario)), sys.stdout, targets, sys.stderr)
+        return 1 if violations else 0
+
     rows = simulate(config)
     rows = filter_rows(rows, set(args.scenario))
 
@@ -220,5 +588,37 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
+def run_uncertainty(config: dict[str, Any], args: argparse.Namespace) -> int:
+    rows = iter_uncertainty(config, samples=args.samples, seed=args.seed, scenario_ids=set(args.scenario))
+    limit = float(config["uncertainty"].get("max_breach_probability", DEFAULT_MAX_BREACH_PROBABILITY))
+
+    violations: list[dict[str, Any]] = []
+    if args.format == "ndjson":
+        # Rows stream as each scenario finishes.
+        for row in rows:
+            print(json.dumps(row), flush=True)
+            if args.check:
+                violations.extend(assess_uncertainty([row], limit))
+    else:
+        rows = list(rows)
+        if args.format == "json":
+            print(json.dumps(rows, indent=2))
+        else:
+            print(render_uncertainty_markdown(rows, precision=args.precision))
+        if args.check:
+            violations = assess_uncertainty(rows, limit)
+
+    if violations:
+        print("Breach probability violations:", file=sys.stderr)
+        for violation in violations:
+            print(
+                f"- {violation['scenario_id']}::{violation['building_id']}: {violation['reason']}",
+                file=sys.stderr,
+            )
+        return 1
+
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""Hex-portfolio building optimizer for the 7-building construction loop.
+
+`construction_balance_sim.py` scores each building in isolation. This tool
+answers the operator question: given per-hex scenario parameters and one
+shared stockpile of construction items, which building goes on which hex?
+
+The problem is a multiple-choice multi-dimensional knapsack: every hex has
+`slots` building slots (default 1, at most one building of each kind per
+hex), every building consumes its recipe from the shared budget, and the
+objective is total `net_benefit_per_100`. Steps:
+
+1. Build the (hex x building) net-benefit matrix in one pass with the balance
+   simulator's benefit formulas.
+2. Relax the budget with Lagrange multipliers (one price per item) and run
+   subgradient descent. Priced this way every hex decouples into "take the
+   best buildings whose benefit beats their priced recipe", which gives an
+   upper bound and a primal candidate at each step (repaired to fit the
+   budget, then greedily filled).
+3. Branch and bound over hexes, warm-started with the best candidate and
+   pruned with the Lagrangian bound, until the search completes (the plan is
+   proven within `gap_tolerance` of optimal) or `node_limit` is hit (the gap
+   to the bound is reported either way).
+
+A DP over a 9-item budget is intractable, so the Lagrangian bound stands in
+for the DP table.
+
+Usage:
+  python3 04-economy/tools/hex_portfolio_optimizer.py --generate 10000 --budget budget.json
+  python3 04-economy/tools/hex_portfolio_optimizer.py --hexes hexes.json --budget budget.json --format json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+import sys
+from itertools import combinations, repeat
+from operator import eq, sub
+from typing import Any
+
+import construction_balance_sim as sim
+
+DEFAULT_NODE_LIMIT = 100_000
+DEFAULT_ITERATIONS = 200
+DEFAULT_GAP_TOLERANCE = 1e-4
+# Scenario fields that vary per hex (everything the benefit formulas read).
+HEX_FIELDS = (
+    "ore_energy_base_per_100",
+    "plant_energy_base_per_100",
+    "collapse_risk_loss_energy_per_100",
+    "construction_spend_energy_per_100",
+    "build_delay_value_energy_per_100",
+    "capacity_choke_energy_per_100",
+    "claim_loss_energy_per_100",
+)
+
+
+def benefit_matrix(config: dict[str, Any], hexes: list[dict[str, Any]]) -> list[list[float]]:
+    """Net benefit per 100 blocks for every (hex, building) pair, hex-major."""
+    coeffs = config.get("effect_coefficients", {})
+    buildings = config["buildings"]
+    upkeep = [float(b.get("upkeep_per_100_blocks", 0.0)) for b in buildings]
+    return [
+        [sim.gross_benefit_per_100(b, hex_params, coeffs) - u for b, u in zip(buildings, upkeep)]
+        for hex_params in hexes
+    ]
+
+
+def recipe_matrix(config: dict[str, Any], items: list[str]) -> list[list[float]]:
+    """Per-building recipe quantities in `items` order."""
+    known = set(config["resource_energy_values"])
+    rows = []
+    for building in config["buildings"]:
+        recipe = building.get("recipe", {})
+        unknown = sorted(set(recipe) - known)
+        if unknown:
+            raise KeyError(f"Missing resource energy value for {', '.join(unknown)}")
+        rows.append([float(recipe.get(item, 0.0)) for item in items])
+    return rows
+
+
+def generate_hexes(config: dict[str, Any], count: int, seed: int = 0, jitter: float = 0.35) -> list[dict[str, Any]]:
+    """`count` hexes drawn from the config scenarios with each field scaled by up to +/-`jitter`."""
+    rng = random.Random(seed)
+    templates = config["scenarios"]
+    hexes = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        hex_params = {"id": f"hex_{i:05d}", "template": template["id"]}
+        for field in HEX_FIELDS:
+            hex_params[field] = float(template[field]) * (1.0 + rng.uniform(-jitter, jitter))
+        hexes.append(hex_params)
+    return hexes
+
+
+def optimize_portfolio(
+    config: dict[str, Any],
+    hexes: list[dict[str, Any]],
+    budget: dict[str, float],
+    *,
+    iterations: int = DEFAULT_ITERATIONS,
+    node_limit: int = DEFAULT_NODE_LIMIT,
+    gap_tolerance: float = DEFAULT_GAP_TOLERANCE,
+) -> dict[str, Any]:
+    """Pick buildings per hex to maximise total net benefit within `budget`.
+
+    Items missing from `budget` are unavailable. Returns the plan with its
+    value, the Lagrangian upper bound and whether the search proved the plan
+    within `gap_tolerance` (relative) of optimal.
+    """
+    items = sorted(config["resource_energy_values"])
+    unknown = sorted(set(budget) - set(items))
+    if unknown:
+        raise KeyError(f"Budget items without resource energy values: {', '.join(unknown)}")
+    capacity = [float(budget.get(item, 0.0)) for item in items]
+    if any(c < 0 for c in capacity):
+        raise ValueError("budget quantities must be non-negative")
+    slots = [int(h.get("slots", 1)) for h in hexes]
+    if any(s < 0 for s in slots):
+        raise ValueError("hex slots must be non-negative")
+    if gap_tolerance < 0:
+        raise ValueError("gap_tolerance must be non-negative")
+
+    matrix = benefit_matrix(config, hexes)
+    solver = _Solver(matrix, recipe_matrix(config, items), capacity, slots, gap_tolerance)
+    solver.relax(iterations)
+    proven = solver.branch_and_bound(node_limit)
+
+    building_ids = [b["id"] for b in config["buildings"]]
+    assignments = [
+        {"hex_id": hexes[h].get("id", h), "buildings": [building_ids[b] for b in chosen]}
+        for h, chosen in enumerate(solver.best_plan)
+        if chosen
+    ]
+    used = [capacity[k] - solver.best_remaining[k] for k in range(len(items))]
+    counts = {building_id: 0 for building_id in building_ids}
+    for chosen in solver.best_plan:
+        for b in chosen:
+            counts[building_ids[b]] += 1
+    bound = max(solver.bound, solver.best_value)
+    return {
+        "hexes": len(hexes),
+        "total_net_benefit_per_100": solver.best_value,
+        "upper_bound": bound,
+        "gap_pct": 100.0 * (bound - solver.best_value) / bound if bound > 0 else 0.0,
+        "optimal": proven,
+        "nodes": solver.nodes,
+        "building_counts": counts,
+        "resource_usage": {item: {"used": u, "budget": c} for item, u, c in zip(items, used, capacity)},
+        "item_prices": dict(zip(items, solver.prices)),
+        "assignments": assignments,
+    }
+
+
+class _Solver:
+    def __init__(
+        self,
+        matrix: list[list[float]],
+        costs: list[list[float]],
+        capacity: list[float],
+        slots: list[int],
+        gap_tolerance: float,
+    ) -> None:
+        self.matrix = matrix
+        self.costs = costs
+        self.capacity = capacity
+        self.slots = slots
+        self.gap_tolerance = gap_tolerance
+        self.width = len(costs)
+        self.dims = len(capacity)
+        self.prices = [0.0] * self.dims
+        self.bound = float("inf")
+        self.best_value = 0.0
+        self.best_plan: list[tuple[int, ...]] = [()] * len(matrix)
+        self.best_remaining = list(capacity)
+        self.nodes = 0
+        # Single-slot hexes (the common case) are priced column-wise, one pass per building.
+        self._single = [h for h, n in enumerate(slots) if n == 1]
+        self._multi = [h for h, n in enumerate(slots) if n > 1]
+        self._columns = [[matrix[h][b] for h in self._single] for b in range(self.width)]
+
+    def _priced_choice(self, prices: list[float]) -> tuple[float, list[tuple[int, ...]]]:
+        """Per-hex best buildings at `prices`; returns (sum of reduced values, plan)."""
+        priced = [sum(c * p for c, p in zip(cost, prices)) for cost in self.costs]
+        total = 0.0
+        plan: list[tuple[int, ...]] = []
+        for row, slots in zip(self.matrix, self.slots):
+            reduced = [(v - q, b) for b, (v, q) in enumerate(zip(row, priced)) if v > q]
+            if not reduced or slots == 0:
+                plan.append(())
+                continue
+            if slots == 1:
+                best = max(reduced)
+                total += best[0]
+                plan.append((best[1],))
+            else:
+                reduced.sort(reverse=True)
+                taken = reduced[:slots]
+                total += sum(r for r, _ in taken)
+                plan.append(tuple(sorted(b for _, b in taken)))
+        return total, plan
+
+    def _dual(self, prices: list[float]) -> tuple[float, list[int]]:
+        """Lagrangian value at `prices` and the building counts the priced hexes pick."""
+        priced = [sum(c * p for c, p in zip(cost, prices)) for cost in self.costs]
+        reduced = [list(map(sub, column, repeat(q))) for column, q in zip(self._columns, priced)]
+        best = list(map(max, repeat(0.0, len(self._single)), *reduced))
+        counts = [sum(map(eq, column, best)) for column in reduced]
+        total = sum(best)
+        for h in self._multi:
+            taken = sorted((v - q for v, q in zip(self.matrix[h], priced)), reverse=True)[: self.slots[h]]
+            total += sum(r for r in taken if r > 0)
+            for b, (v, q) in enumerate(zip(self.matrix[h], priced)):
+                if v - q > 0 and v - q >= taken[-1]:
+                    counts[b] += 1
+        return total + sum(p * c for p, c in zip(prices, self.capacity)), counts
+
+    def _usage(self, plan: list[tuple[int, ...]]) -> list[float]:
+        counts = [0] * self.width
+        for chosen in plan:
+            for b in chosen:
+                counts[b] += 1
+        return [sum(counts[b] * self.costs[b][k] for b in range(self.width)) for k in range(self.dims)]
+
+    def relax(self, iterations: int) -> None:
+        """Subgradient descent on item prices (Polyak steps), keeping the best bound and plan."""
+        prices = [0.0] * self.dims
+        scale = 2.0
+        stalled = 0
+        repaired = True
+        for iteration in range(max(1, iterations)):
+            bound, counts = self._dual(prices)
+            if bound < self.bound - 1e-9:
+                self.bound, self.prices, stalled, repaired = bound, list(prices), 0, False
+            else:
+                stalled += 1
+                if stalled >= 20:
+                    scale, stalled = scale / 2, 0
+            # Repairing is the expensive part; refresh the primal target now and then.
+            if not repaired and iteration % 20 == 0:
+                self._consider(self._repair(self._priced_choice(self.prices)[1], self.prices))
+                repaired = True
+            usage = [sum(n * cost[k] for n, cost in zip(counts, self.costs)) for k in range(self.dims)]
+            # Project: slack items already at price zero cannot move further down.
+            gradient = [0.0 if p == 0 and c > u else c - u for p, c, u in zip(prices, self.capacity, usage)]
+            norm = sum(g * g for g in gradient)
+            if norm == 0 or self.bound - self.best_value <= self.gap_tolerance * max(1.0, self.bound):
+                break
+            step = scale * (bound - self.best_value) / norm
+            prices = [max(0.0, p - step * g) for p, g in zip(prices, gradient)]
+        if not repaired:
+            self._consider(self._repair(self._priced_choice(self.prices)[1], self.prices))
+
+    def _repair(self, plan: list[tuple[int, ...]], prices: list[float]) -> list[tuple[int, ...]]:
+        """Drop the least efficient picks until the plan fits, then fill greedily.
+
+        Efficiency is benefit per priced recipe, with a small budget-share
+        term so free items still count.
+        """
+        plan = [list(chosen) for chosen in plan]
+        remaining = [c - u for c, u in zip(self.capacity, self._usage(plan))]
+        weights = [p + (1e-6 / c if c > 0 else 1e9) for p, c in zip(prices, self.capacity)]
+        spend = [sum(q * w for q, w in zip(cost, weights)) for cost in self.costs]
+        matrix = self.matrix
+
+        if any(r < -1e-9 for r in remaining):
+            picks = sorted(
+                ((matrix[h][b] / spend[b], h, b) for h, chosen in enumerate(plan) for b in chosen), reverse=True
+            )
+            while picks and any(r < -1e-9 for r in remaining):
+                _, h, b = picks.pop()
+                if any(r < -1e-9 and q > 0 for r, q in zip(remaining, self.costs[b])):
+                    plan[h].remove(b)
+                    remaining = [r + q for r, q in zip(remaining, self.costs[b])]
+
+        candidates = sorted(
+            (
+                (v / spend[b], h, b)
+                for h, row in enumerate(matrix)
+                if len(plan[h]) < self.slots[h]
+                for b, v in enumerate(row)
+                if v > 0 and b not in plan[h]
+            ),
+            reverse=True,
+        )
+        for _, h, b in candidates:
+            if len(plan[h]) >= self.slots[h] or b in plan[h]:
+                continue
+            cost = self.costs[b]
+            if all(q <= r + 1e-9 for q, r in zip(cost, remaining)):
+                plan[h].append(b)
+                remaining = [r - q for r, q in zip(remaining, cost)]
+        return [tuple(sorted(chosen)) for chosen in plan]
+
+    def _consider(self, plan: list[tuple[int, ...]]) -> None:
+        value = sum(self.matrix[h][b] for h, chosen in enumerate(plan) for b in chosen)
+        if value > self.best_value + 1e-9:
+            self.best_value = value
+            self.best_plan = plan
+            self.best_remaining = [c - u for c, u in zip(self.capacity, self._usage(plan))]
+
+    def branch_and_bound(self, node_limit: int) -> bool:
+        """Depth-first search over hexes; True if it finished (the best plan is optimal)."""
+        prices = self.prices
+        priced = [sum(c * p for c, p in zip(cost, prices)) for cost in self.costs]
+        options: list[list[tuple[float, float, tuple[int, ...], list[float]]]] = []
+        slack: list[float] = []  # best reduced value per hex: its share of the Lagrangian bound
+        for row, slots in zip(self.matrix, self.slots):
+            useful = [b for b, v in enumerate(row) if v > 0]
+            hex_options = []
+            for size in range(1, min(slots, len(useful)) + 1):
+                for combo in combinations(useful, size):
+                    value = sum(row[b] for b in combo)
+                    cost = [sum(self.costs[b][k] for b in combo) for k in range(self.dims)]
+                    hex_options.append((value - sum(priced[b] for b in combo), value, combo, cost))
+            hex_options.sort(key=lambda o: o[0], reverse=True)
+            options.append(hex_options)
+            slack.append(max(0.0, hex_options[0][0]) if hex_options else 0.0)
+
+        order = sorted(range(len(options)), key=lambda h: slack[h], reverse=True)
+        order = [h for h in order if options[h]]
+        suffix = [0.0] * (len(order) + 1)
+        for i in range(len(order) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + slack[order[i]]
+
+        depth = len(order)
+        pointer = [0] * (depth + 1)
+        chosen: list[tuple[float, tuple[int, ...], list[float]] | None] = [None] * depth
+        remaining = list(self.capacity)
+        value = 0.0
+        i = 0
+        tolerance = self.gap_tolerance * max(1.0, self.bound)
+        while True:
+            self.nodes += 1
+            if self.nodes > node_limit:
+                return False
+            if i == depth:
+                if value > self.best_value + 1e-9:
+                    plan: list[tuple[int, ...]] = [()] * len(self.matrix)
+                    for pos, pick in enumerate(chosen):
+                        if pick is not None:
+                            plan[order[pos]] = pick[1]
+                    self.best_value, self.best_plan, self.best_remaining = value, plan, list(remaining)
+                advance = False
+            else:
+                bound = value + suffix[i] + sum(p * r for p, r in zip(prices, remaining))
+                advance = bound > self.best_value + tolerance
+            if advance:
+                hex_options = options[order[i]]
+                k = pointer[i]
+                while k < len(hex_options) and any(q > r + 1e-9 for q, r in zip(hex_options[k][3], remaining)):
+                    k += 1
+                if k <= len(hex_options):
+                    pointer[i] = k + 1
+                    if k < len(hex_options):
+                        _, option_value, combo, cost = hex_options[k]
+                        chosen[i] = (option_value, combo, cost)
+                        value += option_value
+                        remaining = [r - q for r, q in zip(remaining, cost)]
+                    else:
+                        chosen[i] = None  # leave the hex empty
+                    i += 1
+                    pointer[i] = 0
+                    continue
+            # Backtrack to the deepest hex with untried options.
+            while True:
+                if i == 0:
+                    return True
+                i -= 1
+                pick = chosen[i]
+                if pick is not None:
+                    value -= pick[0]
+                    remaining = [r + q for r, q in zip(remaining, pick[2])]
+                    chosen[i] = None
+                if pointer[i] <= len(options[order[i]]):
+                    break
+
+
+def render_markdown(result: dict[str, Any], precision: int = 2) -> str:
+    p = precision
+    lines = [
+        "## Hex portfolio",
+        f"- Hexes: {result['hexes']}",
+        f"- Total net benefit/100: {result['total_net_benefit_per_100']:.{p}f}",
+        f"- Upper bound: {result['upper_bound']:.{p}f} (gap {result['gap_pct']:.{p}f}%, "
+        f"{'optimal' if result['optimal'] else 'node limit reached'})",
+        "",
+        "| Building | Count |",
+        "|---|---:|",
+    ]
+    for building_id, count in sorted(result["building_counts"].items()):
+        lines.append(f"| {building_id} | {count} |")
+    lines += ["", "| Item | Used | Budget | Price (E/unit) |", "|---|---:|---:|---:|"]
+    for item, usage in sorted(result["resource_usage"].items()):
+        lines.append(
+            f"| {item} | {usage['used']:.{p}f} | {usage['budget']:.{p}f} | {result['item_prices'][item]:.{p}f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Optimize building placement across hexes under a shared budget")
+    parser.add_argument("--config", default=str(sim.DEFAULT_CONFIG_PATH), help="Path to JSON config")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--hexes", help="JSON list of per-hex scenario parameters (optional id, slots)")
+    source.add_argument("--generate", type=int, help="Generate this many hexes from the config scenarios")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --generate")
+    parser.add_argument("--budget", required=True, help="JSON object of item id -> quantity available")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--node-limit", type=int, default=DEFAULT_NODE_LIMIT)
+    parser.add_argument("--gap-tolerance", type=float, default=DEFAULT_GAP_TOLERANCE)
+    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    parser.add_argument("--round", type=int, default=2, dest="precision")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv or sys.argv[1:])
+    config = sim.load_config(args.config)
+    if args.hexes is not None:
+        hexes = json.loads(pathlib.Path(args.hexes).read_text(encoding="utf-8"))
+    else:
+        hexes = generate_hexes(config, args.generate, seed=args.seed)
+    budget = json.loads(pathlib.Path(args.budget).read_text(encoding="utf-8"))
+
+    result = optimize_portfolio(
+        config,
+        hexes,
+        budget,
+        iterations=args.iterations,
+        node_limit=args.node_limit,
+        gap_tolerance=args.gap_tolerance,
+    )
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+    else:
+        print(render_markdown(result, precision=args.precision))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
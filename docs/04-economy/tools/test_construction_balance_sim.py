@@ -1,4 +1,8 @@
+import io
+import itertools
+import json
 import pathlib
+import random
 import sys
 import unittest
 
@@ -85,6 +89,115 @@ class ConstructionBalanceSimTests(unittest.TestCase):
         self.assertEqual(len(violations), 1)
         self.assertIn("payback", violations[0]["reason"])
 
+    def _with_axes(self, levels_per_axis: int) -> dict:
+        config = dict(self.config)
+        config["scenario_axes"] = [
+            {
+                "name": name,
+                "levels": [
+                    {"id": f"{name}{i}", "multipliers": {field: 1.0 + i / 10}} for i in range(levels_per_axis)
+                ],
+            }
+            for name, field in (
+                ("biome", "plant_energy_base_per_100"),
+                ("tier", "ore_energy_base_per_100"),
+                ("demand", "claim_loss_energy_per_100"),
+            )
+        ]
+        return config
+
+    def test_scenario_axes_expand_lazily_as_cartesian_product(self) -> None:
+        scenarios = list(sim.iter_scenarios(self._with_axes(3)))
+        self.assertEqual(len(scenarios), 27)
+        last = scenarios[-1]
+        self.assertEqual(last["id"], "frontier/biome2/tier2/demand2")
+        self.assertEqual(last["base_id"], "frontier")
+        self.assertAlmostEqual(last["ore_energy_base_per_100"], 300 * 1.2)
+
+        # A million scenarios: the first rows must not wait for the rest.
+        rows = sim.iter_rows(self._with_axes(100))
+        first = list(itertools.islice(rows, 4))
+        self.assertEqual(
+            [r["scenario_id"] for r in first],
+            ["frontier/biome0/tier0/demand0"] * 2 + ["frontier/biome0/tier0/demand1"] * 2,
+        )
+
+    def test_ndjson_stream_check_matches_batch_assessment(self) -> None:
+        config = self._with_axes(4)
+        out, errors = io.StringIO(), io.StringIO()
+        violations = sim.write_ndjson(sim.iter_rows(config), out, config["default_targets"], errors)
+
+        rows = sim.simulate(config)
+        self.assertEqual([json.loads(line) for line in out.getvalue().splitlines()], rows)
+        self.assertEqual(violations, len(sim.assess_thresholds(rows, config["default_targets"])))
+        self.assertEqual(len(errors.getvalue().splitlines()), violations + 1 if violations else 0)
+        filtered = list(sim.iter_rows(config, {"frontier"}))
+        self.assertEqual(filtered, sim.filter_rows(rows, {"frontier"}))
+
+    def test_uncertainty_with_point_distributions_matches_simulate(self) -> None:
+        config = sim.load_config(sim.DEFAULT_CONFIG_PATH)
+        config["uncertainty"] = {
+            "resource_energy_values": {"ORE_IRON": {"dist": "fixed", "value": 8}},
+            "scenario_multipliers": {"claim_loss_energy_per_100": {"dist": "uniform", "low": 1, "high": 1}},
+        }
+        rows = {(r["scenario_id"], r["building_id"]): r for r in sim.simulate(config)}
+        for row in sim.simulate_uncertainty(config, samples=50, batch_size=16):
+            expected = rows[(row["scenario_id"], row["building_id"])]
+            for name in ("p05", "p50", "p95"):
+                self.assertAlmostEqual(row[f"net_{name}"], expected["net_benefit_per_100"])
+                self.assertAlmostEqual(row[f"payback_{name}"], expected["payback_blocks"])
+            breached = sim.assess_row(expected, config["default_targets"]) is not None
+            self.assertEqual(row["p_breach"], 1.0 if breached else 0.0)
+
+    def test_uncertainty_reports_breach_probabilities_and_check(self) -> None:
+        config = sim.load_config(sim.DEFAULT_CONFIG_PATH)
+        rows = sim.simulate_uncertainty(config, samples=4_000, seed=7)
+        self.assertEqual(rows, sim.simulate_uncertainty(config, samples=4_000, seed=7))
+        for row in rows:
+            self.assertLessEqual(row["net_p05"], row["net_p50"])
+            self.assertLessEqual(row["net_p50"], row["net_p95"])
+            parts = [row[k] for k in ("p_net_below_target", "p_payback_below_floor", "p_payback_above_ceiling")]
+            self.assertLessEqual(max(parts), row["p_breach"])
+            self.assertLessEqual(row["p_breach"], sum(parts) + row["p_payback_undefined"] + 1e-12)
+        watchtower = next(r for r in rows if r["scenario_id"] == "frontier" and r["building_id"] == "WATCHTOWER")
+        self.assertGreater(watchtower["p_payback_above_ceiling"], 0.1)
+        self.assertEqual(
+            [(v["scenario_id"], v["building_id"]) for v in sim.assess_uncertainty(rows, 0.1)],
+            [(r["scenario_id"], r["building_id"]) for r in rows if r["p_breach"] > 0.1],
+        )
+
+        with self.assertRaises(ValueError):
+            sim.simulate_uncertainty(self.config, samples=10)
+
+        # Breaches are relative to default_targets: a net floor nobody reaches is always breached.
+        config["default_targets"]["min_net_benefit_per_100"] = 10_000
+        for row in sim.simulate_uncertainty(config, samples=500, scenario_ids={"growth"}):
+            self.assertEqual(row["scenario_id"], "growth")
+            self.assertEqual(row["p_breach"], 1.0)
+
+    def test_uncertainty_quantiles_come_from_a_bounded_reservoir(self) -> None:
+        config = sim.load_config(sim.DEFAULT_CONFIG_PATH)
+        exact = sim.simulate_uncertainty(config, samples=20_000, seed=5, batch_size=3_000)
+        sampled = sim.simulate_uncertainty(config, samples=20_000, seed=5, batch_size=3_000, reservoir_size=2_000)
+        quantiles = [f"{column}_{name}" for column in ("net", "payback") for name, _ in sim.QUANTILES]
+        for full, row in zip(exact, sampled):
+            # Means and breach probabilities are running totals, unaffected by the reservoir.
+            for key in full.keys() - set(quantiles):
+                self.assertEqual(row[key], full[key], key)
+            for column in ("net", "payback"):
+                spread = (full[f"{column}_p95"] or 0.0) - (full[f"{column}_p05"] or 0.0) or 1.0
+                for name, _ in sim.QUANTILES:
+                    key = f"{column}_{name}"
+                    if full[key] is not None:
+                        self.assertAlmostEqual(row[key], full[key], delta=0.1 * abs(spread), msg=key)
+
+        reservoir = sim.Reservoir(100, 1, random.Random(1))
+        for start in range(0, 100_000, 7_000):
+            reservoir.extend([float(i) for i in range(start, min(start + 7_000, 100_000))])
+        kept = reservoir.columns[0]
+        self.assertEqual((len(kept), reservoir.seen), (100, 100_000))
+        self.assertAlmostEqual(sum(kept) / len(kept), 50_000, delta=10_000)
+
 
 if __name__ == "__main__":
     unittest.main()
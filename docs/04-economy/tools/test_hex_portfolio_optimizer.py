@@ -0,0 +1,65 @@
+import itertools
+import pathlib
+import sys
+import unittest
+
+TOOLS_DIR = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS_DIR))
+
+import construction_balance_sim as sim  # noqa: E402
+import hex_portfolio_optimizer as opt  # noqa: E402
+
+
+class HexPortfolioOptimizerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = sim.load_config(sim.DEFAULT_CONFIG_PATH)
+        self.items = sorted(self.config["resource_energy_values"])
+
+    def test_benefit_matrix_matches_simulator_rows(self) -> None:
+        matrix = opt.benefit_matrix(self.config, self.config["scenarios"])
+        rows = {(r["scenario_id"], r["building_id"]): r["net_benefit_per_100"] for r in sim.simulate(self.config)}
+        for scenario, values in zip(self.config["scenarios"], matrix):
+            for building, value in zip(self.config["buildings"], values):
+                self.assertAlmostEqual(value, rows[(scenario["id"], building["id"])])
+
+    def test_matches_brute_force_on_small_instances(self) -> None:
+        costs = opt.recipe_matrix(self.config, self.items)
+        for seed in range(3):
+            hexes = opt.generate_hexes(self.config, 4, seed=seed, jitter=0.8)
+            hexes[0]["slots"] = 2
+            budget = {"ORE_IRON": 170 + 10 * seed, "ORE_COBALT": 30, "PLANT_RESIN": 60, "ORE_COAL": 60}
+            budget.update({item: 400 for item in self.items if item not in budget})
+            result = opt.optimize_portfolio(self.config, hexes, budget, gap_tolerance=0.0)
+
+            matrix = opt.benefit_matrix(self.config, hexes)
+            capacity = [budget[item] for item in self.items]
+            choices = [
+                [combo for size in range(hex_.get("slots", 1) + 1) for combo in itertools.combinations(range(7), size)]
+                for hex_ in hexes
+            ]
+            best = 0.0
+            for plan in itertools.product(*choices):
+                used = [sum(costs[b][k] for combo in plan for b in combo) for k in range(len(self.items))]
+                if all(u <= c for u, c in zip(used, capacity)):
+                    best = max(best, sum(matrix[h][b] for h, combo in enumerate(plan) for b in combo))
+            self.assertTrue(result["optimal"])
+            self.assertAlmostEqual(result["total_net_benefit_per_100"], best, places=6)
+
+    def test_large_portfolio_fits_budget_with_small_gap(self) -> None:
+        hexes = opt.generate_hexes(self.config, 2_000, seed=3)
+        budget = {item: 60 * len(hexes) for item in self.items}
+        budget["ORE_COBALT"] = 5 * len(hexes)
+        result = opt.optimize_portfolio(self.config, hexes, budget)
+        for item, usage in result["resource_usage"].items():
+            self.assertLessEqual(usage["used"], usage["budget"] + 1e-6, item)
+        self.assertLess(result["gap_pct"], 0.5)
+        self.assertEqual(sum(result["building_counts"].values()), len(result["assignments"]))
+        self.assertGreater(result["item_prices"]["ORE_COBALT"], 0)
+
+    def test_rejects_unknown_budget_items(self) -> None:
+        with self.assertRaises(KeyError):
+            opt.optimize_portfolio(self.config, self.config["scenarios"], {"ORE_UNOBTAINIUM": 10})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""Adventurer policy layer (economic simulator spec section 8).
+
+Four archetypes choose among the eight policy primitives (or idle) by utility
+scoring over local state. The local state is five small features:
+
+    energy        0 starved (< move + explore cost), 1 low, 2 ok, 3 full
+    inventory     0 empty, 1 partial, 2 full
+    location      0 frontier, 1 own work hex, 2 elsewhere
+    hex_pressure  0 none, 1 owned hex decaying, 2 owned hex under claim
+    claim_target  0/1 a claimable competitor hex is in reach
+
+so an adventurer is one `key = archetype * STATE_COUNT + state` in a
+864-entry space. Utilities are `one_hot(state) @ W[archetype]^T` with
+infeasible actions masked. The full adventurers x actions score matrix is
+therefore fixed per policy and is evaluated once, when `PolicyTable` is built.
+`PolicyTable.decide` picks per adventurer: argmax is one table lookup, and
+softmax sampling (bounded rationality, `temperature > 0`) draws one random
+byte and reads a 256-step inverse CDF for the key. That CDF rounds each
+probability to a multiple of 1/256; at the default temperature it is within
+0.8% total variation of the softmax and drops at most 0.5% of the mass.
+
+`PolicyPopulation` is the runner component (`ScenarioRunner(policy_model=
+PolicyModel())`). It never holds one entry per adventurer: each decision
+phase is a histogram of expected counts over the 864 keys. World events
+(regen, decay, raids, targets, depletion), then the exact softmax decision
+and its transition, are two sparse maps per surplus band (`epoch_table`), and
+the due phase's histogram goes through both. An epoch therefore costs the
+same however many adventurers there are. The harvest share of each epoch's
+decisions sets the miner share.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from itertools import accumulate, compress, product, repeat
+from operator import add, mul, sub
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    from .kpi_stream import QuantileSketch
+except ImportError:  # loaded as a top-level module by `python3 game/sim/bootstrap_world_sim.py`
+    from kpi_stream import QuantileSketch
+
+BP_DEN = 10_000
+
+ARCHETYPES = (
+    ("explorer_operator", 4_000),
+    ("harvester_maintainer", 3_500),
+    ("raider_claimant", 1_500),
+    ("passive_holder", 1_000),
+)
+ACTIONS = ("explore", "discover", "move", "harvest", "convert", "maintain", "claim", "defend")
+IDLE = len(ACTIONS)
+EXPLORE, DISCOVER, MOVE, HARVEST, CONVERT, MAINTAIN, CLAIM, DEFEND = range(IDLE)
+
+FEATURES = (("energy", 4), ("inventory", 3), ("location", 3), ("hex_pressure", 3), ("claim_target", 2))
+FRONTIER, WORK_HEX, ELSEWHERE = 0, 1, 2
+STATE_COUNT = math.prod(levels for _, levels in FEATURES)
+KEY_COUNT = STATE_COUNT * len(ARCHETYPES)
+SAMPLE_STEPS = 256
+
+# Utility terms shared by every archetype: action -> feature -> per-level utility.
+STATE_TERMS: Dict[int, Dict[str, Tuple[float, ...]]] = {
+    EXPLORE: {"energy": (-1.0, 0.2, 0.5, 0.8), "location": (0.8, -0.5, 0.0)},
+    DISCOVER: {"energy": (-1.0, 0.0, 0.4, 0.7), "location": (0.6, -0.5, 0.0)},
+    MOVE: {"energy": (-1.0, 0.0, 0.2, 0.2), "location": (0.0, -1.0, 0.6)},
+    HARVEST: {"energy": (-1.0, 0.2, 0.4, 0.4), "inventory": (0.8, 0.3, -1.0), "location": (-0.5, 0.8, -0.5)},
+    CONVERT: {"energy": (0.8, 0.3, -0.2, -0.8), "inventory": (-1.0, 0.5, 1.2)},
+    MAINTAIN: {"energy": (-1.0, -0.2, 0.3, 0.6), "hex_pressure": (-1.0, 0.8, 0.6)},
+    CLAIM: {"energy": (-1.0, -0.4, 0.2, 0.6), "claim_target": (-1.0, 0.6)},
+    DEFEND: {"energy": (-1.0, 0.0, 0.3, 0.5), "hex_pressure": (-1.0, -0.5, 1.5)},
+}
+
+# Archetype preference per action, in ACTIONS order. Idle scores 0.
+ARCHETYPE_BIAS = {
+    "explorer_operator": (0.6, 0.5, 0.2, 0.0, 0.1, 0.0, -0.6, 0.1),
+    "harvester_maintainer": (-0.3, -0.2, 0.3, 0.7, 0.3, 0.5, -0.6, 0.4),
+    "raider_claimant": (0.1, -0.2, 0.2, -0.2, 0.1, -0.3, 0.9, 0.2),
+    "passive_holder": (-2.0, -2.0, -2.0, -1.2, -0.3, -0.4, -2.0, 0.0),
+}
+
+
+def encode_state(energy: int, inventory: int, location: int, hex_pressure: int, claim_target: int) -> int:
+    code = 0
+    for value, (_, levels) in zip((energy, inventory, location, hex_pressure, claim_target), FEATURES):
+        if not 0 <= value < levels:
+            raise ValueError(f"feature level {value} out of range 0..{levels - 1}")
+        code = code * levels + value
+    return code
+
+
+def decode_state(code: int) -> Tuple[int, ...]:
+    values: List[int] = []
+    for _, levels in reversed(FEATURES):
+        code, value = divmod(code, levels)
+        values.append(value)
+    return tuple(reversed(values))
+
+
+def state_key(archetype: int, code: int) -> int:
+    return archetype * STATE_COUNT + code
+
+
+def feasible(action: int, state: Sequence[int]) -> bool:
+    energy, inventory, location, hex_pressure, claim_target = state
+    if action in (EXPLORE, DISCOVER):
+        return energy >= 1 and location == FRONTIER
+    if action == MOVE:
+        return energy >= 1 and location != WORK_HEX
+    if action == HARVEST:
+        return energy >= 1 and location == WORK_HEX and inventory < 2
+    if action == CONVERT:
+        return inventory >= 1
+    if action == MAINTAIN:
+        return energy >= 2 and hex_pressure >= 1
+    if action == CLAIM:
+        return energy >= 2 and claim_target == 1
+    return energy >= 2 and hex_pressure == 2  # DEFEND
+
+
+def weight_matrix(archetype: int) -> List[List[float]]:
+    """Rows per action: [bias, one-hot feature weights...] over the FEATURES levels."""
+    bias = ARCHETYPE_BIAS[ARCHETYPES[archetype][0]]
+    rows = []
+    for action in range(IDLE):
+        row = [bias[action]]
+        for name, levels in FEATURES:
+            row.extend(STATE_TERMS[action].get(name, (0.0,) * levels))
+        rows.append(row)
+    return rows
+
+
+def one_hot(code: int) -> List[float]:
+    vector = [1.0]
+    for value, (_, levels) in zip(decode_state(code), FEATURES):
+        vector.extend(1.0 if level == value else 0.0 for level in range(levels))
+    return vector
+
+
+def utility_matrix(archetype: int) -> List[List[float]]:
+    """STATE_COUNT x (ACTIONS + idle) utilities; infeasible actions are -inf."""
+    weights = weight_matrix(archetype)
+    matrix = []
+    for code in range(STATE_COUNT):
+        x = one_hot(code)
+        state = decode_state(code)
+        row = [
+            sum(w * v for w, v in zip(weights[action], x)) if feasible(action, state) else -math.inf
+            for action in range(IDLE)
+        ]
+        row.append(0.0)
+        matrix.append(row)
+    return matrix
+
+
+def _inverse_cdf(outcomes: Sequence[Tuple[int, float]]) -> List[int]:
+    """SAMPLE_STEPS equally likely picks from `(value, probability)` pairs, in order."""
+    picks: List[int] = []
+    last = max(i for i, (_, p) in enumerate(outcomes) if p > 0)
+    cumulative, index = outcomes[0][1], 0
+    for step in range(SAMPLE_STEPS):
+        u = (step + 0.5) / SAMPLE_STEPS
+        while (cumulative < u or outcomes[index][1] == 0) and index < last:
+            index += 1
+            cumulative += outcomes[index][1]
+        picks.append(outcomes[index][0])
+    return picks
+
+
+class PolicyTable:
+    """Per-key argmax actions, softmax probabilities and their 256-step inverse CDFs."""
+
+    def __init__(self, temperature: float = 0.0) -> None:
+        self.temperature = temperature
+        argmax = bytearray(KEY_COUNT)
+        sampler = bytearray(KEY_COUNT * SAMPLE_STEPS)
+        self.probabilities: List[List[float]] = []
+        for archetype in range(len(ARCHETYPES)):
+            for code, row in enumerate(utility_matrix(archetype)):
+                key = state_key(archetype, code)
+                best = max(range(len(row)), key=lambda a: (row[a], -a))
+                argmax[key] = best
+                if temperature <= 0:
+                    probabilities = [1.0 if a == best else 0.0 for a in range(len(row))]
+                else:
+                    top = row[best]
+                    weights = [math.exp((u - top) / temperature) if u > -math.inf else 0.0 for u in row]
+                    total = sum(weights)
+                    probabilities = [w / total for w in weights]
+                self.probabilities.append(probabilities)
+                base = key * SAMPLE_STEPS
+                sampler[base : base + SAMPLE_STEPS] = bytes(_inverse_cdf(list(enumerate(probabilities))))
+        self.argmax = bytes(argmax)
+        self.sampler = bytes(sampler)
+
+    def decide(self, keys: Sequence[int], rng: random.Random | None = None) -> bytes:
+        """One action (or IDLE) per key: argmax, or softmax sampling when `rng` is given."""
+        if rng is None or self.temperature <= 0:
+            return bytes(map(self.argmax.__getitem__, keys))
+        sampler = self.sampler
+        return bytes([sampler[k * SAMPLE_STEPS + b] for k, b in zip(keys, rng.randbytes(len(keys)))])
+
+
+def _transition(state: Tuple[int, ...], action: int) -> Tuple[int, ...]:
+    energy, inventory, location, hex_pressure, claim_target = state
+    if action in (EXPLORE, MOVE):
+        energy -= 1
+        location = WORK_HEX if action == MOVE else location
+    elif action == DISCOVER:
+        energy, location = energy - 1, WORK_HEX
+    elif action == HARVEST:
+        energy, inventory = energy - 1, inventory + 1
+    elif action == CONVERT:
+        energy, inventory = energy + 2, 0
+    elif action in (MAINTAIN, DEFEND):
+        energy, hex_pressure = energy - 1, 0
+    elif action == CLAIM:
+        energy, location, claim_target = energy - 2, WORK_HEX, 0
+    return (min(3, max(0, energy)), min(2, inventory), location, hex_pressure, claim_target)
+
+
+def transition_table() -> List[int]:
+    """Next key for `key * (IDLE + 1) + action`."""
+    table = [0] * (KEY_COUNT * (IDLE + 1))
+    for key in range(KEY_COUNT):
+        archetype, code = divmod(key, STATE_COUNT)
+        state = decode_state(code)
+        for action in range(IDLE + 1):
+            table[key * (IDLE + 1) + action] = state_key(archetype, encode_state(*_transition(state, action)))
+    return table
+
+
+def environment_outcomes(
+    regen_bp: int, decay_bp: int, raid_bp: int, target_bp: int, deplete_bp: int
+) -> List[List[Tuple[int, float]]]:
+    """Per state code, `(next_code, probability)` under independent world events."""
+    events = [(p / BP_DEN, 1 - p / BP_DEN) for p in (regen_bp, decay_bp, raid_bp, target_bp, deplete_bp)]
+    table = []
+    for code in range(STATE_COUNT):
+        outcomes: Dict[int, float] = {}
+        for fired in product((True, False), repeat=len(events)):
+            probability = math.prod(p if hit else q for hit, (p, q) in zip(fired, events))
+            if probability == 0.0:
+                continue
+            regen, decay, raid, target, deplete = fired
+            energy, inventory, location, hex_pressure, _ = decode_state(code)
+            energy = min(3, energy + regen)
+            if decay and hex_pressure == 0 and location == WORK_HEX:
+                hex_pressure = 1
+            elif raid and hex_pressure == 1:
+                hex_pressure = 2
+            if deplete and location == WORK_HEX:
+                location = FRONTIER
+            next_code = encode_state(energy, inventory, location, hex_pressure, int(target))
+            outcomes[next_code] = outcomes.get(next_code, 0.0) + probability
+        table.append(sorted(outcomes.items()))
+    return table
+
+
+def _grouped(entries: List[Tuple[int, int, float]], size: int) -> Tuple[List[int], List[float], List[int]]:
+    """`(destination, source, weight)` entries as sources and weights grouped by destination, plus group bounds."""
+    entries.sort()
+    bounds = [0] * (size + 1)
+    for destination, _, _ in entries:
+        bounds[destination + 1] += 1
+    return [source for _, source, _ in entries], [weight for _, _, weight in entries], list(accumulate(bounds))
+
+
+def _segment_sums(values: Sequence[float], bounds: Sequence[int]) -> List[float]:
+    sums = [0.0, *accumulate(values)]
+    return list(map(sub, map(sums.__getitem__, bounds[1:]), map(sums.__getitem__, bounds[:-1])))
+
+
+@dataclass(frozen=True)
+class EpochTable:
+    """One decision epoch as two sparse linear maps over the 864 per-key counts.
+
+    World events move a key to a few keys of the same archetype; the decision
+    then splits each key over its feasible actions and their transitions. Each
+    map is a gather, a running sum and a difference at group bounds, so it
+    costs one pass over its entries however many adventurers there are.
+    """
+
+    world_sources: List[int]
+    world_weights: List[float]
+    world_bounds: List[int]
+    # Decision entries are ordered by action; `decision_order` regroups them by next key.
+    decision_sources: List[int]
+    decision_weights: List[float]
+    action_bounds: List[int]
+    decision_order: List[int]
+    decision_bounds: List[int]
+
+    def advance(self, counts: Sequence[float]) -> Tuple[List[float], List[float]]:
+        """Expected counts per key after one decision, and expected decisions per action."""
+        world = _segment_sums(
+            list(map(mul, map(counts.__getitem__, self.world_sources), self.world_weights)), self.world_bounds
+        )
+        decided = list(map(mul, map(world.__getitem__, self.decision_sources), self.decision_weights))
+        actions = _segment_sums(decided, self.action_bounds)
+        advanced = _segment_sums(list(map(decided.__getitem__, self.decision_order)), self.decision_bounds)
+        return advanced, actions
+
+
+def epoch_table(policy: PolicyTable, environment: List[List[Tuple[int, float]]]) -> EpochTable:
+    """World events from `environment_outcomes`, then the softmax decision and its transition."""
+    world = [
+        (state_key(archetype, next_code), state_key(archetype, code), probability)
+        for archetype in range(len(ARCHETYPES))
+        for code, outcomes in enumerate(environment)
+        for next_code, probability in outcomes
+    ]
+    transitions = transition_table()
+    decisions = [
+        (action, key, probability, transitions[key * (IDLE + 1) + action])
+        for action in range(IDLE + 1)
+        for key, probabilities in enumerate(policy.probabilities)
+        if (probability := probabilities[action]) > 0
+    ]
+    _, _, action_bounds = _grouped([(action, 0, 0.0) for action, *_ in decisions], IDLE + 1)
+    order, _, decision_bounds = _grouped(
+        [(next_key, index, 0.0) for index, (*_, next_key) in enumerate(decisions)], KEY_COUNT
+    )
+    return EpochTable(
+        *_grouped(world, KEY_COUNT),
+        decision_sources=[key for _, key, _, _ in decisions],
+        decision_weights=[probability for _, _, probability, _ in decisions],
+        action_bounds=action_bounds,
+        decision_order=order,
+        decision_bounds=decision_bounds,
+    )
+
+
+def _archetype_pattern() -> bytes:
+    """Archetype per adventurer slot, repeating every 20 mints in the configured mix."""
+    pattern = bytearray()
+    for archetype, (_, share_bp) in enumerate(ARCHETYPES):
+        pattern.extend([archetype] * (share_bp * 20 // BP_DEN))
+    return bytes(pattern)
+
+
+@dataclass(frozen=True)
+class PolicyModel:
+    """Factory for per-scenario populations (`ScenarioRunner(policy_model=...)`)."""
+
+    temperature: float = 0.35
+    # Each adventurer decides every `decision_epochs` epochs, in staggered phases.
+    decision_epochs: int = 4
+    base_decay_bp: int = 1_500
+    base_raid_bp: int = 1_000
+    base_target_bp: int = 1_500
+    deplete_bp: int = 1_000
+
+    def for_scenario(self, scenario, config) -> "PolicyPopulation":
+        return PolicyPopulation(self, raider_share_bp=scenario.raider_share_bp)
+
+
+class PolicyPopulation:
+    """Per-phase histograms of expected adventurers over the 864 policy keys.
+
+    Adventurer `i` (in mint order) decides in phase `i % decision_epochs`. Each
+    epoch the due phase's histogram is pushed through its surplus band's
+    `EpochTable`, so the cost is fixed per epoch rather than per adventurer.
+    Deaths scale every phase and key alike. Action counts are expected values
+    with a fractional carry, as in cohort mode.
+    """
+
+    def __init__(self, model: PolicyModel, raider_share_bp: int = 0) -> None:
+        self.model = model
+        self.raider_share_bp = max(0, raider_share_bp)
+        self.table = PolicyTable(model.temperature)
+        self.stride = max(1, model.decision_epochs)
+        self.phases = [[0.0] * KEY_COUNT for _ in range(self.stride)]
+        self.size = 0
+        self.minted = 0
+        self._pattern = _archetype_pattern()
+        self._period = math.lcm(len(self._pattern), self.stride)
+        self._epoch_tables: Dict[int, EpochTable] = {}
+        self._starting_state = encode_state(2, 0, FRONTIER, 0, 0)
+        self._starved = [decode_state(key % STATE_COUNT)[0] == 0 for key in range(KEY_COUNT)]
+        self._carry = [0.0] * (IDLE + 1)
+
+        self.action_totals = [0] * (IDLE + 1)
+        self.epochs = 0
+        self.starved_share_bp_sum = 0
+        self.last_starved_share_bp = 0
+        self.starved_share = QuantileSketch()
+
+    def _epoch_table(self, surplus_band: int) -> EpochTable:
+        table = self._epoch_tables.get(surplus_band)
+        if table is None:
+            model = self.model
+            environment = environment_outcomes(
+                regen_bp=max(1_000, min(9_500, 6_000 + surplus_band * 500)),
+                decay_bp=model.base_decay_bp + max(0, -surplus_band) * 500,
+                raid_bp=min(BP_DEN, model.base_raid_bp + self.raider_share_bp // 2),
+                target_bp=min(BP_DEN, model.base_target_bp + self.raider_share_bp // 2),
+                deplete_bp=model.deplete_bp,
+            )
+            table = epoch_table(self.table, environment)
+            self._epoch_tables[surplus_band] = table
+        return table
+
+    def key_counts(self) -> List[float]:
+        """Expected adventurers per key over all phases."""
+        return [sum(counts) for counts in zip(*self.phases)]
+
+    def _mint(self, count: int) -> None:
+        """Add `count` adventurers in the starting state, continuing the archetype pattern."""
+        first, last, period = self.minted, self.minted + count, self._period
+        for residue in range(period):
+            n = (last - residue + period - 1) // period - (first - residue + period - 1) // period
+            if n:
+                archetype = self._pattern[residue % len(self._pattern)]
+                self.phases[residue % self.stride][state_key(archetype, self._starting_state)] += n
+        self.minted = last
+        self.size += count
+
+    def _resize(self, active_adventurers: int) -> None:
+        if active_adventurers > self.size:
+            self._mint(active_adventurers - self.size)
+        elif active_adventurers < self.size:
+            survival = repeat(active_adventurers / self.size)
+            self.phases = [list(map(mul, counts, survival)) for counts in self.phases]
+            self.size = active_adventurers
+
+    def step(self, *, block_number: int, active_adventurers: int, surplus_band: int) -> Dict[str, int]:
+        """Advance the due phase one decision; return its action counts by name."""
+        self._resize(max(0, active_adventurers))
+        phase = self.epochs % self.stride
+        advanced, expected = self._epoch_table(surplus_band).advance(self.phases[phase])
+        self.phases[phase] = advanced
+        owed = list(map(add, expected, self._carry))
+        actions = [int(x) for x in owed]
+        self._carry = list(map(sub, owed, actions))
+
+        cohort = sum(expected)
+        starved = sum(compress(advanced, self._starved))
+        for i, n in enumerate(actions):
+            self.action_totals[i] += n
+        self.last_starved_share_bp = int(starved * BP_DEN / cohort) if cohort > 0 else 0  # of the due cohort
+        self.starved_share_bp_sum += self.last_starved_share_bp
+        self.starved_share.add(self.last_starved_share_bp)
+        self.epochs += 1
+        counts = dict(zip(ACTIONS, actions))
+        counts["idle"] = actions[IDLE]
+        return counts
+
+    def metrics(self) -> Dict[str, float]:
+        decisions = max(1, sum(self.action_totals))
+        metrics: Dict[str, float] = {
+            f"{name}_share_bp": total * BP_DEN // decisions
+            for name, total in zip(ACTIONS + ("idle",), self.action_totals)
+        }
+        metrics["mean_starved_share_bp"] = self.starved_share_bp_sum // max(1, self.epochs)
+        metrics["final_starved_share_bp"] = self.last_starved_share_bp
+        return metrics
+
+    def sketches(self) -> Dict[str, dict]:
+        return {"starved_share_bp": self.starved_share.to_dict()}
@@ -10,17 +10,23 @@ from __future__ import annotations
 
 import argparse
 import csv
+import importlib
 import json
-from dataclasses import asdict, dataclass
+from array import array
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field, fields, replace
 from enum import Enum
 from pathlib import Path
 from statistics import mean
-from typing import Iterable, List, Sequence
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Protocol, Sequence
 
 
 class ModelMode(str, Enum):
     CODE_EXACT = "code_exact"
     DESIGN_INTENDED = "design_intended"
+    # Adventurers grouped by mint epoch x strategy (cohorts.py) instead of one counter.
+    COHORT = "cohort"
 
 
 @dataclass(frozen=True)
@@ -70,6 +76,15 @@ class SimConfig:
     anti_inflation_gain_bp: int = 8_000
     anti_deflation_release_gain_bp: int = 2_000
 
+    @classmethod
+    def from_calibration(cls, path: Path, **overrides: object) -> "SimConfig":
+        """Load coefficients from a `calibration.json` written by `event_ingest.py`."""
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        calibrated = dict(payload.get("sim_config", {}))
+        _reject_unknown_fields(calibrated, cls, f"SimConfig ({path})")
+        calibrated.update(overrides)
+        return replace(cls(), **calibrated)
+
 
 @dataclass(frozen=True)
 class Scenario:
@@ -111,12 +126,144 @@ class ScenarioSummary:
     net_inflation_pct: float
 
 
+# Per-epoch metrics in CSV column order, with the array typecode backing each.
+# Integer columns start as 32-bit ("i") and widen to 64-bit on the first value
+# that overflows, so typical runs store 4 bytes per count.
+TIMESERIES_FIELDS = (
+    ("epoch", "i"),
+    ("block_number", "i"),
+    ("active_adventurers", "i"),
+    ("controlled_hexes", "i"),
+    ("energy_supply", "i"),
+    ("surplus_pool_energy", "i"),
+    ("twap_usdc_per_energy", "d"),
+    ("mint_price_energy", "i"),
+    ("minted_adventurers", "i"),
+    ("deaths", "i"),
+    ("new_hexes", "i"),
+    ("extraction_source", "i"),
+    ("operational_sink", "i"),
+    ("stabilization_sink", "i"),
+    ("policy_stabilization_sink", "i"),
+    ("policy_release", "i"),
+    ("sink_burn", "i"),
+    ("locked_from_deaths", "i"),
+    ("conversion_tax_bp", "i"),
+)
+
+
+def _typed_column(code: str, values: Sequence[float]) -> array:
+    try:
+        return array(code, values)
+    except OverflowError:
+        return array("q", values)
+
+
+class Timeseries(Sequence):
+    """Column-oriented per-epoch metrics for one scenario.
+
+    Each metric lives in a preallocated typed array. Indexing yields a lazy
+    `TimeseriesRow` mapping, so `row["energy_supply"]` callers keep working;
+    writers and analysis code should read `column(name)` directly.
+    """
+
+    def __init__(self, scenario_key: str, capacity: int) -> None:
+        self.scenario_key = scenario_key
+        self.columns: Dict[str, array] = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, code in TIMESERIES_FIELDS
+        }
+        self._len = 0
+
+    @classmethod
+    def from_columns(cls, scenario_key: str, columns: Dict[str, Sequence[float]]) -> "Timeseries":
+        length = len(columns["epoch"])
+        series = cls(scenario_key, 0)
+        series.columns = {
+            name: _typed_column(code, columns[name]) for name, code in TIMESERIES_FIELDS
+        }
+        if any(len(col) != length for col in series.columns.values()):
+            raise ValueError("timeseries columns must have equal length")
+        series._len = length
+        return series
+
+    @property
+    def fieldnames(self) -> List[str]:
+        return ["scenario"] + [name for name, _ in TIMESERIES_FIELDS]
+
+    def column(self, name: str) -> array:
+        return self.columns[name][: self._len]
+
+    def record(self, **metrics: float) -> None:
+        index = self._len
+        if index >= len(self.columns["epoch"]):
+            for col in self.columns.values():
+                col.extend(array(col.typecode, bytes(col.itemsize * max(1, len(col)))))
+        for name, value in metrics.items():
+            try:
+                self.columns[name][index] = value
+            except OverflowError:
+                self._widen(name)[index] = value
+        self._len = index + 1
+
+    def _widen(self, name: str) -> array:
+        column = self.columns[name] = array("q", self.columns[name])
+        return column
+
+    def iter_values(self) -> Iterator[tuple]:
+        """Yield CSV-ordered value tuples without building row mappings."""
+        return zip(
+            repeat(self.scenario_key, self._len),
+            *(self.columns[name] for name, _ in TIMESERIES_FIELDS),
+        )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TimeseriesRow(self, i) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("timeseries index out of range")
+        return TimeseriesRow(self, index)
+
+
+class TimeseriesRow(Mapping):
+    """Read-only dict-like view of one epoch in a `Timeseries`."""
+
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series: Timeseries, index: int) -> None:
+        self._series = series
+        self._index = index
+
+    def __getitem__(self, key: str):
+        if key == "scenario":
+            return self._series.scenario_key
+        return self._series.columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._series.fieldnames)
+
+    def __len__(self) -> int:
+        return len(TIMESERIES_FIELDS) + 1
+
+    def __repr__(self) -> str:
+        return f"TimeseriesRow({dict(self)!r})"
+
+
 @dataclass
 class ScenarioResult:
     scenario: Scenario
     summary: ScenarioSummary
-    timeseries: List[dict]
+    timeseries: Timeseries
     invariant_violations: List[str]
+    # End-of-run metrics from optional runner components, keyed by component.
+    components: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Serialized kpi_stream.QuantileSketch payloads, keyed "<component>.<metric>".
+    sketches: Dict[str, dict] = field(default_factory=dict)
 
 
 @dataclass
@@ -135,11 +282,161 @@ class _State:
     total_new_hexes: int
     total_sources: int
     total_sinks: int
+    # Biome x decay-level hex histogram; None keeps the flat per-hex upkeep.
+    hexes: HexLayer | None = None
+
+
+class TwapSource(Protocol):
+    """Per-epoch TWAP path replacing the synthetic price model."""
+
+    def epoch_twaps(self, epochs: int, blocks_per_epoch: int) -> Sequence[float]: ...
+
+
+class CollapsePopulation(Protocol):
+    def step(self, *, active_adventurers: int, miner_share_bp: int, collapse_prob_bp: int) -> int: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+
+class CollapseModel(Protocol):
+    """Per-mine collapse model replacing the aggregate collapse-death formula."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> CollapsePopulation: ...
+
+
+class TerritoryLayer(Protocol):
+    def step(
+        self,
+        *,
+        block_number: int,
+        active_adventurers: int,
+        new_hexes: int,
+        surplus_band: int,
+    ) -> int: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+    def sketches(self) -> Dict[str, dict]: ...
+
+
+class TerritoryModel(Protocol):
+    """Spatial territory replacing the aggregate controlled-hex counter."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> TerritoryLayer: ...
+
+
+class HexLayer(Protocol):
+    def charge_upkeep(self, *, surplus_band: int) -> int: ...
+
+    def advance(self, *, active_adventurers: int, new_hexes: int) -> int: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+
+class HexModel(Protocol):
+    """Biome x decay-level hex histogram replacing the flat per-hex upkeep."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> HexLayer: ...
+
+
+class SharingLayer(Protocol):
+    def step(self, *, extraction_energy: int, miner_share_bp: int) -> int: ...
+
+    def churn(self, *, minted: int, deaths: int) -> None: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+
+class SharingModel(Protocol):
+    """Owner x grantee share rules settling each epoch's harvest output.
+
+    `step` returns the shares stranded on dead grantees, which leave circulation;
+    `churn` kills random live adventurers for the epoch's deaths and adds its mints.
+    """
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> SharingLayer: ...
+
+
+class ConversionLayer(Protocol):
+    def step(self, *, block_number: int, extraction_energy: int) -> int: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+
+class ConversionModel(Protocol):
+    """Volume-windowed conversion penalty replacing the flat default conversion tax."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> ConversionLayer: ...
+
+
+class PolicyLayer(Protocol):
+    def step(self, *, block_number: int, active_adventurers: int, surplus_band: int) -> Mapping[str, int]: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+    def sketches(self) -> Dict[str, dict]: ...
+
+
+class CohortLayer(Protocol):
+    def effective_adventurers(self, epoch: int) -> float: ...
+
+    def step(
+        self,
+        *,
+        epoch: int,
+        minted: int,
+        bond_unit: int,
+        miner_share_bp: int,
+        collapse_prob_bp: int,
+        player_extraction: int,
+        roster_upkeep_per_adv: float,
+        deaths: int | None = None,
+    ) -> tuple[int, int]: ...
+
+    def metrics(self) -> Dict[str, float]: ...
+
+
+class CohortModel(Protocol):
+    """Mint-epoch x strategy adventurer table used in `ModelMode.COHORT`."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> CohortLayer: ...
+
+
+class PolicyModel(Protocol):
+    """Per-adventurer archetype decisions replacing the fixed base miner share."""
+
+    def for_scenario(self, scenario: Scenario, config: SimConfig) -> PolicyLayer: ...
 
 
 class ScenarioRunner:
-    def __init__(self, config: SimConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: SimConfig | None = None,
+        twap_source: TwapSource | None = None,
+        collapse_model: CollapseModel | None = None,
+        territory_model: TerritoryModel | None = None,
+        conversion_model: ConversionModel | None = None,
+        policy_model: PolicyModel | None = None,
+        cohort_model: CohortModel | None = None,
+        hex_model: HexModel | None = None,
+        sharing_model: SharingModel | None = None,
+    ) -> None:
         self.config = config or SimConfig()
+        cohort_mode = self.config.mode == ModelMode.COHORT
+        if hex_model is not None and territory_model is not None:
+            raise ValueError("hex_model and territory_model both replace the controlled hex counter")
+        if cohort_model is not None and not cohort_mode:
+            raise ValueError("cohort_model requires SimConfig(mode=ModelMode.COHORT)")
+        if cohort_mode and cohort_model is None:
+            cohort_model = _sibling_module("cohorts").CohortModel()
+        self.twap_source = twap_source
+        self.collapse_model = collapse_model
+        self.territory_model = territory_model
+        self.conversion_model = conversion_model
+        self.policy_model = policy_model
+        self.cohort_model = cohort_model
+        self.hex_model = hex_model
+        self.sharing_model = sharing_model
 
     def quote_adventurer_price_energy(
         self,
@@ -172,7 +469,11 @@ class ScenarioRunner:
         price = int(max(1.0, round(raw_energy - discount)))
         return price
 
-    def run_scenario(self, scenario: Scenario) -> ScenarioResult:
+    def run_scenario(
+        self,
+        scenario: Scenario,
+        on_epoch: Callable[[Mapping], None] | None = None,
+    ) -> ScenarioResult:
         cfg = self.config
         epochs = max(1, scenario.weeks * cfg.epochs_per_week)
 
@@ -191,30 +492,58 @@ class ScenarioRunner:
             total_new_hexes=0,
             total_sources=0,
             total_sinks=0,
+            hexes=self.hex_model.for_scenario(scenario, cfg) if self.hex_model is not None else None,
+        )
+
+        replayed_twaps = (
+            self.twap_source.epoch_twaps(epochs, cfg.blocks_per_epoch)
+            if self.twap_source is not None
+            else None
+        )
+        mines = (
+            self.collapse_model.for_scenario(scenario, cfg)
+            if self.collapse_model is not None
+            else None
+        )
+        territory = (
+            self.territory_model.for_scenario(scenario, cfg)
+            if self.territory_model is not None
+            else None
+        )
+        conversion = (
+            self.conversion_model.for_scenario(scenario, cfg)
+            if self.conversion_model is not None
+            else None
+        )
+        policy = (
+            self.policy_model.for_scenario(scenario, cfg)
+            if self.policy_model is not None
+            else None
+        )
+        sharing = (
+            self.sharing_model.for_scenario(scenario, cfg)
+            if self.sharing_model is not None
+            else None
         )
 
         baseline_energy = max(1, scenario.initial_energy_supply)
-        timeseries: List[dict] = []
+        timeseries = Timeseries(scenario.key, epochs)
         violations: List[str] = []
 
+        cohorts = (
+            self.cohort_model.for_scenario(scenario, cfg)
+            if self.cohort_model is not None
+            else None
+        )
+
         for epoch in range(1, epochs + 1):
             state.epoch = epoch
             state.block_number = epoch * cfg.blocks_per_epoch
 
-            surplus_band = _energy_surplus_band(state.energy_supply, baseline_energy)
-            adjusted_surplus_band = _clamp(
-                surplus_band + int(round(scenario.supply_shock_bp / 2_000)), -8, 8
-            )
+            adjusted_surplus_band = _adjusted_surplus_band(state.energy_supply, baseline_energy, scenario)
 
             owner_alive_count = max(1, int(round(state.active_adventurers / cfg.active_owner_count)))
-            demand_intent = int(
-                round(
-                    cfg.target_mints_per_epoch
-                    * (1 + scenario.demand_shock_bp / 10_000)
-                    * (1 + 0.25 * adjusted_surplus_band / 10)
-                )
-            )
-            demand_intent = max(5, demand_intent)
+            demand_intent = _demand_intent(cfg, scenario, adjusted_surplus_band)
 
             mint_price = self.quote_adventurer_price_energy(
                 mints_in_window=demand_intent,
@@ -237,39 +566,68 @@ class ScenarioRunner:
 
             # Extraction output scales with headcount and discovery pressure.
             exploration_multiplier = 1.0 + min(0.4, minted / max(1, cfg.target_mints_per_epoch) * 0.25)
+            extracting_adventurers = (
+                cohorts.effective_adventurers(epoch) if cohorts is not None else state.active_adventurers
+            )
             extraction_source = int(
                 round(
-                    state.active_adventurers
+                    extracting_adventurers
                     * cfg.extraction_energy_per_adv_epoch
                     * exploration_multiplier
                 )
             )
 
-            conversion_tax_bp = (
-                scenario.conversion_tax_override_bp
-                if scenario.conversion_tax_override_bp > 0
-                else _clamp(
+            # Pinned scenario taxes still move volume through the windows.
+            volume_penalty_bp = (
+                conversion.step(block_number=state.block_number, extraction_energy=extraction_source)
+                if conversion is not None
+                else None
+            )
+            if scenario.conversion_tax_override_bp > 0:
+                conversion_tax_bp = scenario.conversion_tax_override_bp
+            elif volume_penalty_bp is not None:
+                conversion_tax_bp = volume_penalty_bp
+            else:
+                conversion_tax_bp = _clamp(
                     cfg.default_conversion_tax_bp + max(0, adjusted_surplus_band) * 450,
                     200,
                     7_000,
                 )
-            )
             conversion_tax = extraction_source * conversion_tax_bp // 10_000
             player_extraction = extraction_source - conversion_tax
 
             # Upkeep pressure increases with footprint and roster scale.
-            upkeep_sink = state.controlled_hexes * cfg.upkeep_energy_per_hex_epoch
+            if state.hexes is not None:
+                upkeep_sink = state.hexes.charge_upkeep(surplus_band=adjusted_surplus_band)
+            else:
+                upkeep_sink = state.controlled_hexes * cfg.upkeep_energy_per_hex_epoch
             roster_sink = int(round(state.active_adventurers * cfg.roster_upkeep_per_adv_epoch))
             operational_sink = upkeep_sink + roster_sink
             stabilization_sink = int(
                 round(state.energy_supply * max(0, adjusted_surplus_band) * 0.0027)
             )
 
+            base_miner_share_bp = cfg.base_miner_share_bp
+            if policy is not None:
+                actions = policy.step(
+                    block_number=state.block_number,
+                    active_adventurers=state.active_adventurers,
+                    surplus_band=adjusted_surplus_band,
+                )
+                base_miner_share_bp = actions["harvest"] * 10_000 // max(1, sum(actions.values()))
             miner_share_bp = _clamp(
-                cfg.base_miner_share_bp + scenario.raider_share_bp // 2,
+                base_miner_share_bp + scenario.raider_share_bp // 2,
                 1_000,
                 5_500,
             )
+            stranded_sink = 0
+            if sharing is not None:
+                # Shares paid to dead grantees are never converted; the rest only moves income.
+                stranded = sharing.step(
+                    extraction_energy=extraction_source,
+                    miner_share_bp=miner_share_bp,
+                )
+                stranded_sink = stranded * (10_000 - conversion_tax_bp) // 10_000
             collapse_prob_bp = _clamp(
                 cfg.base_collapse_prob_bp
                 + scenario.collapse_shock_prob_bp
@@ -277,13 +635,32 @@ class ScenarioRunner:
                 0,
                 600,
             )
-            deaths = (
-                state.active_adventurers * miner_share_bp // 10_000 * collapse_prob_bp // 10_000
-            )
-            deaths = max(0, min(state.active_adventurers, deaths))
-
             bond_unit = max(1, mint_price * cfg.mint_bond_share_bp // 10_000)
-            locked_from_deaths = deaths * bond_unit
+            if mines is not None:
+                deaths = mines.step(
+                    active_adventurers=state.active_adventurers,
+                    miner_share_bp=miner_share_bp,
+                    collapse_prob_bp=collapse_prob_bp,
+                )
+            elif cohorts is None:
+                deaths = (
+                    state.active_adventurers * miner_share_bp // 10_000 * collapse_prob_bp // 10_000
+                )
+            if cohorts is not None:
+                # Cohorts lock each dead adventurer's own mint-time bond.
+                deaths, locked_from_deaths = cohorts.step(
+                    epoch=epoch,
+                    minted=minted,
+                    bond_unit=bond_unit,
+                    miner_share_bp=miner_share_bp,
+                    collapse_prob_bp=collapse_prob_bp,
+                    player_extraction=player_extraction,
+                    roster_upkeep_per_adv=cfg.roster_upkeep_per_adv_epoch,
+                    deaths=deaths if mines is not None else None,
+                )
+            else:
+                deaths = max(0, min(state.active_adventurers, deaths))
+                locked_from_deaths = deaths * bond_unit
 
             # Claim/decay churn: if energy is starved, lose more territory.
             decay_losses = max(0, int(round(state.controlled_hexes * max(0, -adjusted_surplus_band) * 0.0025)))
@@ -301,6 +678,7 @@ class ScenarioRunner:
             state.energy_supply -= operational_sink
             state.energy_supply -= stabilization_sink
             state.energy_supply -= mint_spend
+            state.energy_supply -= stranded_sink
             state.energy_supply = max(0, state.energy_supply)
 
             state.surplus_pool_energy += conversion_tax
@@ -315,15 +693,7 @@ class ScenarioRunner:
                 state.surplus_pool_energy -= rebound
 
             # Closed-loop policy control around a target inflation path.
-            progress = epoch / max(1, epochs)
-            target_supply = int(
-                round(
-                    baseline_energy
-                    * (1 + (cfg.target_final_inflation_pct / 100.0) * progress)
-                )
-            )
-            upper_bound = target_supply + (target_supply * cfg.inflation_upper_band_bp // 10_000)
-            lower_bound = target_supply - (target_supply * cfg.inflation_lower_band_bp // 10_000)
+            lower_bound, upper_bound = _controller_bounds(cfg, baseline_energy, epoch, epochs)
 
             policy_stabilization_sink = 0
             policy_release = 0
@@ -341,10 +711,25 @@ class ScenarioRunner:
                 state.surplus_pool_energy -= policy_release
 
             state.treasury_energy += treasury_take
-            state.locked_capital_energy += locked_from_deaths
+            state.locked_capital_energy += locked_from_deaths + stranded_sink
 
             state.active_adventurers = max(0, state.active_adventurers + minted - deaths)
-            state.controlled_hexes = max(0, state.controlled_hexes + controlled_delta)
+            if sharing is not None:
+                sharing.churn(minted=minted, deaths=deaths)
+            if territory is not None:
+                state.controlled_hexes = territory.step(
+                    block_number=state.block_number,
+                    active_adventurers=state.active_adventurers,
+                    new_hexes=new_hexes // 7,
+                    surplus_band=adjusted_surplus_band,
+                )
+            elif state.hexes is not None:
+                state.controlled_hexes = state.hexes.advance(
+                    active_adventurers=state.active_adventurers,
+                    new_hexes=new_hexes // 7,
+                )
+            else:
+                state.controlled_hexes = max(0, state.controlled_hexes + controlled_delta)
 
             state.total_mints += minted
             state.total_deaths += deaths
@@ -355,59 +740,46 @@ class ScenarioRunner:
                 + stabilization_sink
                 + sink_burn
                 + locked_from_deaths
+                + stranded_sink
                 + policy_stabilization_sink
             )
 
-            # TWAP evolution: sell pressure and oversupply push price down.
-            mean_reversion_bp = int(
-                round(
-                    (
-                        state.twap_usdc_per_energy
-                        - scenario.initial_price_usdc_per_energy
-                    )
-                    / max(0.0001, scenario.initial_price_usdc_per_energy)
-                    * 180
+            if replayed_twaps is not None:
+                # Recorded oracle path: the next epoch quotes against this window's TWAP.
+                state.twap_usdc_per_energy = max(0.0001, replayed_twaps[epoch - 1])
+            else:
+                state.twap_usdc_per_energy = _synthetic_twap_step(
+                    state.twap_usdc_per_energy, scenario, adjusted_surplus_band, cfg
                 )
-            )
-            price_shift_bp = (
-                int(round(scenario.dca_sell_pressure_bp / cfg.dca_price_pressure_divisor))
-                + int(round(adjusted_surplus_band * cfg.supply_pressure_divisor))
-                - int(round(scenario.demand_shock_bp / 320))
-                + mean_reversion_bp
-            )
-            price_shift_bp = _clamp(price_shift_bp, -350, 350)
-            state.twap_usdc_per_energy *= max(0.90, 1 - price_shift_bp / 10_000)
-            state.twap_usdc_per_energy = max(0.001, min(2.5, state.twap_usdc_per_energy))
 
             if state.energy_supply < 0:
                 violations.append(f"epoch={epoch}: negative energy supply")
             if state.active_adventurers < 0:
                 violations.append(f"epoch={epoch}: negative adventurer count")
 
-            timeseries.append(
-                {
-                    "scenario": scenario.key,
-                    "epoch": epoch,
-                    "block_number": state.block_number,
-                    "active_adventurers": state.active_adventurers,
-                    "controlled_hexes": state.controlled_hexes,
-                    "energy_supply": state.energy_supply,
-                    "surplus_pool_energy": state.surplus_pool_energy,
-                    "twap_usdc_per_energy": round(state.twap_usdc_per_energy, 6),
-                    "mint_price_energy": mint_price,
-                    "minted_adventurers": minted,
-                    "deaths": deaths,
-                    "new_hexes": new_hexes,
-                    "extraction_source": extraction_source,
-                    "operational_sink": operational_sink,
-                    "stabilization_sink": stabilization_sink,
-                    "policy_stabilization_sink": policy_stabilization_sink,
-                    "policy_release": policy_release,
-                    "sink_burn": sink_burn,
-                    "locked_from_deaths": locked_from_deaths,
-                    "conversion_tax_bp": conversion_tax_bp,
-                }
+            timeseries.record(
+                epoch=epoch,
+                block_number=state.block_number,
+                active_adventurers=state.active_adventurers,
+                controlled_hexes=state.controlled_hexes,
+                energy_supply=state.energy_supply,
+                surplus_pool_energy=state.surplus_pool_energy,
+                twap_usdc_per_energy=round(state.twap_usdc_per_energy, 6),
+                mint_price_energy=mint_price,
+                minted_adventurers=minted,
+                deaths=deaths,
+                new_hexes=new_hexes,
+                extraction_source=extraction_source,
+                operational_sink=operational_sink,
+                stabilization_sink=stabilization_sink,
+                policy_stabilization_sink=policy_stabilization_sink,
+                policy_release=policy_release,
+                sink_burn=sink_burn,
+                locked_from_deaths=locked_from_deaths,
+                conversion_tax_bp=conversion_tax_bp,
             )
+            if on_epoch is not None:
+                on_epoch(timeseries[-1])
 
         sink_source_ratio = state.total_sinks / max(1, state.total_sources)
         net_inflation_pct = (
@@ -436,11 +808,34 @@ class ScenarioRunner:
             net_inflation_pct=round(net_inflation_pct, 4),
         )
 
+        components: Dict[str, Dict[str, float]] = {}
+        if mines is not None:
+            components["mines"] = mines.metrics()
+        if territory is not None:
+            components["territory"] = territory.metrics()
+        if conversion is not None:
+            components["conversion"] = conversion.metrics()
+        if policy is not None:
+            components["policy"] = policy.metrics()
+        if cohorts is not None:
+            components["cohorts"] = cohorts.metrics()
+        if state.hexes is not None:
+            components["hexes"] = state.hexes.metrics()
+        if sharing is not None:
+            components["sharing"] = sharing.metrics()
+        sketches: Dict[str, dict] = {}
+        for name, layer in (("territory", territory), ("policy", policy)):
+            if layer is not None:
+                for metric, payload in layer.sketches().items():
+                    sketches[f"{name}.{metric}"] = payload
+
         return ScenarioResult(
             scenario=scenario,
             summary=summary,
             timeseries=timeseries,
             invariant_violations=violations,
+            components=components,
+            sketches=sketches,
         )
 
     def run_matrix(self, scenarios: Iterable[Scenario], out_dir: Path) -> List[ScenarioResult]:
@@ -449,6 +844,12 @@ class ScenarioRunner:
         if not results:
             return []
 
+        self.write_artifacts(results, out_dir)
+        return results
+
+    def write_artifacts(self, results: List[ScenarioResult], out_dir: Path) -> None:
+        """Write the standard run artifacts for already-computed results."""
+        out_dir.mkdir(parents=True, exist_ok=True)
         self._write_timeseries(out_dir / "timeseries.csv", results)
         self._write_comparison(out_dir / "scenario_comparison.csv", results)
 
@@ -461,6 +862,11 @@ class ScenarioRunner:
             "worst_inflation": max(results, key=lambda r: r.summary.net_inflation_pct).summary.key,
             "scenarios": [asdict(r.summary) for r in results],
         }
+        if any(r.components for r in results):
+            run_summary["components"] = {r.scenario.key: r.components for r in results}
+        if any(r.sketches for r in results):
+            # Results sharing a scenario key (seeds, sweep workers) merge into one band.
+            run_summary["kpi_bands"] = _sibling_module("kpi_stream").bands_by_scenario(results)
         (out_dir / "run_summary.json").write_text(
             json.dumps(run_summary, indent=2, sort_keys=True) + "\n",
             encoding="utf-8",
@@ -483,19 +889,13 @@ class ScenarioRunner:
             encoding="utf-8",
         )
 
-        return results
-
     @staticmethod
     def _write_timeseries(path: Path, results: List[ScenarioResult]) -> None:
-        rows: List[dict] = []
-        for result in results:
-            rows.extend(result.timeseries)
-
-        fieldnames = list(rows[0].keys())
         with path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(f)
+            writer.writerow(results[0].timeseries.fieldnames)
+            for result in results:
+                writer.writerows(result.timeseries.iter_values())
 
     @staticmethod
     def _write_comparison(path: Path, results: List[ScenarioResult]) -> None:
@@ -666,6 +1066,87 @@ def build_default_scenarios() -> List[Scenario]:
     ]
 
 
+def scenario_from_spec(spec: dict) -> Scenario:
+    """Build a scenario from `{"base": <default scenario key>, **field_overrides}`."""
+    spec = dict(spec)
+    defaults = {s.key: s for s in build_default_scenarios()}
+    base_key = spec.pop("base", "baseline_10k")
+    if base_key not in defaults:
+        raise ValueError(f"unknown base scenario: {base_key}")
+    _reject_unknown_fields(spec, Scenario, "scenario")
+    return replace(defaults[base_key], **spec)
+
+
+def config_from_dict(overrides: dict) -> SimConfig:
+    """Build a `SimConfig` from JSON-style overrides (mode given by value)."""
+    overrides = dict(overrides)
+    _reject_unknown_fields(overrides, SimConfig, "config")
+    if "mode" in overrides:
+        overrides["mode"] = ModelMode(overrides["mode"])
+    return replace(SimConfig(), **overrides)
+
+
+def _reject_unknown_fields(overrides: dict, cls: type, label: str) -> None:
+    unknown = sorted(set(overrides) - {f.name for f in fields(cls)})
+    if unknown:
+        raise ValueError(f"unknown {label} fields: {', '.join(unknown)}")
+
+
+def _synthetic_twap_step(
+    twap: float,
+    scenario: Scenario,
+    adjusted_surplus_band: int,
+    cfg: SimConfig,
+) -> float:
+    # TWAP evolution: sell pressure and oversupply push price down.
+    mean_reversion_bp = int(
+        round(
+            (twap - scenario.initial_price_usdc_per_energy)
+            / max(0.0001, scenario.initial_price_usdc_per_energy)
+            * 180
+        )
+    )
+    price_shift_bp = (
+        int(round(scenario.dca_sell_pressure_bp / cfg.dca_price_pressure_divisor))
+        + int(round(adjusted_surplus_band * cfg.supply_pressure_divisor))
+        - int(round(scenario.demand_shock_bp / 320))
+        + mean_reversion_bp
+    )
+    price_shift_bp = _clamp(price_shift_bp, -350, 350)
+    twap *= max(0.90, 1 - price_shift_bp / 10_000)
+    return max(0.001, min(2.5, twap))
+
+
+def _adjusted_surplus_band(current_supply: int, baseline_supply: int, scenario: Scenario) -> int:
+    surplus_band = _energy_surplus_band(current_supply, baseline_supply)
+    return _clamp(surplus_band + int(round(scenario.supply_shock_bp / 2_000)), -8, 8)
+
+
+def _demand_intent(cfg: SimConfig, scenario: Scenario, adjusted_surplus_band: int) -> int:
+    demand_intent = int(
+        round(
+            cfg.target_mints_per_epoch
+            * (1 + scenario.demand_shock_bp / 10_000)
+            * (1 + 0.25 * adjusted_surplus_band / 10)
+        )
+    )
+    return max(5, demand_intent)
+
+
+def _controller_bounds(cfg: SimConfig, baseline_supply: int, epoch: int, epochs: int) -> tuple[int, int]:
+    """(lower, upper) supply band of the inflation controller at the end of `epoch`."""
+    progress = epoch / max(1, epochs)
+    target_supply = int(
+        round(
+            baseline_supply
+            * (1 + (cfg.target_final_inflation_pct / 100.0) * progress)
+        )
+    )
+    upper_bound = target_supply + (target_supply * cfg.inflation_upper_band_bp // 10_000)
+    lower_bound = target_supply - (target_supply * cfg.inflation_lower_band_bp // 10_000)
+    return lower_bound, upper_bound
+
+
 def _owner_scale_bp(owner_alive_count: int) -> int:
     if owner_alive_count <= 2:
         return 10_000
@@ -730,6 +1211,11 @@ def _clamp(value: int, min_value: int, max_value: int) -> int:
     return max(min_value, min(max_value, value))
 
 
+def _sibling_module(name: str):
+    # Works both as `python3 game/sim/bootstrap_world_sim.py` and as `game.sim.*` imports.
+    return importlib.import_module(f"{__package__}.{name}" if __package__ else name)
+
+
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run bootstrap world scenario matrix simulation.",
@@ -746,13 +1232,90 @@ def _parse_args() -> argparse.Namespace:
         default=ModelMode.CODE_EXACT.value,
         help="Simulation mode. Keep code_exact as baseline truth.",
     )
+    parser.add_argument(
+        "--twap-replay",
+        type=Path,
+        default=None,
+        help="Recorded price file (CSV or compiled binary) replacing the synthetic TWAP path.",
+    )
+    parser.add_argument(
+        "--calibration",
+        type=Path,
+        default=None,
+        help="calibration.json from event_ingest.py overriding SimConfig coefficients.",
+    )
+    parser.add_argument(
+        "--per-mine-collapse",
+        action="store_true",
+        help="Derive collapse deaths from the per-mine stress model in mine_population.py.",
+    )
+    parser.add_argument(
+        "--territory",
+        action="store_true",
+        help="Track controlled hexes with the spatial decay/claim model in territory.py.",
+    )
+    parser.add_argument(
+        "--biome-hexes",
+        action="store_true",
+        help="Charge biome upkeep and decay hexes through the histogram in hex_histogram.py.",
+    )
+    parser.add_argument(
+        "--resource-sharing",
+        action="store_true",
+        help="Settle harvest share rules over the owner x grantee matrix in sharing_flows.py; "
+        "shares stranded on dead adventurers are locked out of circulation.",
+    )
+    parser.add_argument(
+        "--conversion-window",
+        action="store_true",
+        help="Price conversion tax from per-item volume windows in conversion_window.py.",
+    )
+    parser.add_argument(
+        "--adventurer-policy",
+        action="store_true",
+        help="Derive the miner share from archetype decisions in adventurer_policy.py.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = _parse_args()
-    config = SimConfig(mode=ModelMode(args.mode))
-    runner = ScenarioRunner(config)
+    mode = ModelMode(args.mode)
+    if args.calibration is not None:
+        config = SimConfig.from_calibration(args.calibration, mode=mode)
+    else:
+        config = SimConfig(mode=mode)
+    twap_source = None
+    if args.twap_replay is not None:
+        twap_source = _sibling_module("twap_replay").load_price_stream(args.twap_replay)
+    collapse_model = None
+    if args.per_mine_collapse:
+        collapse_model = _sibling_module("mine_population").MinePopulationModel()
+    territory_model = None
+    if args.territory:
+        territory_model = _sibling_module("territory").TerritoryModel()
+    hex_model = None
+    if args.biome_hexes:
+        hex_model = _sibling_module("hex_histogram").HexHistogramModel()
+    sharing_model = None
+    if args.resource_sharing:
+        sharing_model = _sibling_module("sharing_flows").SharingModel()
+    conversion_model = None
+    if args.conversion_window:
+        conversion_model = _sibling_module("conversion_window").ConversionModel()
+    policy_model = None
+    if args.adventurer_policy:
+        policy_model = _sibling_module("adventurer_policy").PolicyModel()
+    runner = ScenarioRunner(
+        config,
+        twap_source=twap_source,
+        collapse_model=collapse_model,
+        territory_model=territory_model,
+        conversion_model=conversion_model,
+        policy_model=policy_model,
+        hex_model=hex_model,
+        sharing_model=sharing_model,
+    )
     results = runner.run_matrix(build_default_scenarios(), args.out_dir)
 
     print(f"mode={config.mode.value}")
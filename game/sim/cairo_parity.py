@@ -0,0 +1,748 @@
+#!/usr/bin/env python3
+"""Parity checks between the Python models and the Cairo math libraries.
+
+The simulators re-implement on-chain economics (`conversion_window`,
+`claim_escrow`, `territory`, `sharing_flows`) and the construction balance tool keeps its own
+copy of the `construction_balance.cairo` tables in JSON. This module catches
+drift in three ways:
+
+- Reference ports: integer-exact ports of `math_bp`, `conversion_math`,
+  `decay_math`, `sharing_math` and (from the JSON config)
+  `construction_balance`. u16/u32/u128 overflow, failed `try_into().unwrap()`
+  and `assert` raise `CairoPanic`, so a port fails the same inputs the
+  contract rejects.
+- Golden vectors: every `assert(fn(args) == expected, 'TAG')` in
+  `game/src/tests/unit/<lib>_test.cairo` whose arguments are literals, library
+  constants or simple `let` bindings is replayed against the ports.
+- Fuzzing: each Python model with a port is run on random argument columns
+  (full-width values, small values and edge values around the bp and
+  saturation thresholds) and compared with the port batch by batch. One core
+  checks roughly 200k-450k inputs per second depending on the machine, so
+  the default 100k samples per model finish in a few seconds; pass
+  `--samples` for a deeper run.
+
+`constant_drift` also compares the Cairo tables and constants (construction
+recipes, stakes, upkeep, effects, biome upkeep, contract timing constants)
+with the JSON config and the Python module constants. `sweep_queue enqueue`
+runs it first, so a sweep never starts on stale numbers.
+
+Usage:
+
+```bash
+python3 -m game.sim.cairo_parity                      # golden + constants + 100k fuzz samples per model
+python3 -m game.sim.cairo_parity --samples 1000000 --seed 7  # deeper run, 20-40 seconds
+python3 -m game.sim.cairo_parity --constants-only
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+try:
+    from . import claim_escrow, conversion_window, sharing_flows, territory
+except ImportError:
+    import claim_escrow  # type: ignore[no-redef]
+    import conversion_window  # type: ignore[no-redef]
+    import sharing_flows  # type: ignore[no-redef]
+    import territory  # type: ignore[no-redef]
+
+CAIRO_SRC = Path(__file__).resolve().parents[1] / "src"
+BALANCE_TOOL = Path(__file__).resolve().parents[2] / "docs" / "04-economy" / "tools" / "construction_balance_sim.py"
+BALANCE_CONFIG = BALANCE_TOOL.with_name("construction_balance_config.v1.json")
+
+LIBS = ("math_bp", "conversion_math", "decay_math", "sharing_math", "construction_balance")
+BP_DENOMINATOR = 10_000
+DEFAULT_FUZZ_SAMPLES = 100_000
+DEFAULT_BATCH = 65_536
+
+# (python module, attribute, cairo file under game/src, cairo const) mirrored by hand.
+MIRRORED_CONSTANTS = (
+    (conversion_window, "MAX_VOLUME_PENALTY_BP", "libs/conversion_math.cairo", "MAX_VOLUME_PENALTY_BP"),
+    (conversion_window, "VOLUME_UNITS_STEP", "libs/conversion_math.cairo", "VOLUME_UNITS_STEP"),
+    (conversion_window, "VOLUME_PENALTY_STEP_BP", "libs/conversion_math.cairo", "VOLUME_PENALTY_STEP_BP"),
+    (
+        conversion_window,
+        "CONVERSION_WINDOW_BLOCKS",
+        "systems/economic_manager_contract.cairo",
+        "CONVERSION_WINDOW_BLOCKS",
+    ),
+    (claim_escrow, "CLAIM_TIMEOUT_BLOCKS", "systems/economic_manager_contract.cairo", "CLAIM_TIMEOUT_BLOCKS"),
+    (claim_escrow, "CLAIM_GRACE_BLOCKS", "systems/economic_manager_contract.cairo", "CLAIM_GRACE_BLOCKS"),
+    (territory, "DECAY_PERIOD_BLOCKS", "systems/economic_manager_contract.cairo", "DECAY_PERIOD_BLOCKS"),
+    (
+        territory,
+        "CLAIMABLE_DECAY_THRESHOLD",
+        "systems/economic_manager_contract.cairo",
+        "CLAIMABLE_DECAY_THRESHOLD",
+    ),
+    (territory, "DECAY_RECOVERY_BP", "systems/economic_manager_contract.cairo", "DECAY_RECOVERY_BP"),
+    (sharing_flows, "SHARE_RECIPIENT_LIMIT", "libs/sharing_math.cairo", "SHARE_RECIPIENT_LIMIT"),
+    (sharing_flows, "SCOPE_GLOBAL", "libs/sharing_math.cairo", "SCOPE_GLOBAL"),
+    (sharing_flows, "SCOPE_HEX", "libs/sharing_math.cairo", "SCOPE_HEX"),
+    (sharing_flows, "SCOPE_AREA", "libs/sharing_math.cairo", "SCOPE_AREA"),
+)
+
+
+class CairoPanic(ArithmeticError):
+    """A reference port hit a Cairo panic (overflow, failed unwrap or assert)."""
+
+
+def _u(value: int, bits: int) -> int:
+    if not 0 <= value < 1 << bits:
+        raise CairoPanic(f"u{bits} overflow: {value}")
+    return value
+
+
+# math_bp.cairo ---------------------------------------------------------------
+
+
+def mul_bp_floor(value: int, bp: int) -> int:
+    return _u(value * bp, 128) // BP_DENOMINATOR
+
+
+def div_floor(numerator: int, denominator: int) -> int:
+    if denominator == 0:
+        raise CairoPanic("DIV_ZERO")
+    return numerator // denominator
+
+
+def clamp_u128(value: int, min_value: int, max_value: int) -> int:
+    if min_value > max_value:
+        raise CairoPanic("BAD_BOUNDS")
+    return min(max(value, min_value), max_value)
+
+
+# conversion_math.cairo -------------------------------------------------------
+
+
+def penalty_bp_for_units(units_converted_in_window: int) -> int:
+    penalty = units_converted_in_window // 10 * 100
+    return 5_000 if penalty > 5_000 else penalty
+
+
+def effective_rate_for_window(base_rate: int, units_converted_in_window: int) -> int:
+    effective = base_rate * (10_000 - penalty_bp_for_units(units_converted_in_window)) // 10_000
+    if effective == 0 and base_rate > 0:
+        return 1
+    return _u(effective, 16)
+
+
+def effective_rate(
+    current_rate: int,
+    base_rate: int,
+    last_update_block: int,
+    units_converted_in_window: int,
+    now_block: int,
+    window_blocks: int,
+) -> int:
+    """`effective_rate` with the `ConversionRate` fields passed flat."""
+    if window_blocks == 0:
+        return base_rate
+    in_window = now_block - last_update_block < window_blocks if now_block >= last_update_block else True
+    if in_window:
+        return effective_rate_for_window(current_rate, units_converted_in_window)
+    return base_rate
+
+
+def quote_energy(quantity: int, rate_per_unit: int) -> int:
+    energy = quantity * rate_per_unit
+    return 65_535 if energy > 65_535 else energy
+
+
+# decay_math.cairo ------------------------------------------------------------
+
+
+def maintenance_decay_recovery(energy_paid: int, upkeep_per_period: int, recovery_bp: int) -> int:
+    if upkeep_per_period == 0 or energy_paid == 0:
+        return 0
+    recovery_per_period = recovery_bp // 5 if recovery_bp >= 5 else 1
+    recovery = energy_paid // upkeep_per_period * recovery_per_period
+    return 100 if recovery > 100 else recovery
+
+
+def min_claim_energy(upkeep_per_period: int, decay_level: int, claimable_threshold: int) -> int:
+    extra_decay = decay_level - claimable_threshold if decay_level > claimable_threshold else 0
+    total = upkeep_per_period * 2 + extra_decay * 5
+    if total == 0:
+        return 1
+    return 65_535 if total > 65_535 else total
+
+
+# sharing_math.cairo ----------------------------------------------------------
+
+
+def is_valid_permissions_mask(mask: int) -> bool:
+    return 0 < mask <= 15
+
+
+def has_permissions(mask: int, required_mask: int) -> bool:
+    if not is_valid_permissions_mask(required_mask) or not is_valid_permissions_mask(mask):
+        return False
+    return required_mask & ~mask == 0
+
+
+def alloc_from_bp_floor_u32(gross: int, bp: int) -> int:
+    if gross == 0 or bp == 0:
+        return 0
+    scaled = gross * bp // 10_000
+    return 4_294_967_295 if scaled > 4_294_967_295 else scaled
+
+
+def residual_after_allocations(gross: int, distributed: int) -> int:
+    return 0 if distributed >= gross else gross - distributed
+
+
+def can_set_share_total(total_bp: int) -> bool:
+    return total_bp <= 10_000
+
+
+def can_add_share(existing_total_bp: int, new_share_bp: int) -> bool:
+    return existing_total_bp + new_share_bp <= 10_000
+
+
+def is_epoch_active(row_epoch: int, policy_epoch: int) -> bool:
+    return row_epoch == policy_epoch
+
+
+def nearest_scope_level(area_active: bool, hex_active: bool, global_active: bool) -> int:
+    if area_active:
+        return 3
+    if hex_active:
+        return 2
+    return 1 if global_active else 0
+
+
+@dataclass(frozen=True)
+class Port:
+    """A Cairo function, its reference port and the Python model that must agree with it."""
+
+    path: str
+    reference: Callable
+    # Cairo argument types: "u16", "u32", "u64", "u128" or "bool"; None for felt ids.
+    types: Tuple[str, ...] | None
+    model: Callable | None = None
+    # Maps the reference output onto what the model returns (e.g. an extra cap).
+    expect: Callable | None = None
+
+
+def reference_ports(config: dict | None = None) -> Dict[str, Port]:
+    """Ports keyed by `lib::function`; construction_balance ones read `config`."""
+    ports = [
+        Port("math_bp::mul_bp_floor", mul_bp_floor, ("u128", "u128")),
+        Port("math_bp::div_floor", div_floor, ("u128", "u128")),
+        Port("math_bp::clamp_u128", clamp_u128, ("u128", "u128", "u128")),
+        Port(
+            "conversion_math::penalty_bp_for_units",
+            penalty_bp_for_units,
+            ("u32",),
+            conversion_window.penalty_bp_for_units,
+        ),
+        Port(
+            "conversion_math::effective_rate_for_window",
+            effective_rate_for_window,
+            ("u16", "u32"),
+            conversion_window.effective_rate_for_window,
+        ),
+        Port(
+            "conversion_math::effective_rate",
+            effective_rate,
+            ("u16", "u16", "u64", "u32", "u64", "u64"),
+            conversion_window.effective_rate,
+        ),
+        Port("conversion_math::quote_energy", quote_energy, ("u16", "u16"), conversion_window.quote_energy),
+        Port(
+            "decay_math::maintenance_decay_recovery",
+            maintenance_decay_recovery,
+            ("u16", "u32", "u16"),
+            territory.maintenance_decay_recovery,
+        ),
+        Port(
+            "decay_math::min_claim_energy",
+            min_claim_energy,
+            ("u32", "u16", "u16"),
+            claim_escrow.min_claim_energy,
+            lambda energy: min(claim_escrow.CLAIM_SURFACE_MIN_ENERGY_CAP, energy),
+        ),
+        Port("sharing_math::is_valid_permissions_mask", is_valid_permissions_mask, ("u16",)),
+        Port("sharing_math::has_permissions", has_permissions, ("u16", "u16")),
+        Port("sharing_math::alloc_from_bp_floor_u32", alloc_from_bp_floor_u32, ("u32", "u16")),
+        Port("sharing_math::residual_after_allocations", residual_after_allocations, ("u32", "u32")),
+        Port("sharing_math::can_set_share_total", can_set_share_total, ("u16",)),
+        Port("sharing_math::can_add_share", can_add_share, ("u16", "u16")),
+        Port("sharing_math::is_epoch_active", is_epoch_active, ("u32", "u32")),
+        Port(
+            "sharing_math::nearest_scope_level",
+            nearest_scope_level,
+            ("bool", "bool", "bool"),
+            sharing_flows.nearest_scope_level,
+        ),
+    ]
+    ports += _construction_ports(config if config is not None else load_balance_config())
+    return {port.path: port for port in ports}
+
+
+def _construction_ports(config: dict) -> List[Port]:
+    # The JSON config is the Python side of construction_balance.cairo, so its
+    # lookups stand in for the port and the Cairo tests' golden vectors check it.
+    sim = _balance_sim()
+    values = config["resource_energy_values"]
+    buildings = {b["id"]: b for b in config["buildings"]}
+
+    def building_field(name: str) -> Callable[[str], int]:
+        return lambda building_id: int(buildings.get(building_id, {}).get(name, 0))
+
+    def effect_bp(building_id: str) -> int:
+        effect = buildings.get(building_id, {}).get("effect", {})
+        return int(effect.get("bp", 0))
+
+    def capex(building_id: str) -> int:
+        return int(sim.capex_energy_equivalent(buildings[building_id], values)) if building_id in buildings else 0
+
+    lookups = {
+        "resource_energy_value": lambda item_id: int(values.get(item_id, 0)),
+        "recipe_qty": lambda building_id, item_id: int(
+            buildings.get(building_id, {}).get("recipe", {}).get(item_id, 0)
+        ),
+        "energy_stake_for_building": building_field("energy_stake"),
+        "build_time_blocks_for_building": building_field("build_time_blocks"),
+        "upkeep_per_100_blocks": building_field("upkeep_per_100_blocks"),
+        "effect_bp_for_building": effect_bp,
+        "capex_energy_equivalent": capex,
+    }
+    return [Port(f"construction_balance::{name}", fn, None) for name, fn in lookups.items()]
+
+
+# Golden vectors from the Cairo unit tests -------------------------------------
+
+
+class Golden(NamedTuple):
+    path: str
+    args: Tuple
+    expected: object
+    source: str
+
+
+_LITERAL = re.compile(r"^(\d[\d_]*)(?:_(?:u\d+|felt252))?$")
+_FELT = re.compile(r"^'(\w+)'(?:_felt252)?$")
+_CONST = re.compile(r"(?:pub\s+)?const\s+(\w+)\s*:\s*\w+\s*=\s*([^;]+);")
+_LET = re.compile(r"^\s*let\s+(\w+)(?:\s*:\s*\w+)?\s*=\s*(.+);\s*$")
+_ASSERT = re.compile(r"assert\((.*),\s*'(\w+)'\s*\);", re.S)
+_CALL = re.compile(r"^(!?)\s*(\w+)\((.*)\)$", re.S)
+_COMMENT = re.compile(r"//[^\n]*")
+
+
+def cairo_constants(path: Path) -> Dict[str, object]:
+    """`const` values declared in one Cairo file (literals, felt strings and sums)."""
+    constants: Dict[str, object] = {}
+    for name, expr in _CONST.findall(_COMMENT.sub("", path.read_text(encoding="utf-8"))):
+        value = _evaluate(expr, constants)
+        if value is not None:
+            constants[name] = value
+    return constants
+
+
+def _evaluate(expr: str, scope: Dict[str, object]) -> object | None:
+    """Value of a literal, felt string, bool, known name or `a + b` sum; None otherwise."""
+    terms = [term.strip() for term in expr.strip().split("+")]
+    values = []
+    for term in terms:
+        if term in ("true", "false"):
+            values.append(term == "true")
+        elif term in scope:
+            values.append(scope[term])
+        elif match := _LITERAL.match(term):
+            values.append(int(match.group(1).replace("_", "")))
+        elif match := _FELT.match(term):
+            values.append(match.group(1))
+        else:
+            return None
+    if len(values) == 1:
+        return values[0]
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return None
+    return sum(values)
+
+
+def _split_args(text: str) -> List[str]:
+    args, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            args.append("".join(current))
+            current = []
+            continue
+        depth += char in "(["
+        depth -= char in ")]"
+        current.append(char)
+    if "".join(current).strip():
+        args.append("".join(current))
+    return args
+
+
+def golden_vectors(src: Path = CAIRO_SRC, libs: Sequence[str] = LIBS) -> List[Golden]:
+    """Call/expected pairs the Cairo unit tests assert with resolvable arguments."""
+    vectors: List[Golden] = []
+    for lib in libs:
+        test_path = src / "tests" / "unit" / f"{lib}_test.cairo"
+        if not test_path.exists():
+            continue
+        constants = cairo_constants(src / "libs" / f"{lib}.cairo")
+        text = _COMMENT.sub("", test_path.read_text(encoding="utf-8"))
+        scope: Dict[str, object] = {}
+        calls: Dict[str, Tuple[str, Tuple]] = {}
+        for lineno, statement in _statements(text):
+            if statement.lstrip().startswith("fn "):
+                scope, calls = {}, {}
+                continue
+            if let := _LET.match(statement):
+                name, expr = let.groups()
+                scope.pop(name, None)
+                calls.pop(name, None)
+                call = _resolve_call(expr.strip(), {**constants, **scope})
+                if call is not None and not call[0]:
+                    calls[name] = call[1:]
+                else:
+                    value = _evaluate(expr, {**constants, **scope})
+                    if value is not None:
+                        scope[name] = value
+                continue
+            found = _ASSERT.search(statement)
+            if not found:
+                continue
+            condition = found.group(1).strip()
+            lhs, _, rhs = condition.partition("==")
+            names = {**constants, **scope}
+            if rhs:
+                expected = _evaluate(rhs, names)
+                call = _resolve_call(lhs.strip(), names)
+                if call is None and lhs.strip() in calls:
+                    call = (False, *calls[lhs.strip()])
+                if expected is None or call is None or call[0]:
+                    continue
+                _, fn, args = call
+            else:
+                call = _resolve_call(condition, names)
+                if call is None:
+                    continue
+                negated, fn, args = call
+                expected = not negated
+            vectors.append(Golden(f"{lib}::{fn}", args, expected, f"{test_path.name}:{lineno}"))
+    return vectors
+
+
+def _statements(text: str):
+    """`(line, statement)` pairs split on `;`, `{` and `}` so asserts spanning lines stay whole."""
+    start, buffer, lineno = 1, [], 1
+    for char in text:
+        if not buffer and char.isspace():
+            if char == "\n":
+                lineno += 1
+            continue
+        if not buffer:
+            start = lineno
+        buffer.append(char)
+        if char == "\n":
+            lineno += 1
+        if char in ";{}":
+            yield start, "".join(buffer).strip()
+            buffer = []
+
+
+def _resolve_call(expr: str, names: Dict[str, object]) -> Tuple[bool, str, Tuple] | None:
+    match = _CALL.match(expr)
+    if not match:
+        return None
+    negated, fn, inner = match.groups()
+    args = tuple(_evaluate(arg, names) for arg in _split_args(inner))
+    if any(arg is None for arg in args):
+        return None
+    return bool(negated), fn, args
+
+
+def check_golden(ports: Dict[str, Port], vectors: Sequence[Golden]) -> List[str]:
+    """Mismatches between the ports and the Cairo tests' expectations."""
+    failures = []
+    for vector in vectors:
+        port = ports.get(vector.path)
+        if port is None:
+            continue
+        try:
+            actual = port.reference(*vector.args)
+        except CairoPanic as exc:
+            actual = f"panic ({exc})"
+        if actual != vector.expected:
+            failures.append(
+                f"{vector.source} {vector.path}{vector.args}: cairo={vector.expected!r} python={actual!r}"
+            )
+    return failures
+
+
+# Fuzzing ---------------------------------------------------------------------
+
+
+_BITS = {"u16": 16, "u32": 32, "u64": 64, "u128": 128}
+_EDGES = (0, 1, 2, 4, 5, 9, 10, 11, 99, 100, 101, 4_999, 5_000, 5_001, 9_999, 10_000, 10_001, 65_535, 65_536)
+_PANIC = object()
+
+
+@dataclass
+class FuzzReport:
+    samples: int = 0
+    seconds: float = 0.0
+    panics: Dict[str, int] = field(default_factory=dict)
+    # path -> up to `keep` (args, expected, actual) examples.
+    mismatches: Dict[str, List[Tuple[Tuple, object, object]]] = field(default_factory=dict)
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds else 0.0
+
+
+def _column(kind: str, count: int, rng: random.Random) -> List:
+    if kind == "bool":
+        bits = rng.getrandbits(count) if count else 0
+        return [bool(bits >> i & 1) for i in range(count)]
+    bits = _BITS[kind]
+    edges = [e for e in _EDGES if e < 1 << bits] + [(1 << bits) - 2, (1 << bits) - 1]
+    getrandbits, randrange, pick = rng.getrandbits, rng.randrange, rng.random
+    # 40% full width, 40% below 20k (where the bp thresholds sit), 20% edge values.
+    return [
+        getrandbits(bits) if r < 0.4 else randrange(20_001) if r < 0.8 else edges[int((r - 0.8) * 5 * len(edges))]
+        for r in (pick() for _ in range(count))
+    ]
+
+
+def _guarded(fn: Callable) -> Callable:
+    def call(*args):
+        try:
+            return fn(*args)
+        except CairoPanic:
+            return _PANIC
+
+    return call
+
+
+def fuzz(
+    ports: Dict[str, Port],
+    samples: int = DEFAULT_FUZZ_SAMPLES,
+    seed: int = 0,
+    batch: int = DEFAULT_BATCH,
+    keep: int = 5,
+) -> FuzzReport:
+    """Compare every port that has a model on `samples` random argument tuples each.
+
+    Inputs on which the reference panics are skipped (the contract would
+    revert) and counted in `panics`.
+    """
+    rng = random.Random(seed)
+    report = FuzzReport()
+    started = time.perf_counter()
+    for path, port in ports.items():
+        if port.model is None or port.types is None:
+            continue
+        reference, model, expect = _guarded(port.reference), port.model, port.expect
+        done = 0
+        while done < samples:
+            n = min(batch, samples - done)
+            done += n
+            columns = [_column(kind, n, rng) for kind in port.types]
+            expected = list(map(reference, *columns))
+            if expect is not None:
+                expected = [e if e is _PANIC else expect(e) for e in expected]
+            actual = list(map(model, *columns))
+            report.samples += n
+            if expected == actual:
+                continue
+            for i, (e, a) in enumerate(zip(expected, actual)):
+                if e is _PANIC:
+                    report.panics[path] = report.panics.get(path, 0) + 1
+                elif e != a:
+                    examples = report.mismatches.setdefault(path, [])
+                    if len(examples) < keep:
+                        examples.append((tuple(column[i] for column in columns), e, a))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+# Constant drift --------------------------------------------------------------
+
+
+_CHAIN_ENTRY = re.compile(r"if\s+\w+\s*==\s*(\w+)\s*\{\s*\(?\s*(\d[\d_]*)_u\d+(?:\s*,\s*(\d[\d_]*)_u\d+\s*\))?")
+_RECIPE_LINE = re.compile(r"if\s+(building_id|item_id)\s*==\s*(\w+)\s*\{\s*(?:(\d[\d_]*)_u16)?")
+_BIOME_PROFILE = re.compile(r"Biome::(\w+)\s*=>\s*profile\(\s*(\d[\d_]*)_u32")
+
+
+def _function_body(text: str, name: str) -> str:
+    start = text.index(f"fn {name}(")
+    depth, i = 0, text.index("{", start)
+    for j in range(i, len(text)):
+        depth += text[j] == "{"
+        depth -= text[j] == "}"
+        if depth == 0:
+            return text[i : j + 1]
+    raise ValueError(f"unterminated fn {name}")
+
+
+def cairo_construction_tables(src: Path = CAIRO_SRC) -> dict:
+    """The hard-coded `construction_balance.cairo` tables keyed like the JSON config."""
+    path = src / "libs" / "construction_balance.cairo"
+    text = path.read_text(encoding="utf-8")
+    ids = {name: value for name, value in cairo_constants(path).items() if isinstance(value, str)}
+
+    def chain(fn: str) -> Dict[str, Tuple[int, ...]]:
+        return {
+            ids[key]: tuple(int(v.replace("_", "")) for v in values if v)
+            for key, *values in _CHAIN_ENTRY.findall(_function_body(text, fn))
+        }
+
+    recipes: Dict[str, Dict[str, int]] = {}
+    building = None
+    for kind, key, qty in _RECIPE_LINE.findall(_function_body(text, "recipe_qty")):
+        if kind == "building_id":
+            building = ids[key]
+            recipes[building] = {}
+        elif building is not None:
+            recipes[building][ids[key]] = int(qty.replace("_", ""))
+
+    single = lambda fn: {k: v[0] for k, v in chain(fn).items()}  # noqa: E731
+    return {
+        "resource_energy_values": single("resource_energy_value"),
+        "recipe": recipes,
+        "energy_stake": single("energy_stake_for_building"),
+        "build_time_blocks": single("build_time_blocks_for_building"),
+        "upkeep_per_100_blocks": single("upkeep_per_100_blocks"),
+        "effect_bp": single("effect_bp_for_building"),
+        "timed_params": chain("timed_params_for_building"),
+    }
+
+
+def constant_drift(config: dict | None = None, src: Path = CAIRO_SRC) -> List[str]:
+    """Every JSON or Python constant that disagrees with its Cairo source."""
+    config = config if config is not None else load_balance_config()
+    tables = cairo_construction_tables(src)
+    drift: List[str] = []
+
+    def compare(label: str, python_value, cairo_value) -> None:
+        if python_value != cairo_value:
+            drift.append(f"{label}: python={python_value!r} cairo={cairo_value!r}")
+
+    values = config["resource_energy_values"]
+    for item in sorted(set(values) | set(tables["resource_energy_values"])):
+        compare(f"resource_energy_values.{item}", values.get(item), tables["resource_energy_values"].get(item))
+
+    buildings = {b["id"]: b for b in config["buildings"]}
+    for building_id in sorted(set(buildings) | set(tables["recipe"])):
+        building = buildings.get(building_id)
+        if building is None:
+            drift.append(f"buildings.{building_id}: missing from the JSON config")
+            continue
+        recipe = {item: qty for item, qty in building.get("recipe", {}).items() if qty}
+        compare(f"buildings.{building_id}.recipe", recipe, tables["recipe"].get(building_id))
+        for key in ("energy_stake", "build_time_blocks", "upkeep_per_100_blocks"):
+            compare(f"buildings.{building_id}.{key}", building.get(key), tables[key].get(building_id))
+        effect = building.get("effect", {})
+        if "bp" in effect:
+            compare(f"buildings.{building_id}.effect.bp", effect["bp"], tables["effect_bp"].get(building_id))
+        if "discount_bp" in effect or building_id in tables["timed_params"]:
+            compare(
+                f"buildings.{building_id}.effect.(discount_bp, time_cut_bp)",
+                (effect.get("discount_bp"), effect.get("time_cut_bp")),
+                tables["timed_params"].get(building_id),
+            )
+
+    for module, attribute, cairo_file, const in MIRRORED_CONSTANTS:
+        compare(
+            f"{module.__name__.rsplit('.', 1)[-1]}.{attribute}",
+            getattr(module, attribute),
+            cairo_constants(src / cairo_file).get(const),
+        )
+
+    profiles = src / "libs" / "biome_profiles.cairo"
+    upkeep = {name.lower(): int(value) for name, value in _BIOME_PROFILE.findall(profiles.read_text("utf-8"))}
+    for biome in sorted(set(upkeep) | set(territory.BIOME_UPKEEP)):
+        compare(f"territory.BIOME_UPKEEP.{biome}", territory.BIOME_UPKEEP.get(biome), upkeep.get(biome))
+    return drift
+
+
+def load_balance_config(path: Path = BALANCE_CONFIG) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _balance_sim():
+    spec = importlib.util.spec_from_file_location("construction_balance_sim", BALANCE_TOOL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_parity(samples: int = DEFAULT_FUZZ_SAMPLES, seed: int = 0, config: dict | None = None) -> dict:
+    """Golden vectors, constant drift and (when `samples`) fuzzing in one report."""
+    config = config if config is not None else load_balance_config()
+    ports = reference_ports(config)
+    vectors = golden_vectors()
+    report = {
+        "golden_vectors": len(vectors),
+        "golden_failures": check_golden(ports, vectors),
+        "constant_drift": constant_drift(config),
+    }
+    if samples:
+        fuzzed = fuzz(ports, samples=samples, seed=seed)
+        report["fuzz_samples"] = fuzzed.samples
+        report["fuzz_samples_per_second"] = round(fuzzed.samples_per_second)
+        report["fuzz_mismatches"] = {
+            path: [{"args": list(args), "cairo": e, "python": a} for args, e, a in examples]
+            for path, examples in fuzzed.mismatches.items()
+        }
+    report["passed"] = not (report["golden_failures"] or report["constant_drift"] or report.get("fuzz_mismatches"))
+    return report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check Python models against the Cairo math libraries.")
+    parser.add_argument("--samples", type=int, default=DEFAULT_FUZZ_SAMPLES, help="Fuzz samples per model.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--constants-only", action="store_true", help="Only check JSON/Python constants.")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.constants_only:
+        drift = constant_drift()
+        for line in drift:
+            print(f"drift: {line}")
+        print(f"constant_drift={len(drift)}")
+        return 1 if drift else 0
+
+    report = run_parity(samples=args.samples, seed=args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        for line in report["golden_failures"]:
+            print(f"golden: {line}")
+        for line in report["constant_drift"]:
+            print(f"drift: {line}")
+        for path, examples in report.get("fuzz_mismatches", {}).items():
+            for example in examples:
+                print(f"fuzz: {path}{tuple(example['args'])}: cairo={example['cairo']} python={example['python']}")
+        print(f"golden_vectors={report['golden_vectors']}")
+        print(f"golden_failures={len(report['golden_failures'])}")
+        print(f"constant_drift={len(report['constant_drift'])}")
+        if "fuzz_samples" in report:
+            print(f"fuzz_samples={report['fuzz_samples']}")
+            print(f"fuzz_samples_per_second={report['fuzz_samples_per_second']}")
+            print(f"fuzz_mismatches={sum(len(v) for v in report['fuzz_mismatches'].values())}")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
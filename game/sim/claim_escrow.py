@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Claim escrow lifecycle for the territory layer.
+
+Mirrors the claim transitions in `game/src/systems/economic_manager.cairo` and
+`models/economics.cairo`:
+
+- `initiate`: the offer is locked immediately. Once `grace_blocks` have passed
+  since the hex became claimable the claim resolves on the spot
+  (`AppliedImmediate`); otherwise the escrow stays active until
+  `expiry_block = now + timeout_blocks` (`AppliedPending`).
+- `defend`: the controller outspends the locked amount, the claimant is
+  refunded and the escrow resolves. Defending after expiry only settles the
+  expiry.
+- `resolve_expired`: every active escrow with `now > expiry_block` is expired
+  and refunded in one batch.
+
+Active escrows sit in a min-heap keyed by `expiry_block`. Defended escrows are
+not removed from the heap; their entry is skipped when it surfaces. Refunds
+only happen on the Active -> Expired/Resolved transition, so each escrow is
+refunded at most once and `locked_energy` always equals the sum of active
+locks.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from enum import Enum
+from typing import Dict, List, NamedTuple, Tuple
+
+# economic_manager_contract.cairo
+CLAIM_TIMEOUT_BLOCKS = 100
+CLAIM_GRACE_BLOCKS = 500
+CLAIM_SURFACE_MIN_ENERGY_CAP = 100
+
+
+class EscrowStatus(Enum):
+    INACTIVE = 0
+    ACTIVE = 1
+    EXPIRED = 2
+    RESOLVED = 3
+
+
+class ClaimOutcome(Enum):
+    NOT_CLAIMABLE = "not_claimable"
+    BELOW_MINIMUM = "below_minimum"
+    INVALID_AMOUNT = "invalid_amount"
+    ESCROW_ALREADY_ACTIVE = "escrow_already_active"
+    APPLIED_PENDING = "applied_pending"
+    APPLIED_IMMEDIATE = "applied_immediate"
+
+
+class DefendOutcome(Enum):
+    NO_ACTIVE_CLAIM = "no_active_claim"
+    CLAIM_EXPIRED = "claim_expired"
+    INVALID_AMOUNT = "invalid_amount"
+    APPLIED = "applied"
+
+
+class ExpiryBatch(NamedTuple):
+    expired: int
+    refunded_energy: int
+    # (escrow_id, hex_id, claimant, amount) for every refund in the batch.
+    refunds: List[Tuple[int, int, int, int]]
+
+
+def min_claim_energy(upkeep_per_period: int, decay_level: int, claimable_threshold: int) -> int:
+    """Port of `decay_math::min_claim_energy` with the claim-surface cap applied."""
+    total = upkeep_per_period * 2 + max(0, decay_level - claimable_threshold) * 5
+    return min(CLAIM_SURFACE_MIN_ENERGY_CAP, max(1, min(65_535, total)))
+
+
+class ClaimEscrowBook:
+    """Escrow columns indexed by escrow id, plus the active-escrow expiry heap."""
+
+    def __init__(
+        self,
+        timeout_blocks: int = CLAIM_TIMEOUT_BLOCKS,
+        grace_blocks: int = CLAIM_GRACE_BLOCKS,
+    ) -> None:
+        self.timeout_blocks = timeout_blocks
+        self.grace_blocks = grace_blocks
+
+        self.hex_id = array("q")
+        self.claimant = array("q")
+        self.energy_locked = array("q")
+        self.created_block = array("q")
+        self.expiry_block = array("q")
+        self.status = array("b")
+        self._active_by_hex: Dict[int, int] = {}
+        self._expiry_heap: List[Tuple[int, int]] = []
+
+        self.locked_energy = 0
+        self.total_refunded = 0
+        self.total_pending = 0
+        self.total_immediate = 0
+        self.total_defended = 0
+        self.total_expired = 0
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active_by_hex)
+
+    def active_for(self, hex_id: int) -> int | None:
+        return self._active_by_hex.get(hex_id)
+
+    def initiate(
+        self,
+        *,
+        hex_id: int,
+        claimant: int,
+        energy_offered: int,
+        min_energy: int,
+        now_block: int,
+        claimable_since_block: int,
+    ) -> Tuple[ClaimOutcome, int | None]:
+        """Lock `energy_offered` against `hex_id`; return the outcome and escrow id."""
+        if claimable_since_block == 0:
+            return ClaimOutcome.NOT_CLAIMABLE, None
+        if energy_offered <= 0:
+            return ClaimOutcome.INVALID_AMOUNT, None
+        if energy_offered < min_energy:
+            return ClaimOutcome.BELOW_MINIMUM, None
+        if hex_id in self._active_by_hex:
+            return ClaimOutcome.ESCROW_ALREADY_ACTIVE, None
+
+        escrow_id = len(self.status)
+        self.hex_id.append(hex_id)
+        self.claimant.append(claimant)
+        self.created_block.append(now_block)
+        self.expiry_block.append(now_block + self.timeout_blocks)
+
+        if max(0, now_block - claimable_since_block) >= self.grace_blocks:
+            # The locked offer moves straight into the hex reserve.
+            self.energy_locked.append(0)
+            self.status.append(EscrowStatus.RESOLVED.value)
+            self.total_immediate += 1
+            return ClaimOutcome.APPLIED_IMMEDIATE, escrow_id
+
+        self.energy_locked.append(energy_offered)
+        self.status.append(EscrowStatus.ACTIVE.value)
+        self._active_by_hex[hex_id] = escrow_id
+        heapq.heappush(self._expiry_heap, (now_block + self.timeout_blocks, escrow_id))
+        self.locked_energy += energy_offered
+        self.total_pending += 1
+        return ClaimOutcome.APPLIED_PENDING, escrow_id
+
+    def defend(self, *, hex_id: int, defense_energy: int, now_block: int) -> Tuple[DefendOutcome, int]:
+        """Defend the active claim on `hex_id`; return the outcome and claimant refund."""
+        escrow_id = self._active_by_hex.get(hex_id)
+        if escrow_id is None:
+            return DefendOutcome.NO_ACTIVE_CLAIM, 0
+        if now_block > self.expiry_block[escrow_id]:
+            return DefendOutcome.CLAIM_EXPIRED, self._close(escrow_id, EscrowStatus.EXPIRED)
+        if defense_energy <= 0 or defense_energy < self.energy_locked[escrow_id]:
+            return DefendOutcome.INVALID_AMOUNT, 0
+        self.total_defended += 1
+        return DefendOutcome.APPLIED, self._close(escrow_id, EscrowStatus.RESOLVED)
+
+    def resolve_expired(self, now_block: int) -> ExpiryBatch:
+        """Expire and refund every active escrow with `now_block > expiry_block`."""
+        heap = self._expiry_heap
+        refunds: List[Tuple[int, int, int, int]] = []
+        refunded = 0
+        while heap and heap[0][0] < now_block:
+            _, escrow_id = heapq.heappop(heap)
+            if self.status[escrow_id] != EscrowStatus.ACTIVE.value:
+                continue  # defended or already settled
+            amount = self._close(escrow_id, EscrowStatus.EXPIRED)
+            refunds.append((escrow_id, self.hex_id[escrow_id], self.claimant[escrow_id], amount))
+            refunded += amount
+        return ExpiryBatch(len(refunds), refunded, refunds)
+
+    def _close(self, escrow_id: int, status: EscrowStatus) -> int:
+        if self.status[escrow_id] != EscrowStatus.ACTIVE.value:
+            raise RuntimeError(f"escrow {escrow_id} is not active; refusing a second refund")
+        amount = self.energy_locked[escrow_id]
+        self.energy_locked[escrow_id] = 0
+        self.status[escrow_id] = status.value
+        del self._active_by_hex[self.hex_id[escrow_id]]
+        self.locked_energy -= amount
+        self.total_refunded += amount
+        if status is EscrowStatus.EXPIRED:
+            self.total_expired += 1
+        return amount
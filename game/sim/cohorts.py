@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Cohort population for `ModelMode.COHORT` in the bootstrap world simulator.
+
+Sits between the aggregate `active_adventurers` counter and a per-agent
+engine: adventurers are grouped by mint epoch (rows) and strategy (columns) in
+flat row-major arrays, so every update is one comprehension over the table
+rather than a loop over agents.
+
+A row covers `bucket_epochs` consecutive mints (1 keeps one row per epoch).
+Per cell the table tracks alive adventurers, their energy, their bond capital
+(the `bond_unit` each paid at mint), deaths and the capital those deaths
+locked. Deaths move a pro-rata share of the cell's bond capital into `locked`,
+so collapses lock what the cohort actually bonded rather than the current
+price.
+
+Strategies reuse the `adventurer_policy` archetypes and mint shares. Their
+miner and extraction weights average to 10000 bp over the mint mix, so a
+mature population matches the aggregate model. Age is what differs:
+
+- extraction ramps linearly from `novice_extraction_bp` to full over
+  `ramp_epochs` after mint;
+- novices (younger than `ramp_epochs`) collapse at `novice_risk_bp` of the
+  strategy's rate.
+
+Deaths are expected values per cell with a fractional carry, so small cohorts
+die at the right long-run rate instead of rounding to zero. The initial
+population is one mature cohort; ages are measured from a row's first mint
+epoch.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    from .adventurer_policy import ARCHETYPES
+except ImportError:  # loaded as a top-level module by `python3 game/sim/bootstrap_world_sim.py`
+    from adventurer_policy import ARCHETYPES
+
+BP_DEN = 10_000
+
+# strategy -> (miner weight bp, extraction weight bp); mint shares come from ARCHETYPES.
+STRATEGY_WEIGHTS = {
+    "explorer_operator": (5_500, 10_600),
+    "harvester_maintainer": (17_000, 10_600),
+    "raider_claimant": (11_000, 9_000),
+    "passive_holder": (2_000, 7_000),
+}
+STRATEGIES = tuple(name for name, _ in ARCHETYPES)
+
+
+def split_by_share(count: int, shares_bp: Sequence[int]) -> List[int]:
+    """Split `count` by basis-point shares with largest remainders (sums to `count`)."""
+    total = sum(shares_bp)
+    parts = [count * share // total for share in shares_bp]
+    order = sorted(range(len(shares_bp)), key=lambda i: (-(count * shares_bp[i] % total), i))
+    for i in order[: count - sum(parts)]:
+        parts[i] += 1
+    return parts
+
+
+@dataclass(frozen=True)
+class CohortModel:
+    """Factory for per-scenario cohort tables (`ModelMode.COHORT`)."""
+
+    ramp_epochs: int = 84
+    novice_extraction_bp: int = 7_500
+    novice_risk_bp: int = 15_000
+    bucket_epochs: int = 12
+
+    def __post_init__(self) -> None:
+        if self.ramp_epochs < 1 or self.bucket_epochs < 1:
+            raise ValueError("ramp_epochs and bucket_epochs must be >= 1")
+
+    def for_scenario(self, scenario, config) -> "CohortTable":
+        return CohortTable(self, max(1, scenario.initial_active_adventurers))
+
+
+class CohortTable:
+    """Mint-epoch x strategy table of alive adventurers, energy, deaths and locks."""
+
+    def __init__(self, model: CohortModel, initial_adventurers: int) -> None:
+        self.model = model
+        self.width = len(STRATEGIES)
+        self.born = array("q")
+        self.alive = array("q")
+        self.energy = array("d")
+        self.bond = array("q")
+        self.deaths = array("q")
+        self.locked = array("q")
+        self._carry = array("d")
+        self._miner_weight = [STRATEGY_WEIGHTS[name][0] for name in STRATEGIES]
+        self._extraction_weight = [STRATEGY_WEIGHTS[name][1] for name in STRATEGIES]
+        self.novice_deaths = 0
+        self._mint_shares = [share for _, share in ARCHETYPES]
+        # The initial population is already through its ramp.
+        self._initial = initial_adventurers
+        self._add_row(-model.ramp_epochs, 0, initial_adventurers)
+
+    @property
+    def rows(self) -> int:
+        return len(self.born)
+
+    @property
+    def active_adventurers(self) -> int:
+        return sum(self.alive)
+
+    def _add_row(self, epoch: int, bond_unit: int, minted: int) -> None:
+        width = self.width
+        self.born.append(epoch)
+        alive = split_by_share(minted, self._mint_shares)
+        self.alive.extend(alive)
+        self.bond.extend(a * bond_unit for a in alive)
+        self.energy.extend(array("d", bytes(8 * width)))
+        self.deaths.extend(array("q", bytes(8 * width)))
+        self.locked.extend(array("q", bytes(8 * width)))
+        self._carry.extend(array("d", bytes(8 * width)))
+
+    def _mint(self, epoch: int, bond_unit: int, minted: int) -> None:
+        if self.rows > 1 and epoch - self.born[-1] < self.model.bucket_epochs:
+            base = (self.rows - 1) * self.width
+            for s, n in enumerate(split_by_share(minted, self._mint_shares)):
+                self.alive[base + s] += n
+                self.bond[base + s] += n * bond_unit
+        else:
+            self._add_row(epoch, bond_unit, minted)
+
+    def _first_novice_row(self, epoch: int) -> int:
+        # Rows are in mint order, so only the trailing rows can still be novices.
+        row = self.rows
+        while row > 0 and epoch - self.born[row - 1] < self.model.ramp_epochs:
+            row -= 1
+        return row
+
+    def _age_bp(self, epoch: int, table: Sequence[int], novice_bp: int | None) -> List[float]:
+        """Per-cell `table` weight with novice rows scaled (along the ramp if `novice_bp` is None)."""
+        model = self.model
+        width = self.width
+        weights = list(table) * self.rows
+        for row in range(self._first_novice_row(epoch), self.rows):
+            scale = novice_bp
+            if scale is None:
+                age = epoch - self.born[row]
+                scale = model.novice_extraction_bp + (BP_DEN - model.novice_extraction_bp) * age // model.ramp_epochs
+            base = row * width
+            for s in range(width):
+                weights[base + s] = table[s] * scale / BP_DEN
+        return weights
+
+    def effective_adventurers(self, epoch: int) -> float:
+        """Alive adventurers weighted by strategy extraction and age ramp."""
+        weights = self._age_bp(epoch, self._extraction_weight, None)
+        return sum(a * w for a, w in zip(self.alive, weights)) / BP_DEN
+
+    def step(
+        self,
+        *,
+        epoch: int,
+        minted: int,
+        bond_unit: int,
+        miner_share_bp: int,
+        collapse_prob_bp: int,
+        player_extraction: int,
+        roster_upkeep_per_adv: float,
+        deaths: int | None = None,
+    ) -> Tuple[int, int]:
+        """Credit the epoch's energy, apply deaths and mint a new row.
+
+        Deaths follow each cell's hazard unless `deaths` is given (for example
+        by the per-mine collapse model), in which case that total is spread
+        over cells in proportion to hazard. Returns `(deaths, locked_energy)`.
+        """
+        if self._initial:
+            # The initial cohort bonds at the first quote.
+            self.bond = array("q", [a * bond_unit for a in self.alive])
+            self._initial = 0
+
+        alive = self.alive
+        extraction = self._age_bp(epoch, self._extraction_weight, None)
+        effective = sum(a * w for a, w in zip(alive, extraction))
+        per_weight = player_extraction / effective if effective else 0.0
+        upkeep = roster_upkeep_per_adv
+        energy = [max(0.0, e + a * (w * per_weight - upkeep)) for e, a, w in zip(self.energy, alive, extraction)]
+
+        hazard = self._age_bp(epoch, self._miner_weight, self.model.novice_risk_bp)
+        rate = miner_share_bp * collapse_prob_bp / (BP_DEN * BP_DEN * BP_DEN)
+        expected = [a * w * rate for a, w in zip(alive, hazard)]
+        if deaths is None:
+            owed = [x + c for x, c in zip(expected, self._carry)]
+            dead = [min(a, int(x)) for a, x in zip(alive, owed)]
+            self._carry = array("d", [x - d for x, d in zip(owed, dead)])
+        else:
+            dead = self._spread(min(deaths, sum(alive)), expected)
+
+        self.novice_deaths += sum(dead[self._first_novice_row(epoch) * self.width :])
+        locked = [b * d // a if d else 0 for b, a, d in zip(self.bond, alive, dead)]
+        self.energy = array("d", [e - e * d / a if d else e for e, a, d in zip(energy, alive, dead)])
+        self.bond = array("q", [b - x for b, x in zip(self.bond, locked)])
+        self.alive = array("q", [a - d for a, d in zip(alive, dead)])
+        self.deaths = array("q", [t + d for t, d in zip(self.deaths, dead)])
+        self.locked = array("q", [t + x for t, x in zip(self.locked, locked)])
+        if minted > 0:
+            self._mint(epoch, bond_unit, minted)
+        return sum(dead), sum(locked)
+
+    def _spread(self, total: int, weights: Sequence[float]) -> List[int]:
+        """Integer split of `total` proportional to `weights`, refilling past cells that run out."""
+        alive = self.alive
+        dead = [0] * len(alive)
+        remaining = min(total, sum(alive))
+        while remaining > 0:
+            open_cells = [i for i, a in enumerate(alive) if dead[i] < a]
+            weight_sum = sum(weights[i] for i in open_cells)
+            if weight_sum <= 0:  # no hazard left: fall back to headcount
+                weights = [a - d for a, d in zip(alive, dead)]
+                weight_sum = sum(weights[i] for i in open_cells)
+            exact = {i: remaining * weights[i] / weight_sum for i in open_cells}
+            placed = 0
+            for i in open_cells:
+                take = min(alive[i] - dead[i], int(exact[i]))
+                dead[i] += take
+                placed += take
+            if placed == 0:
+                for i in sorted(open_cells, key=exact.__getitem__, reverse=True)[:remaining]:
+                    dead[i] += 1
+                    placed += 1
+            remaining -= placed
+        return dead
+
+    def metrics(self) -> Dict[str, float]:
+        width = self.width
+        alive_total = sum(self.alive)
+        deaths_total = sum(self.deaths)
+        last_epoch = self.born[-1] if self.rows > 1 else 0
+        metrics: Dict[str, float] = {
+            "cohorts": self.rows,
+            "mean_age_epochs": round(
+                sum(a * (last_epoch - self.born[i // width]) for i, a in enumerate(self.alive)) / alive_total, 2
+            )
+            if alive_total
+            else 0.0,
+            "starved_share_bp": sum(a for a, e in zip(self.alive, self.energy) if a and e <= 0) * BP_DEN // alive_total
+            if alive_total
+            else 0,
+        }
+        metrics["novice_death_share_bp"] = self.novice_deaths * BP_DEN // deaths_total if deaths_total else 0
+        for s, name in enumerate(STRATEGIES):
+            alive = sum(self.alive[s::width])
+            metrics[f"{name}_alive"] = alive
+            metrics[f"{name}_deaths"] = sum(self.deaths[s::width])
+            metrics[f"{name}_locked_energy"] = sum(self.locked[s::width])
+            metrics[f"{name}_energy_per_adventurer"] = round(sum(self.energy[s::width]) / alive, 2) if alive else 0.0
+        return metrics
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Rolling-window item conversion penalty for the bootstrap world simulator.
+
+Ports `game/src/libs/conversion_math.cairo`:
+
+    penalty_bp = min(5000, floor(units_in_window / 10) * 100)
+    effective_rate = max(1, base_rate * (10000 - penalty_bp) / 10000)
+
+and tracks `units_in_window` over `CONVERSION_WINDOW_BLOCKS` per item and per
+adventurer in fixed-size ring buffers. The window is split into `slots`
+buckets; writing to a key first clears the buckets that fell out of the
+window, so updates and expiry are O(slots) regardless of history length. The
+contract keeps a single counter per item that resets only after a quiet
+window; the rings follow the spec's sliding window instead.
+
+`quote_batch` prices a run of back-to-back conversions in one call: the
+penalty only changes every `VOLUME_UNITS_STEP` units, so it walks penalty
+steps (at most 51) rather than individual conversions and returns exactly
+what converting one at a time would.
+
+`ConversionMarket` is the runner component (`ScenarioRunner(conversion_model=
+ConversionModel())`): it splits each epoch's extraction energy into ore units
+by the `mining_gen.cairo` ore mix, converts them bucket by bucket through the
+item rings and reports the realised penalty as the epoch's conversion tax.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+BP_DEN = 10_000
+U16_MAX = 65_535
+
+# conversion_math.cairo
+MAX_VOLUME_PENALTY_BP = 5_000
+VOLUME_UNITS_STEP = 10
+VOLUME_PENALTY_STEP_BP = 100
+# economic_manager_contract.cairo
+CONVERSION_WINDOW_BLOCKS = 100
+
+_MAX_PENALTY_STEPS = MAX_VOLUME_PENALTY_BP // VOLUME_PENALTY_STEP_BP
+
+# (ore, share of mined areas in bp, conversion_energy_per_unit) from
+# mining_gen.cairo: rarity tier shares (40/30/20/8/2%) times the in-tier rolls.
+ORE_TABLE = (
+    ("ORE_IRON", 1_000, 8),
+    ("ORE_COPPER", 1_000, 9),
+    ("ORE_TIN", 1_000, 10),
+    ("ORE_COAL", 1_000, 12),
+    ("ORE_SILVER", 1_020, 16),
+    ("ORE_NICKEL", 990, 18),
+    ("ORE_COBALT", 990, 22),
+    ("ORE_GOLD", 680, 30),
+    ("ORE_TITAN", 660, 36),
+    ("ORE_URAN", 660, 45),
+    ("ORE_MITH", 400, 62),
+    ("ORE_ADAM", 400, 78),
+    ("ORE_AETHER", 200, 120),
+)
+
+
+def penalty_bp_for_units(units_converted_in_window: int) -> int:
+    steps = units_converted_in_window // VOLUME_UNITS_STEP
+    return min(MAX_VOLUME_PENALTY_BP, steps * VOLUME_PENALTY_STEP_BP)
+
+
+def effective_rate_for_window(base_rate: int, units_converted_in_window: int) -> int:
+    kept_bp = BP_DEN - penalty_bp_for_units(units_converted_in_window)
+    effective = base_rate * kept_bp // BP_DEN
+    if effective == 0 and base_rate > 0:
+        return 1
+    return effective
+
+
+def effective_rate(
+    current_rate: int,
+    base_rate: int,
+    last_update_block: int,
+    units_converted_in_window: int,
+    now_block: int,
+    window_blocks: int,
+) -> int:
+    """Port of `conversion_math::effective_rate` over a `ConversionRate` model."""
+    if window_blocks == 0:
+        return base_rate
+    in_window = now_block - last_update_block < window_blocks if now_block >= last_update_block else True
+    if in_window:
+        return effective_rate_for_window(current_rate, units_converted_in_window)
+    return base_rate
+
+
+def quote_energy(quantity: int, rate_per_unit: int) -> int:
+    return min(U16_MAX, quantity * rate_per_unit)
+
+
+def quote_batch(base_rate: int, window_units: int, quantity: int, conversions: int) -> int:
+    """Energy for `conversions` back-to-back conversions of `quantity` units.
+
+    Conversion `k` is quoted at the rate for `window_units + k * quantity`,
+    matching a per-event loop.
+    """
+    if conversions <= 0 or quantity <= 0:
+        return 0
+    energy = 0
+    k = 0
+    while k < conversions:
+        units = window_units + k * quantity
+        steps = units // VOLUME_UNITS_STEP
+        if steps >= _MAX_PENALTY_STEPS:
+            next_k = conversions
+        else:
+            boundary = (steps + 1) * VOLUME_UNITS_STEP - window_units
+            next_k = min(conversions, -(-boundary // quantity))
+        energy += (next_k - k) * quote_energy(quantity, effective_rate_for_window(base_rate, units))
+        k = next_k
+    return energy
+
+
+class VolumeRing:
+    """Per-key unit volume over the last `slots` buckets of `bucket_blocks` each."""
+
+    def __init__(self, keys: int = 0, window_blocks: int = CONVERSION_WINDOW_BLOCKS, slots: int = 10) -> None:
+        if slots <= 0:
+            raise ValueError("slots must be positive")
+        self.slots = slots
+        self.bucket_blocks = max(1, -(-window_blocks // slots))
+        self.units = array("q")
+        self.head = array("q")  # newest bucket index written per key, -1 if never
+        self.totals = array("q")
+        self.ensure(keys)
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def ensure(self, keys: int) -> None:
+        """Grow the ring to hold at least `keys` keys."""
+        missing = keys - len(self.totals)
+        if missing <= 0:
+            return
+        self.units.extend(array("q", bytes(8 * missing * self.slots)))
+        self.head.extend(array("q", [-1]) * missing)
+        self.totals.extend(array("q", bytes(8 * missing)))
+
+    def _advance(self, key: int, bucket: int) -> None:
+        head = self.head[key]
+        if bucket <= head:
+            return  # same bucket, or a late write that lands in the newest bucket
+        slots = self.slots
+        base = key * slots
+        if head < 0 or bucket - head >= slots:
+            self.units[base : base + slots] = array("q", bytes(8 * slots))
+            self.totals[key] = 0
+        else:
+            units = self.units
+            expired = 0
+            for b in range(head + 1, bucket + 1):
+                i = base + b % slots
+                expired += units[i]
+                units[i] = 0
+            self.totals[key] -= expired
+        self.head[key] = bucket
+
+    def add(self, key: int, units: int, block_number: int) -> None:
+        bucket = block_number // self.bucket_blocks
+        self._advance(key, bucket)
+        self.units[key * self.slots + self.head[key] % self.slots] += units
+        self.totals[key] += units
+
+    def window_units(self, key: int, block_number: int) -> int:
+        self._advance(key, block_number // self.bucket_blocks)
+        return self.totals[key]
+
+
+class ConversionBook:
+    """Item and adventurer conversion windows with single and batched quoting."""
+
+    def __init__(
+        self,
+        item_count: int,
+        window_blocks: int = CONVERSION_WINDOW_BLOCKS,
+        slots: int = 10,
+    ) -> None:
+        self.items = VolumeRing(item_count, window_blocks, slots)
+        self.adventurers = VolumeRing(0, window_blocks, slots)
+
+    def convert(self, *, adventurer: int, item: int, quantity: int, base_rate: int, now_block: int) -> int:
+        """One conversion; returns the energy quoted before conversion tax."""
+        return self.convert_batch(
+            item=item, quantity=quantity, base_rate=base_rate, now_block=now_block, adventurers=(adventurer,)
+        )
+
+    def convert_batch(
+        self,
+        *,
+        item: int,
+        quantity: int,
+        base_rate: int,
+        now_block: int,
+        conversions: int | None = None,
+        adventurers: Sequence[int] = (),
+    ) -> int:
+        """Back-to-back conversions of `quantity` units of `item` at `now_block`.
+
+        Pass `adventurers` (one id per conversion) to also track per-adventurer
+        volume; otherwise give `conversions`.
+        """
+        count = len(adventurers) if conversions is None else conversions
+        if count <= 0 or quantity <= 0:
+            return 0
+        energy = quote_batch(base_rate, self.items.window_units(item, now_block), quantity, count)
+        self.items.add(item, quantity * count, now_block)
+        if adventurers:
+            ring = self.adventurers
+            ring.ensure(max(adventurers) + 1)
+            for adventurer in adventurers:
+                ring.add(adventurer, quantity, now_block)
+        return energy
+
+    def convert_units(self, *, item: int, units: int, quantity: int, base_rate: int, now_block: int) -> int:
+        """Convert `units` of `item` as full `quantity` lots plus one remainder lot."""
+        if units <= 0 or quantity <= 0:
+            return 0
+        window = self.items.window_units(item, now_block)
+        full, rest = divmod(units, quantity)
+        energy = quote_batch(base_rate, window, quantity, full)
+        if rest:
+            energy += quote_batch(base_rate, window + full * quantity, rest, 1)
+        self.items.add(item, units, now_block)
+        return energy
+
+    def item_penalty_bp(self, item: int, now_block: int) -> int:
+        return penalty_bp_for_units(self.items.window_units(item, now_block))
+
+
+@dataclass(frozen=True)
+class ConversionModel:
+    """Factory for per-scenario markets (`ScenarioRunner(conversion_model=...)`)."""
+
+    window_blocks: int = CONVERSION_WINDOW_BLOCKS
+    slots: int = 10
+    units_per_conversion: int = 5
+
+    def for_scenario(self, scenario, config) -> "ConversionMarket":
+        return ConversionMarket(self, blocks_per_epoch=config.blocks_per_epoch)
+
+
+class ConversionMarket:
+    """Converts each epoch's extraction through the per-item volume windows."""
+
+    def __init__(self, model: ConversionModel, blocks_per_epoch: int) -> None:
+        self.model = model
+        self.blocks_per_epoch = blocks_per_epoch
+        self.book = ConversionBook(len(ORE_TABLE), model.window_blocks, model.slots)
+        self._shares = [share for _, share, _ in ORE_TABLE]
+        self._rates = [rate for _, _, rate in ORE_TABLE]
+        self._energy_weight = sum(s * r for s, r in zip(self._shares, self._rates))
+        self._carry = [0] * len(ORE_TABLE)
+
+        self.total_units = 0
+        self.total_quoted_energy = 0
+        self.total_penalty_energy = 0
+        self.peak_penalty_bp = 0
+        self.saturated_windows = 0
+
+    def step(self, *, block_number: int, extraction_energy: int) -> int:
+        """Convert one epoch of extraction; return the realised penalty in bp."""
+        book = self.book
+        bucket_blocks = book.items.bucket_blocks
+        buckets = max(1, self.blocks_per_epoch // bucket_blocks)
+        start = block_number - buckets * bucket_blocks
+        quantity = max(1, self.model.units_per_conversion)
+
+        unpenalized = 0
+        quoted = 0
+        for item, (share, rate) in enumerate(zip(self._shares, self._rates)):
+            units, self._carry[item] = divmod(
+                extraction_energy * share + self._carry[item], self._energy_weight
+            )
+            per_bucket, extra = divmod(units, buckets)
+            for b in range(buckets):
+                chunk = per_bucket + (1 if b < extra else 0)
+                if chunk == 0:
+                    continue
+                quoted += book.convert_units(
+                    item=item, units=chunk, quantity=quantity, base_rate=rate, now_block=start + b * bucket_blocks
+                )
+                unpenalized += chunk * rate
+            penalty = book.item_penalty_bp(item, block_number - 1)
+            self.peak_penalty_bp = max(self.peak_penalty_bp, penalty)
+            if penalty >= MAX_VOLUME_PENALTY_BP:
+                self.saturated_windows += 1
+            self.total_units += units
+
+        penalty_energy = max(0, unpenalized - quoted)
+        self.total_quoted_energy += quoted
+        self.total_penalty_energy += penalty_energy
+        return penalty_energy * BP_DEN // unpenalized if unpenalized else 0
+
+    def metrics(self) -> Dict[str, float]:
+        unpenalized = self.total_quoted_energy + self.total_penalty_energy
+        return {
+            "converted_units": self.total_units,
+            "quoted_energy": self.total_quoted_energy,
+            "penalty_energy": self.total_penalty_energy,
+            "mean_penalty_bp": self.total_penalty_energy * BP_DEN // unpenalized if unpenalized else 0,
+            "peak_penalty_bp": self.peak_penalty_bp,
+            "saturated_windows": self.saturated_windows,
+        }
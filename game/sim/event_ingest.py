@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Stream Katana/Torii world event dumps into simulator calibration tables.
+
+Input is JSONL with one Starknet event per line, as returned by
+`starknet_getEvents` or a Torii export:
+
+```json
+{"block_number": 1234, "keys": ["0x...", "0x...", "0x..."], "data": ["0x...", ...]}
+```
+
+World events are classified the same way `live_katana_full_sim.sh` reads
+receipts: `StoreSetRecord` events carry the model selector in `keys[1]` and
+`EventEmitted` events carry the game event selector in `keys[1]`. Both pack
+`data` as `[keys_len, *keys, values_len, *values]`. Selector names are taken
+from the Dojo manifest.
+
+The dump is read line by line and aggregated per `blocks_per_epoch` window.
+Sealed epoch rows go straight to an `on_sealed` sink (the CSV writer in
+`ingest_dump`) and only running totals are kept for `calibration()`, so
+memory is bounded by the number of epochs still open for reordering rather
+than by the length of the dump.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Set, TextIO, Tuple
+
+STORE_SET_RECORD_SELECTOR = 0x1A2F334228CEE715F1F0F54053BB6B5EAC54FA336E0BC1AACF7516DECB0471D
+EVENT_EMITTED_SELECTOR = 0x1C93F6E4703AE90F75338F29BFFBE9C1662200CEE981F49AFEEC26E892DEBCD
+
+DEFAULT_MANIFEST_PATH = Path(__file__).resolve().parents[1] / "manifest_dev.json"
+EPOCHS_FILE = "calibration_epochs.csv"
+CALIBRATION_FILE = "calibration.json"
+
+
+@dataclass
+class EpochCalibration:
+    epoch: int
+    first_block: int
+    first_offset: int
+    event_count: int = 0
+    active_adventurers: int = 0
+    adventurers_created: int = 0
+    adventurer_deaths: int = 0
+    conversion_energy: int = 0
+    harvested_units: int = 0
+    upkeep_energy: int = 0
+    upkeep_hexes: int = 0
+    miners: int = 0
+    mine_collapses: int = 0
+    collapse_deaths: int = 0
+    claims_initiated: int = 0
+    model_writes: int = 0
+    by_selector: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Totals:
+    """Running sums over sealed epochs, enough for `EventIngester.calibration`."""
+
+    epochs: int = 0
+    adventurer_epochs: int = 0
+    hex_epochs: int = 0
+    miner_epochs: int = 0
+    conversion_energy: int = 0
+    upkeep_energy: int = 0
+    collapse_deaths: int = 0
+
+    def add(self, row: EpochCalibration) -> None:
+        self.epochs += 1
+        self.adventurer_epochs += row.active_adventurers
+        self.hex_epochs += row.upkeep_hexes
+        self.miner_epochs += row.miners
+        self.conversion_energy += row.conversion_energy
+        self.upkeep_energy += row.upkeep_energy
+        self.collapse_deaths += row.collapse_deaths
+
+
+@dataclass
+class _OpenEpoch:
+    row: EpochCalibration
+    upkeep_hexes: Set[int] = field(default_factory=set)
+    miners: Set[int] = field(default_factory=set)
+
+
+class EventIngester:
+    """Incremental per-epoch aggregator over decoded world events."""
+
+    def __init__(
+        self,
+        selector_names: Dict[int, str],
+        *,
+        blocks_per_epoch: int = 100,
+        initial_adventurers: int = 0,
+        reorder_window_epochs: int = 2,
+        on_sealed: Callable[[EpochCalibration], None] | None = None,
+    ) -> None:
+        if blocks_per_epoch <= 0:
+            raise ValueError("blocks_per_epoch must be positive")
+        self.selector_names = selector_names
+        self.blocks_per_epoch = blocks_per_epoch
+        self.reorder_window_epochs = max(0, reorder_window_epochs)
+        self.alive = initial_adventurers
+        self.event_count = 0
+        self.skipped_count = 0
+        self.on_sealed = on_sealed
+        self.totals = _Totals()
+        self._last_sealed: int | None = None
+        self._open: Dict[int, _OpenEpoch] = {}
+        self._sealed_through = -1
+
+    def ingest_stream(self, handle: BinaryIO) -> None:
+        offset = 0
+        for raw in handle:
+            line_offset = offset
+            offset += len(raw)
+            if not raw.strip():
+                continue
+            self.ingest(json.loads(raw), offset=line_offset)
+
+    def ingest(self, event: dict, offset: int = 0) -> None:
+        block = _felt(event["block_number"])
+        keys = event.get("keys", [])
+        if len(keys) < 2:
+            self.skipped_count += 1
+            return
+
+        envelope = _felt(keys[0])
+        name = self.selector_names.get(_felt(keys[1]))
+        if name is None or envelope not in (STORE_SET_RECORD_SELECTOR, EVENT_EMITTED_SELECTOR):
+            self.skipped_count += 1
+            return
+
+        epoch = block // self.blocks_per_epoch
+        bucket = self._bucket(epoch, block, offset)
+        row = bucket.row
+        row.event_count += 1
+        row.by_selector[name] = row.by_selector.get(name, 0) + 1
+        self.event_count += 1
+
+        if envelope == STORE_SET_RECORD_SELECTOR:
+            row.model_writes += 1
+            return
+
+        ev_keys, values = _split_payload(event.get("data", []))
+        if name == "AdventurerCreated":
+            row.adventurers_created += 1
+        elif name == "AdventurerDied":
+            row.adventurer_deaths += 1
+        elif name == "ItemsConverted":
+            row.conversion_energy += _felt(values[2])
+        elif name == "HarvestingCompleted":
+            row.harvested_units += _felt(values[3])
+        elif name == "HexEnergyPaid":
+            row.upkeep_energy += _felt(values[1])
+            bucket.upkeep_hexes.add(_felt(ev_keys[0]))
+        elif name in ("MiningStarted", "MiningContinued"):
+            bucket.miners.add(_felt(ev_keys[0]))
+        elif name == "MineCollapsed":
+            row.mine_collapses += 1
+            row.collapse_deaths += _felt(values[0])
+        elif name == "ClaimInitiated":
+            row.claims_initiated += 1
+
+    def finish(self) -> None:
+        """Seal every epoch still open."""
+        self._seal_through(max(self._open, default=self._sealed_through))
+
+    def calibration(self) -> dict:
+        """Aggregate sealed epochs into `SimConfig` overrides."""
+        totals = self.totals
+        adv_epochs = totals.adventurer_epochs
+        hex_epochs = totals.hex_epochs
+        miner_epochs = totals.miner_epochs
+
+        overrides: Dict[str, object] = {"blocks_per_epoch": self.blocks_per_epoch}
+        if adv_epochs > 0:
+            overrides["extraction_energy_per_adv_epoch"] = int(round(totals.conversion_energy / adv_epochs))
+            overrides["base_miner_share_bp"] = int(round(miner_epochs * 10_000 / adv_epochs))
+        if hex_epochs > 0:
+            overrides["upkeep_energy_per_hex_epoch"] = int(round(totals.upkeep_energy / hex_epochs))
+        if miner_epochs > 0:
+            overrides["base_collapse_prob_bp"] = int(round(totals.collapse_deaths * 10_000 / miner_epochs))
+
+        return {
+            "epochs": totals.epochs,
+            "events": self.event_count,
+            "skipped_events": self.skipped_count,
+            "adventurer_epochs": adv_epochs,
+            "sim_config": overrides,
+        }
+
+    def _bucket(self, epoch: int, block: int, offset: int) -> _OpenEpoch:
+        if epoch <= self._sealed_through:
+            raise ValueError(
+                f"event at block {block} arrived after epoch {epoch} was sealed; "
+                "raise reorder_window_epochs or sort the dump by block"
+            )
+        bucket = self._open.get(epoch)
+        if bucket is None:
+            bucket = _OpenEpoch(EpochCalibration(epoch=epoch, first_block=block, first_offset=offset))
+            self._open[epoch] = bucket
+            self._seal_through(epoch - self.reorder_window_epochs - 1)
+        elif block < bucket.row.first_block:
+            bucket.row.first_block = block
+            bucket.row.first_offset = offset
+        return bucket
+
+    def _seal_through(self, epoch: int) -> None:
+        for key in sorted(k for k in self._open if k <= epoch):
+            bucket = self._open.pop(key)
+            if self._last_sealed is not None:
+                # Quiet epochs still count towards adventurer-epoch denominators.
+                for gap in range(self._last_sealed + 1, key):
+                    self._emit(
+                        EpochCalibration(
+                            epoch=gap,
+                            first_block=gap * self.blocks_per_epoch,
+                            first_offset=-1,
+                            active_adventurers=self.alive,
+                        )
+                    )
+            row = bucket.row
+            row.upkeep_hexes = len(bucket.upkeep_hexes)
+            row.miners = len(bucket.miners)
+            self.alive = max(0, self.alive + row.adventurers_created - row.adventurer_deaths)
+            row.active_adventurers = self.alive
+            self._emit(row)
+        self._sealed_through = max(self._sealed_through, epoch)
+
+    def _emit(self, row: EpochCalibration) -> None:
+        self.totals.add(row)
+        self._last_sealed = row.epoch
+        if self.on_sealed is not None:
+            self.on_sealed(row)
+
+
+def load_selector_names(manifest_path: str | Path = DEFAULT_MANIFEST_PATH) -> Dict[int, str]:
+    """Map model and event selectors to their unprefixed Dojo names."""
+    manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+    names: Dict[int, str] = {}
+    for section in ("models", "events"):
+        for entry in manifest.get(section, []):
+            names[_felt(entry["selector"])] = entry["tag"].split("-", 1)[-1]
+    return names
+
+
+class EpochCsvWriter:
+    """`on_sealed` sink writing one `calibration_epochs.csv` row per sealed epoch.
+
+    Selector count columns cover every manifest name up front, since rows are
+    written before the whole dump has been seen.
+    """
+
+    def __init__(self, handle: TextIO, selector_names: Iterable[str]) -> None:
+        self.selectors = sorted(set(selector_names))
+        fields = [name for name in EpochCalibration.__dataclass_fields__ if name != "by_selector"]
+        self._writer = csv.DictWriter(handle, fieldnames=fields + [f"n_{name}" for name in self.selectors])
+        self._writer.writeheader()
+        self.rows = 0
+
+    def __call__(self, row: EpochCalibration) -> None:
+        record = asdict(row)
+        counts = record.pop("by_selector")
+        record.update({f"n_{name}": counts.get(name, 0) for name in self.selectors})
+        self._writer.writerow(record)
+        self.rows += 1
+
+
+def ingest_dump(
+    dump_path: str | Path,
+    out_dir: Path,
+    *,
+    manifest_path: str | Path = DEFAULT_MANIFEST_PATH,
+    blocks_per_epoch: int = 100,
+    initial_adventurers: int = 0,
+) -> EventIngester:
+    """Stream a dump into `calibration_epochs.csv` and `calibration.json` under `out_dir`."""
+    names = load_selector_names(manifest_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with (out_dir / EPOCHS_FILE).open("w", newline="", encoding="utf-8") as f:
+        ingester = EventIngester(
+            names,
+            blocks_per_epoch=blocks_per_epoch,
+            initial_adventurers=initial_adventurers,
+            on_sealed=EpochCsvWriter(f, names.values()),
+        )
+        with Path(dump_path).open("rb") as handle:
+            ingester.ingest_stream(handle)
+        ingester.finish()
+    write_calibration(ingester, out_dir)
+    return ingester
+
+
+def write_calibration(ingester: EventIngester, out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / CALIBRATION_FILE).write_text(
+        json.dumps(ingester.calibration(), indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+
+def _split_payload(data: Iterable) -> Tuple[List, List]:
+    data = list(data)
+    keys_len = _felt(data[0])
+    keys = data[1 : 1 + keys_len]
+    values = data[2 + keys_len :]
+    return keys, values
+
+
+def _felt(value) -> int:
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if value.startswith(("0x", "0X")) else int(value)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Aggregate a JSONL world event dump into simulator calibration tables.",
+    )
+    parser.add_argument("dump", type=Path, help="JSONL event dump.")
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=Path("game/sim/out/calibration"),
+        help="Directory to write calibration_epochs.csv and calibration.json.",
+    )
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH)
+    parser.add_argument("--blocks-per-epoch", type=int, default=100)
+    parser.add_argument(
+        "--initial-adventurers",
+        type=int,
+        default=0,
+        help="Alive adventurers before the first event in the dump.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    ingester = ingest_dump(
+        args.dump,
+        args.out_dir,
+        manifest_path=args.manifest,
+        blocks_per_epoch=args.blocks_per_epoch,
+        initial_adventurers=args.initial_adventurers,
+    )
+
+    print(f"events={ingester.event_count}")
+    print(f"epochs={ingester.totals.epochs}")
+    print(f"out_dir={args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
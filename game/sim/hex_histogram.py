@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Biome x decay-level hex histogram for the bootstrap world simulator.
+
+Replaces the flat `upkeep_energy_per_hex_epoch` charge on an undifferentiated
+`controlled_hexes` count with counts of hexes per (biome, decay level), over
+the flat row-major index `biome * 101 + level`. Upkeep follows
+`biome_profiles.cairo` (plains 25 through volcanic 90), and decay and
+claimability follow `economics.cairo` and `decay_math.cairo`, without
+tracking hexes individually.
+
+Each epoch is one decay period (`blocks_per_epoch == DECAY_PERIOD_BLOCKS`):
+
+- `charge_upkeep`: maintained hexes (decay 0) pay their biome's upkeep except
+  a lapse fraction that rises steeply when energy is starved, so territory
+  shrinks to what the economy can maintain. Decaying hexes resume payment at
+  `resume_bp`. Returns the energy paid.
+- `advance`: paying hexes recover `maintenance_decay_recovery` levels. Unpaid
+  hexes decay by their biome upkeep (the reserve is already spent), capped at
+  100. Raider claims take claimable hexes (decay >= 80), highest decay first,
+  and reset them to 0. Unpaid hexes at full decay are abandoned at
+  `abandon_bp`. New hexes arrive at 0, spread over biomes by the
+  `weighted_biome_from_roll` shares.
+
+Fractional flows use a carry per transition, so small bins move at the right
+long-run rate instead of rounding to zero.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List
+
+try:
+    from .territory import (
+        BIOME_UPKEEP,
+        BIOMES,
+        CLAIMABLE_DECAY_THRESHOLD,
+        DECAY_RECOVERY_BP,
+        maintenance_decay_recovery,
+    )
+except ImportError:  # loaded as a top-level module by `python3 game/sim/bootstrap_world_sim.py`
+    from territory import (
+        BIOME_UPKEEP,
+        BIOMES,
+        CLAIMABLE_DECAY_THRESHOLD,
+        DECAY_RECOVERY_BP,
+        maintenance_decay_recovery,
+    )
+
+BP_DEN = 10_000
+MAX_DECAY = 100
+LEVELS = MAX_DECAY + 1
+
+# biome_profiles.cairo weighted_biome_from_roll: 5% per biome, never Unknown.
+BIOME_ROLL_SHARE_BP = tuple(0 if biome == "unknown" else 500 for biome in BIOMES)
+
+
+@dataclass(frozen=True)
+class HexHistogramModel:
+    lapse_bp: int = 15
+    # Owners drop hexes they cannot afford: at the on-chain upkeep (about 56 per
+    # hex) this is what keeps energy supply from collapsing under a negative band.
+    starved_lapse_bp_per_band: int = 2_000
+    resume_bp: int = 2_500
+    base_raider_share_bp: int = 1_500
+    claim_attempt_bp: int = 100
+    abandon_bp: int = 500
+
+    # True scales charged upkeep to `SimConfig.upkeep_energy_per_hex_epoch` on
+    # average, so the histogram only reweights the flat charge across biomes.
+    calibrated_upkeep: bool = False
+
+    def for_scenario(self, scenario, config) -> "HexHistogram":
+        return HexHistogram(
+            self,
+            initial_hexes=max(1, scenario.initial_controlled_hexes),
+            raider_share_bp=scenario.raider_share_bp,
+            upkeep_per_hex=config.upkeep_energy_per_hex_epoch if self.calibrated_upkeep else None,
+        )
+
+
+class _Carry:
+    """Integer `n * bp / 10000` splits whose remainders add up across calls."""
+
+    __slots__ = ("rest",)
+
+    def __init__(self) -> None:
+        self.rest = 0
+
+    def split(self, n: int, bp: int) -> int:
+        moved, self.rest = divmod(self.rest + n * bp, BP_DEN)
+        return moved
+
+
+class HexHistogram:
+    """Hex counts per (biome, decay level) with vectorised epoch transitions.
+
+    Only non-empty cells of the flat `biome * LEVELS + level` index are kept
+    (about a hundred in practice), so a transition touches occupied cells only.
+    """
+
+    def __init__(
+        self,
+        model: HexHistogramModel,
+        initial_hexes: int,
+        raider_share_bp: int,
+        upkeep_per_hex: int | None = None,
+    ) -> None:
+        self.model = model
+        self.raider_share_bp = max(0, model.base_raider_share_bp + raider_share_bp)
+        self.upkeep = array("q", (BIOME_UPKEEP[b] for b in BIOMES))
+        self.recovery = array("q", (maintenance_decay_recovery(u, u, DECAY_RECOVERY_BP) for u in self.upkeep))
+        # Charged energy is scaled so the roll-weighted mean biome upkeep equals
+        # `upkeep_per_hex`; decay always steps by the on-chain upkeep.
+        weighted = sum(share * u for share, u in zip(BIOME_ROLL_SHARE_BP, self.upkeep))
+        self._charge = (upkeep_per_hex * BP_DEN, weighted) if upkeep_per_hex is not None else (1, 1)
+        self.cells: Dict[int, int] = {}
+        self._paid: Dict[int, int] = {}
+        self._lapse, self._resume, self._abandon = _Carry(), _Carry(), _Carry()
+        self._spawned = 0
+        self._cumulative_share = []
+        total = 0
+        for share in BIOME_ROLL_SHARE_BP:
+            total += share
+            self._cumulative_share.append(total)
+
+        self.controlled_hexes = 0
+        self.total_lapses = 0
+        self.total_claims = 0
+        self.total_abandoned = 0
+        self.total_upkeep_paid = 0
+        self._paid_hex_epochs = 0
+        self._spawn(initial_hexes)
+
+    def charge_upkeep(self, *, surplus_band: int) -> int:
+        """Decide which hexes pay this period and return the upkeep they pay."""
+        model, upkeep = self.model, self.upkeep
+        keep_bp = BP_DEN - min(BP_DEN, model.lapse_bp + max(0, -surplus_band) * model.starved_lapse_bp_per_band)
+        lapse, resume = self._lapse.split, self._resume.split
+        self._paid = paid = {
+            i: lapse(n, keep_bp) if i % LEVELS == 0 else resume(n, model.resume_bp) for i, n in self.cells.items()
+        }
+        self.total_lapses += sum(n - paid[i] for i, n in self.cells.items() if i % LEVELS == 0)
+        hexes = sum(paid.values())
+        raw = sum(payers * upkeep[i // LEVELS] for i, payers in paid.items())
+        scale, weighted = self._charge
+        energy = raw * scale // weighted
+        self.total_upkeep_paid += energy
+        self._paid_hex_epochs += hexes
+        return energy
+
+    def advance(self, *, active_adventurers: int, new_hexes: int) -> int:
+        """Apply recovery, decay, claims, abandonment and expansion; return the hex count."""
+        paid, upkeep, recovery = self._paid, self.upkeep, self.recovery
+        nxt: Dict[int, int] = {}
+        for i, n in self.cells.items():
+            payers = paid.get(i, 0)
+            level = i % LEVELS
+            base = i - level
+            b = base // LEVELS
+            if payers:
+                j = base + max(0, level - recovery[b])
+                nxt[j] = nxt.get(j, 0) + payers
+            unpaid = n - payers
+            if unpaid and level == MAX_DECAY:
+                abandoned = min(unpaid, self._abandon.split(unpaid, self.model.abandon_bp))
+                self.total_abandoned += abandoned
+                unpaid -= abandoned
+            if unpaid:
+                j = base + min(MAX_DECAY, level + upkeep[b])
+                nxt[j] = nxt.get(j, 0) + unpaid
+        self._paid = {}
+
+        raiders = active_adventurers * self.raider_share_bp // BP_DEN
+        self._claim(nxt, raiders * self.model.claim_attempt_bp // BP_DEN)
+        self.cells = nxt
+        self.controlled_hexes = sum(nxt.values())
+        self._spawn(new_hexes)
+        return self.controlled_hexes
+
+    def _claim(self, cells: Dict[int, int], attempts: int) -> None:
+        # Highest decay first; within a level, split across biomes pro rata.
+        by_level: Dict[int, List[int]] = {}
+        for i in cells:
+            if i % LEVELS >= CLAIMABLE_DECAY_THRESHOLD:
+                by_level.setdefault(i % LEVELS, []).append(i)
+        for level in sorted(by_level, reverse=True):
+            if attempts <= 0:
+                return
+            group = sorted(by_level[level])
+            available = sum(cells[i] for i in group)
+            if attempts >= available:
+                taken = [cells[i] for i in group]
+            else:
+                taken = [cells[i] * attempts // available for i in group]
+                short = attempts - sum(taken)
+                for k, i in enumerate(group):
+                    if short == 0:
+                        break
+                    if cells[i] > taken[k]:
+                        taken[k] += 1
+                        short -= 1
+            for i, take in zip(group, taken):
+                if take:
+                    left = cells[i] - take
+                    if left:
+                        cells[i] = left
+                    else:
+                        del cells[i]
+                    cells[i - level] = cells.get(i - level, 0) + take
+            claimed = sum(taken)
+            self.total_claims += claimed
+            attempts -= claimed
+
+    def _spawn(self, count: int) -> None:
+        if count <= 0:
+            return
+        before, after = self._spawned, self._spawned + count
+        prev_before = prev_after = 0
+        for b, cumulative in enumerate(self._cumulative_share):
+            cur_before, cur_after = before * cumulative // BP_DEN, after * cumulative // BP_DEN
+            added = (cur_after - prev_after) - (cur_before - prev_before)
+            if added:
+                self.cells[b * LEVELS] = self.cells.get(b * LEVELS, 0) + added
+            prev_before, prev_after = cur_before, cur_after
+        self._spawned = after
+        self.controlled_hexes += count
+
+    def by_biome(self) -> Dict[str, Dict[int, int]]:
+        """Non-empty `{biome: {decay_level: hexes}}` bins."""
+        histogram: Dict[str, Dict[int, int]] = {}
+        for i in sorted(self.cells):
+            histogram.setdefault(BIOMES[i // LEVELS], {})[i % LEVELS] = self.cells[i]
+        return histogram
+
+    def metrics(self) -> Dict[str, float]:
+        claimable = decaying = 0
+        for i, n in self.cells.items():
+            level = i % LEVELS
+            if level >= CLAIMABLE_DECAY_THRESHOLD:
+                claimable += n
+            elif level:
+                decaying += n
+        return {
+            "controlled_hexes": self.controlled_hexes,
+            "decaying_hexes": decaying,
+            "claimable_hexes": claimable,
+            "total_lapses": self.total_lapses,
+            "total_claims": self.total_claims,
+            "total_abandoned": self.total_abandoned,
+            "upkeep_paid_energy": self.total_upkeep_paid,
+            "mean_upkeep_per_paid_hex": (
+                round(self.total_upkeep_paid / self._paid_hex_epochs, 4) if self._paid_hex_epochs else 0.0
+            ),
+        }
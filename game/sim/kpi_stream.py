@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Streaming end-of-run KPIs (economic simulator spec section 9.2).
+
+Runner components update these online instead of keeping entity snapshots:
+
+- `QuantileSketch`: log-bucketed quantile sketch with a fixed relative
+  accuracy (the DDSketch bucketing). Count, sum, min and max are exact;
+  quantiles are within `relative_accuracy` of a true sample. Sketches with
+  the same accuracy merge by adding bucket counts, so runs from different
+  seeds or sweep workers combine into the same bands a single long run would
+  give.
+- `ConcentrationIndex`: per-controller hex counts with a running sum of
+  squares (HHI) and a histogram of counts (Gini), both updated in O(1) per
+  ownership change.
+
+`merge_bands` turns serialized sketches (`ScenarioResult.sketches`) into the
+`kpi_bands` section of `run_summary.json`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Mapping
+
+BP_DEN = 10_000
+DEFAULT_RELATIVE_ACCURACY = 0.01
+BAND_QUANTILES = (("p05", 0.05), ("median", 0.5), ("p95", 0.95))
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch over non-negative samples."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, n: int = 1) -> None:
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative samples")
+        if n <= 0:
+            return
+        if value == 0:
+            self.zero_count += n
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += n
+        self.sum += value * n
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile `q` (lower rank, as `statistics.median_low`)."""
+        if self.count == 0:
+            return 0.0
+        if not 0 <= q <= 1:
+            raise ValueError("quantile must be in [0, 1]")
+        rank = int(q * (self.count - 1))
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self._gamma**index / (self._gamma + 1)
+                return min(self.max, max(self.min, estimate))
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def bands(self) -> Dict[str, float]:
+        bands = {"count": self.count, "mean": round(self.mean, 4)}
+        for name, q in BAND_QUANTILES:
+            bands[name] = round(self.quantile(q), 4)
+        return bands
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): n for index, n in sorted(self.buckets.items())},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping) -> "QuantileSketch":
+        sketch = cls(payload["relative_accuracy"])
+        sketch.buckets = {int(index): n for index, n in payload["buckets"].items()}
+        sketch.zero_count = payload["zero_count"]
+        sketch.count = payload["count"]
+        sketch.sum = payload["sum"]
+        if sketch.count:
+            sketch.min = payload["min"]
+            sketch.max = payload["max"]
+        return sketch
+
+
+class ConcentrationIndex:
+    """Hex counts per controller with O(1) HHI and Gini bookkeeping."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self._sum_squares = 0
+        self._holders_by_count: Dict[int, int] = {}  # hex count -> controllers holding it
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, controller: int, n: int = 1) -> None:
+        self._shift(controller, n)
+
+    def remove(self, controller: int, n: int = 1) -> None:
+        self._shift(controller, -n)
+
+    def move(self, source: int, target: int, n: int = 1) -> None:
+        if source != target:
+            self._shift(source, -n)
+            self._shift(target, n)
+
+    def _shift(self, controller: int, delta: int) -> None:
+        before = self.counts.get(controller, 0)
+        after = before + delta
+        if after < 0:
+            raise ValueError(f"controller {controller} holds {before} hexes; cannot remove {-delta}")
+        holders = self._holders_by_count
+        if before:
+            holders[before] -= 1
+            if not holders[before]:
+                del holders[before]
+        if after:
+            holders[after] = holders.get(after, 0) + 1
+            self.counts[controller] = after
+        else:
+            self.counts.pop(controller, None)
+        self._sum_squares += after * after - before * before
+        self.total += delta
+
+    @property
+    def hhi_bp(self) -> int:
+        """Herfindahl-Hirschman index of controller shares, in bp (10000 = monopoly)."""
+        if not self.total:
+            return 0
+        return self._sum_squares * BP_DEN // (self.total * self.total)
+
+    @property
+    def gini_bp(self) -> int:
+        """Gini coefficient of hexes across controllers holding at least one, in bp."""
+        holders = len(self.counts)
+        if holders == 0 or self.total == 0:
+            return 0
+        weighted = 0  # sum of rank * count over controllers sorted by count
+        rank = 0
+        for count in sorted(self._holders_by_count):
+            m = self._holders_by_count[count]
+            weighted += count * (m * rank + m * (m + 1) // 2)
+            rank += m
+        gini = 2 * weighted / (holders * self.total) - (holders + 1) / holders
+        return round(gini * BP_DEN)
+
+
+def merge_bands(sketch_sets: Iterable[Mapping[str, Mapping]]) -> Dict[str, Dict[str, float]]:
+    """Merge serialized sketches by name and return `{name: bands}`."""
+    merged: Dict[str, QuantileSketch] = {}
+    for sketches in sketch_sets:
+        for name, payload in sketches.items():
+            sketch = QuantileSketch.from_dict(payload)
+            if name in merged:
+                merged[name].merge(sketch)
+            else:
+                merged[name] = sketch
+    return {name: merged[name].bands() for name in sorted(merged)}
+
+
+def bands_by_scenario(results: Iterable) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """`kpi_bands` for `run_summary.json`: sketches merged across results per scenario key."""
+    grouped: Dict[str, List[Mapping[str, Mapping]]] = {}
+    for result in results:
+        if result.sketches:
+            grouped.setdefault(result.scenario.key, []).append(result.sketches)
+    return {key: merge_bands(sets) for key, sets in grouped.items()}
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""Grouped mine stress and collapse model for the bootstrap world simulator.
+
+Ports the stress/yield/energy/collapse math from `game/src/libs/mining_math.cairo`
+(integer floors and u16/u32 saturation included). The mine population is rolled
+from the `mining_gen.cairo` tables with a seed standing in for the on-chain
+noise rolls, then folded into risk classes (biome risk x rarity tier x
+threshold band) holding the class mean threshold, safe shift, reserve,
+richness, ore weight and depth.
+
+Mines are kept as counts per (class, stress level), over the flat index
+`class * 101 + level` where the level is stress in percent of the class
+collapse threshold, so an epoch touches occupied groups rather than mines.
+Per epoch the model:
+
+1. Reopens repaired mines at `collapse_threshold / 4` stress.
+2. Staffs open mines with crews (miners from the scenario miner share),
+   keeping staffed mines staffed and taking the least stressed idle mines
+   first, spread over classes in proportion to their idle mines.
+3. Lets crews above `stabilize_trigger_bp` stress stabilize first
+   (`collapse_threshold / 20` per action, as in `stabilize_mine`).
+4. Has each crew settle every `settle_blocks` (shifts restart every
+   `shift_blocks`) while the planned stress stays under `exit_stress_bp` and
+   each miner can still pay `compute_tick_energy_cost`, swarm surcharge
+   included, out of `tick_energy_budget`. Every epoch starts on a shift
+   boundary, so planned stress depends only on the class and crew size.
+5. Scales planned stress by a log-normal factor whose median rises with the
+   scenario shock: a group collapses with the probability that its realised
+   stress reaches the threshold, killing the crew and sending the mine to
+   repair.
+
+Deaths come from the stress model alone. With `calibrated_collapse` the
+collapse probabilities are instead rescaled so expected deaths follow the
+runner's aggregate `miners * collapse_prob_bp`, and the stress model only
+decides which mines collapse.
+
+Fractional flows (collapses, depletions, crew splits) use carries, so small
+groups move at the right long-run rate instead of rounding to zero.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+BP_DEN = 10_000
+U16_MAX = 65_535
+U32_MAX = 4_294_967_295
+LEVELS = 101
+
+# mining_manager.cairo locked constants.
+SWARM_K_LOCKED = 2
+OVERSTAY_K_BP = 120
+DENSITY_K_BP = 2
+MAX_STRESS_PENALTY_BP = 8_500
+BASE_TICK_ENERGY = 3
+
+# (biome, share of mine-bearing areas, biome_risk_bp, base stress extra)
+BIOME_RISK_TABLE = (
+    ("plains", 3_000, 10_000, 0),
+    ("forest", 2_000, 10_000, 0),
+    ("highlands", 1_200, 11_500, 3),
+    ("mountain", 1_500, 12_500, 4),
+    ("canyon", 800, 11_500, 0),
+    ("badlands", 700, 11_250, 0),
+    ("glacier", 400, 13_000, 5),
+    ("volcanic", 400, 14_000, 8),
+)
+_BIOME_WEIGHTS = [row[1] for row in BIOME_RISK_TABLE]
+RARITY_RISK_BP = (10_000, 11_250, 13_000, 15_000, 17_500)
+
+
+def swarm_energy_surcharge(active_miners: int, swarm_k: int) -> int:
+    if active_miners <= 1:
+        return 0
+    delta = active_miners - 1
+    return min(U16_MAX, delta * delta * swarm_k)
+
+
+def compute_tick_energy_cost(
+    base_tick_energy: int,
+    ore_energy_weight: int,
+    depth_tier: int,
+    active_miners: int,
+    swarm_k: int,
+) -> int:
+    surcharge = swarm_energy_surcharge(active_miners, swarm_k)
+    return min(U16_MAX, base_tick_energy + ore_energy_weight + depth_tier + surcharge)
+
+
+def compute_stress_delta(
+    dt_blocks: int,
+    base_stress_per_block: int,
+    active_miners: int,
+    shift_elapsed_blocks: int,
+    safe_shift_blocks: int,
+    biome_risk_bp: int,
+    rarity_risk_bp: int,
+    overstay_k_bp: int,
+    density_k_bp: int,
+) -> int:
+    if dt_blocks == 0 or base_stress_per_block == 0:
+        return 0
+    n_minus_one = active_miners - 1 if active_miners > 1 else 0
+    density_factor_bp = BP_DEN + density_k_bp * n_minus_one * n_minus_one
+    overstay_blocks = max(0, shift_elapsed_blocks - safe_shift_blocks)
+    overstay_factor_bp = BP_DEN + overstay_k_bp * overstay_blocks
+    numerator = (
+        dt_blocks
+        * base_stress_per_block
+        * density_factor_bp
+        * overstay_factor_bp
+        * biome_risk_bp
+        * rarity_risk_bp
+    )
+    return min(U32_MAX, numerator // BP_DEN**4)
+
+
+def compute_tick_yield(
+    base_yield_per_block: int,
+    mine_stress: int,
+    collapse_threshold: int,
+    max_stress_penalty_bp: int,
+    dt_blocks: int,
+) -> int:
+    if base_yield_per_block == 0 or dt_blocks == 0 or collapse_threshold == 0:
+        return 0
+    ratio_bp = min(BP_DEN, mine_stress * BP_DEN // collapse_threshold)
+    penalty_bp = min(max_stress_penalty_bp, ratio_bp)
+    effective_per_block = base_yield_per_block * (BP_DEN - penalty_bp) // BP_DEN
+    return min(U32_MAX, effective_per_block * dt_blocks)
+
+
+def will_collapse(next_stress: int, collapse_threshold: int) -> bool:
+    return collapse_threshold > 0 and next_stress >= collapse_threshold
+
+
+@dataclass(frozen=True)
+class MinePopulationModel:
+    """Factory for per-scenario mine populations (`ScenarioRunner(collapse_model=...)`)."""
+
+    mine_count: int = 20_000
+    seed: int = 7
+    crew_size: int = 3
+    settle_blocks: int = 10
+    shift_blocks: int = 20
+    stabilize_trigger_bp: int = 5_000
+    stabilize_actions_per_miner: int = 4
+    exit_stress_bp: int = 8_000
+    # Log-spread of realised over planned stress, and the shift of its median
+    # per bp of scenario collapse shock. Tuned so raw stress odds give the
+    # aggregate deaths of `baseline_10k` and `collapse_wave` within 3%.
+    stress_jitter_bp: int = 3_500
+    repair_energy_per_epoch: int = 400
+    shock_stress_gain_bp: int = 55
+    tick_energy_budget: int = 120
+    # Threshold rolls are split into this many bands per (biome risk, tier), so
+    # weak and strong mines of a class keep their own collapse thresholds.
+    threshold_bands: int = 4
+
+    # True rescales collapse odds so expected deaths follow the aggregate
+    # `miners * collapse_prob_bp`; the stress model then only picks the mines.
+    calibrated_collapse: bool = False
+
+    def for_scenario(self, scenario, config) -> "MinePopulation":
+        return MinePopulation(self, scenario.collapse_shock_prob_bp, config.blocks_per_epoch)
+
+
+@dataclass(frozen=True)
+class MineClass:
+    """Class means of the rolled mines sharing a (biome risk, rarity tier, threshold band)."""
+
+    base_stress: int
+    biome_risk_bp: int
+    rarity_risk_bp: int
+    safe_shift: int
+    threshold: int
+    reserve: int
+    base_yield: int
+    ore_energy_weight: int
+    depth_tier: int
+
+
+class _Carry:
+    """Rounds a stream of expected counts to integers whose sum tracks the expectation."""
+
+    __slots__ = ("rest",)
+
+    def __init__(self) -> None:
+        self.rest = 0.0
+
+    def take(self, expected: float, cap: int) -> int:
+        total = self.rest + expected
+        taken = min(cap, int(total))
+        self.rest = total - taken
+        return taken
+
+
+class MinePopulation:
+    """Mine counts per (class, stress level), staffed or idle, plus a repair queue."""
+
+    def __init__(self, model: MinePopulationModel, collapse_shock_prob_bp: int, blocks_per_epoch: int) -> None:
+        if blocks_per_epoch % model.shift_blocks or model.shift_blocks % model.settle_blocks:
+            raise ValueError("shift_blocks must divide blocks_per_epoch and settle_blocks must divide shift_blocks")
+        self.model = model
+        self.blocks_per_epoch = blocks_per_epoch
+        self.stress_scale_bp = max(2_500, BP_DEN + collapse_shock_prob_bp * model.shock_stress_gain_bp)
+
+        self.classes, counts = _roll_classes(model.mine_count, random.Random(model.seed), model.threshold_bands)
+        self.mine_count = sum(counts)
+        self.idle: Dict[int, int] = {c * LEVELS: n for c, n in enumerate(counts) if n}
+        self.staffed: Dict[int, int] = {}
+        self._repairing: Dict[int, Dict[int, int]] = {}
+        self._epoch = 0
+
+        self._settle_stress: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._tick_cost: Dict[Tuple[int, int], int] = {}
+        self._collapse, self._depletion, self._crews = _Carry(), _Carry(), _Carry()
+        self._death_debt = 0
+
+        self.total_collapses = 0
+        self.total_deaths = 0
+        self.total_ore = 0
+        self.total_depleted = 0
+        self.total_tick_energy = 0
+
+    @property
+    def staffed_mines(self) -> int:
+        return sum(self.staffed.values())
+
+    @property
+    def repairing_mines(self) -> int:
+        return sum(sum(by_class.values()) for by_class in self._repairing.values())
+
+    def step(self, *, active_adventurers: int, miner_share_bp: int, collapse_prob_bp: int | None = None) -> int:
+        """Advance one epoch and return collapse deaths."""
+        model = self.model
+        self._epoch += 1
+        self._repair()
+        miners = active_adventurers * miner_share_bp // BP_DEN
+        self._staff(miners)
+        staffed_total = self.staffed_mines
+        if staffed_total == 0:
+            return 0
+
+        # Plan every (group, crew size) first; collapses are allocated afterwards.
+        base_crew, extra = divmod(miners, staffed_total)
+        trigger_bp, exit_bp = model.stabilize_trigger_bp, model.exit_stress_bp
+        shock_bp, jitter_bp = self.stress_scale_bp, max(1, model.stress_jitter_bp)
+        ore = energy = 0
+        plans: List[Tuple[int, int, int, float, int]] = []
+        for i, m in self.staffed.items():
+            c, level = divmod(i, LEVELS)
+            mine = self.classes[c]
+            limit = mine.threshold
+            larger = self._crews.take(m * extra / staffed_total, m)
+            for n, count in ((base_crew + 1, larger), (base_crew, m - larger)):
+                if count == 0 or n == 0:
+                    continue
+                current = level * limit // 100
+                if current * BP_DEN >= limit * trigger_bp:
+                    current = max(0, current - n * model.stabilize_actions_per_miner * max(1, limit // 20))
+
+                cumulative = self._settle_stress.get((c, n)) or self._crew_settle_stress(c, n)
+                cost = self._tick_cost.get((c, n)) or self._crew_tick_cost(c, n)
+                settles = min(
+                    bisect_right(cumulative, limit * exit_bp // BP_DEN - current),
+                    model.tick_energy_budget // cost,
+                )
+                if settles == 0:
+                    plans.append((c, n, count, 0.0, current * 100 // limit))
+                    continue
+
+                mined = n * compute_tick_yield(
+                    mine.base_yield, current, limit, MAX_STRESS_PENALTY_BP, settles * model.settle_blocks
+                )
+                ore += count * mined
+                energy += count * n * settles * cost
+                self.total_depleted += (depleted := self._depletion.take(count * mined / mine.reserve, count))
+
+                # Realised stress is the plan scaled by a log-normal factor with
+                # median `shock` and log-spread `jitter`; the mine collapses when
+                # that reaches the threshold.
+                planned = cumulative[settles - 1]
+                needed = math.log((limit - current) * BP_DEN / (planned * shock_bp))
+                odds = 0.5 * math.erfc(needed * BP_DEN / (jitter_bp * math.sqrt(2.0)))
+                end_level = min(LEVELS - 2, (current + planned * shock_bp // BP_DEN) * 100 // limit)
+                plans.append((c, n, count - depleted, odds, end_level))
+                if depleted:
+                    plans.append((c, n, depleted, odds, -1))
+
+        if model.calibrated_collapse and collapse_prob_bp is not None:
+            self._death_debt += miners * collapse_prob_bp // BP_DEN
+            rates = _calibrated_rates(plans, max(0, self._death_debt))
+        else:
+            rates = [odds for _, _, _, odds, _ in plans]
+
+        deaths = collapsed_total = 0
+        staffed: Dict[int, int] = {}
+        ready = self._epoch + 1
+        for (c, n, count, _, end_level), rate in zip(plans, rates):
+            collapsed = self._collapse.take(count * rate, count)
+            if collapsed:
+                deaths += n * collapsed
+                collapsed_total += collapsed
+                repair_epochs = -(-max(1, self.classes[c].threshold // 3) // max(1, model.repair_energy_per_epoch))
+                by_class = self._repairing.setdefault(ready + repair_epochs - 1, {})
+                by_class[c] = by_class.get(c, 0) + collapsed
+            if count > collapsed:
+                # Depleted veins (end_level -1) reopen on the next vein at 0 stress.
+                j = c * LEVELS + max(0, end_level)
+                staffed[j] = staffed.get(j, 0) + count - collapsed
+        self.staffed = staffed
+
+        if model.calibrated_collapse and collapse_prob_bp is not None:
+            self._death_debt -= deaths
+        self.total_collapses += collapsed_total
+        self.total_deaths += deaths
+        self.total_ore += ore
+        self.total_tick_energy += energy
+        return deaths
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "mine_count": self.mine_count,
+            "staffed_mines": self.staffed_mines,
+            "repairing_mines": self.repairing_mines,
+            "total_collapses": self.total_collapses,
+            "total_deaths": self.total_deaths,
+            "total_ore": self.total_ore,
+            "total_depleted": self.total_depleted,
+            "tick_energy_spent": self.total_tick_energy,
+        }
+
+    def _crew_settle_stress(self, c: int, n: int) -> Tuple[int, ...]:
+        """Cumulative crew stress after each settle of an epoch for class `c`."""
+        mine = self.classes[c]
+        settle_blocks, shift_blocks = self.model.settle_blocks, self.model.shift_blocks
+        total = 0
+        cumulative: List[int] = []
+        for settle in range(1, self.blocks_per_epoch // settle_blocks + 1):
+            elapsed = (settle * settle_blocks - 1) % shift_blocks + 1
+            total += n * compute_stress_delta(
+                settle_blocks,
+                mine.base_stress,
+                n,
+                elapsed,
+                mine.safe_shift,
+                mine.biome_risk_bp,
+                mine.rarity_risk_bp,
+                OVERSTAY_K_BP,
+                DENSITY_K_BP,
+            )
+            cumulative.append(total)
+        self._settle_stress[(c, n)] = tuple(cumulative)
+        return self._settle_stress[(c, n)]
+
+    def _crew_tick_cost(self, c: int, n: int) -> int:
+        """Per-miner energy for one settle, swarm surcharge for a crew of `n` included."""
+        mine = self.classes[c]
+        cost = compute_tick_energy_cost(BASE_TICK_ENERGY, mine.ore_energy_weight, mine.depth_tier, n, SWARM_K_LOCKED)
+        self._tick_cost[(c, n)] = max(1, cost)
+        return self._tick_cost[(c, n)]
+
+    def _repair(self) -> None:
+        repaired = self._repairing.pop(self._epoch, None)
+        if not repaired:
+            return
+        for c, count in repaired.items():
+            j = c * LEVELS + 25
+            self.idle[j] = self.idle.get(j, 0) + count
+
+    def _staff(self, miners: int) -> None:
+        crew_size = max(1, self.model.crew_size)
+        target = -(-miners // crew_size) if miners > 0 else 0
+        staffed, idle = self.staffed, self.idle
+        current = sum(staffed.values())
+
+        if current > target:
+            # Release crews pro rata over staffed groups.
+            release = current - target
+            moved = {i: m * release // current for i, m in staffed.items()}
+            short = release - sum(moved.values())
+            for i in sorted(staffed):
+                if short == 0:
+                    break
+                if staffed[i] > moved[i]:
+                    moved[i] += 1
+                    short -= 1
+            for i, k in moved.items():
+                if k:
+                    staffed[i] -= k
+                    idle[i] = idle.get(i, 0) + k
+            self.staffed = {i: m for i, m in staffed.items() if m}
+            return
+
+        # Least stressed level first; within a level, crews spread over classes pro rata.
+        need = target - current
+        by_level: Dict[int, List[int]] = {}
+        for i in idle:
+            by_level.setdefault(i % LEVELS, []).append(i)
+        for level in sorted(by_level):
+            if need == 0:
+                break
+            group = sorted(by_level[level])
+            available = sum(idle[i] for i in group)
+            if need >= available:
+                taken = [idle[i] for i in group]
+            else:
+                taken = [idle[i] * need // available for i in group]
+                short = need - sum(taken)
+                for k, i in enumerate(group):
+                    if short == 0:
+                        break
+                    if idle[i] > taken[k]:
+                        taken[k] += 1
+                        short -= 1
+            for i, k in zip(group, taken):
+                if k:
+                    staffed[i] = staffed.get(i, 0) + k
+                    if k == idle[i]:
+                        del idle[i]
+                    else:
+                        idle[i] -= k
+            need -= sum(taken)
+
+
+def _calibrated_rates(plans: List[Tuple[int, int, int, float, int]], deaths: int) -> List[float]:
+    """Per-plan collapse rates proportional to the stress odds with `deaths` expected.
+
+    Water-fills: plans whose scaled rate would pass 1 collapse outright and the
+    rest of the target is rescaled over the others. Once no crew left has any
+    odds, the remainder is spread evenly over crews.
+    """
+    rates = [0.0] * len(plans)
+    open_plans = [k for k, plan in enumerate(plans) if plan[2]]
+    while deaths > 0 and open_plans:
+        exposure = sum(plans[k][1] * plans[k][2] * plans[k][3] for k in open_plans)
+        if exposure > 0:
+            weight = [plans[k][3] for k in open_plans]
+        else:
+            exposure = sum(plans[k][1] * plans[k][2] for k in open_plans)
+            weight = [1.0] * len(open_plans)
+        scale = deaths / exposure
+        capped = [k for k, w in zip(open_plans, weight) if w * scale >= 1.0]
+        if not capped:
+            for k, w in zip(open_plans, weight):
+                rates[k] = w * scale
+            break
+        for k in capped:
+            rates[k] = 1.0
+            deaths -= plans[k][1] * plans[k][2]
+        open_plans = [k for k in open_plans if rates[k] < 1.0]
+    return rates
+
+
+def _roll_classes(
+    count: int, rng: random.Random, threshold_bands: int = 1
+) -> Tuple[List[MineClass], List[int]]:
+    """Roll `count` mines and fold them into (biome risk, tier, threshold band) class means."""
+    sums: Dict[Tuple[int, int, int, int], List[int]] = {}
+    for _ in range(count):
+        _, _, biome_risk, biome_extra = rng.choices(BIOME_RISK_TABLE, _BIOME_WEIGHTS)[0]
+        tier = _rarity_tier_from_roll(rng.randrange(100))
+        safe_roll, threshold_roll = rng.randrange(100), rng.randrange(100)
+        rolled = (
+            _safe_shift_from_roll(tier, safe_roll),
+            _collapse_threshold_from_roll(tier, threshold_roll),
+            _reserve_from_roll(tier, rng.randrange(100)),
+            1 + (7_000 + rng.randrange(100) * 9_000 // 100) // 1_000,
+            _ore_energy_weight_from_roll(tier, rng.randrange(100)),
+            _depth_tier_from_roll(rng.randrange(100)),
+        )
+        band = threshold_roll * threshold_bands // 100
+        acc = sums.setdefault((biome_risk, biome_extra, tier, band), [0] * (len(rolled) + 1))
+        acc[0] += 1
+        for k, value in enumerate(rolled, start=1):
+            acc[k] += value
+
+    classes: List[MineClass] = []
+    counts: List[int] = []
+    for (biome_risk, biome_extra, tier, _), acc in sorted(sums.items()):
+        n = acc[0]
+        safe, threshold, reserve, base_yield, ore_weight, depth = (int(round(v / n)) for v in acc[1:])
+        classes.append(
+            MineClass(
+                base_stress=8 + tier * 4 + biome_extra,
+                biome_risk_bp=biome_risk,
+                rarity_risk_bp=RARITY_RISK_BP[tier],
+                safe_shift=safe,
+                threshold=threshold,
+                reserve=reserve,
+                base_yield=base_yield,
+                ore_energy_weight=ore_weight,
+                depth_tier=depth,
+            )
+        )
+        counts.append(n)
+    return classes, counts
+
+
+def _rarity_tier_from_roll(roll: int) -> int:
+    if roll < 40:
+        return 0
+    if roll < 70:
+        return 1
+    if roll < 90:
+        return 2
+    if roll < 98:
+        return 3
+    return 4
+
+
+def _reserve_from_roll(tier: int, roll: int) -> int:
+    base, span = ((1_400, 1_000), (1_000, 800), (700, 600), (450, 450), (250, 350))[tier]
+    return base + roll * span // 100
+
+
+def _collapse_threshold_from_roll(tier: int, roll: int) -> int:
+    base, span = ((9_000, 3_000), (7_000, 2_500), (5_000, 2_000), (3_500, 1_500), (2_500, 1_000))[tier]
+    return base + roll * span // 100
+
+
+def _safe_shift_from_roll(tier: int, roll: int) -> int:
+    base = (16, 13, 10, 7, 5)[tier]
+    return max(4, base + roll * 6 // 100)
+
+
+def _ore_energy_weight_from_roll(tier: int, roll: int) -> int:
+    # ore_id_from_tier_roll then ore_energy_weight.
+    if tier == 0:
+        return 1 if roll < 75 else 2
+    if tier == 1:
+        return 2 if roll < 67 else 3
+    if tier == 2:
+        return 3 if roll < 34 else 4 if roll < 67 else 5
+    if tier == 3:
+        return 5 if roll < 50 else 6
+    return 8
+
+
+def _depth_tier_from_roll(roll: int) -> int:
+    if roll < 20:
+        return 1
+    if roll < 40:
+        return 2
+    if roll < 65:
+        return 3
+    if roll < 85:
+        return 4
+    return 5
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Pareto fronts over sweep results.
+
+`run_summary.json` only names the best-exploration and worst-inflation
+scenario. Tuning is a tradeoff across several KPIs, so this stage ranks sweep
+results by non-dominated sorting and writes the leading fronts with the
+scenario inputs that produced them.
+
+- Two objectives: one sort plus a binary search per point assigns every front
+  in O(n log n).
+- Three or more: each front is found with Kung's divide-and-conquer (sort
+  lexicographically, take the front of each half, keep the lower half's
+  points no upper-half point dominates), then removed before the next. The
+  merge recurses one objective at a time down to a two-objective sweep, for
+  O(n log^(d-1) n) per front.
+
+Identical objective vectors share a rank.
+
+Objectives are `ScenarioSummary` fields with a sense (`min` or `max`). The
+default set trades inflation against exploration, locked capital and
+population.
+
+Usage:
+
+```bash
+python3 -m game.sim.pareto --queue-dir /mnt/sweep --out game/sim/out/pareto_fronts.json
+python3 -m game.sim.pareto --queue-dir /mnt/sweep --objective net_inflation_pct:min \\
+    --objective total_new_hexes:max --fronts 3
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict
+from operator import le
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+OBJECTIVES = (
+    ("net_inflation_pct", "min"),
+    ("total_new_hexes", "max"),
+    ("locked_capital_energy", "max"),
+    ("final_active_adventurers", "max"),
+)
+SENSES = ("min", "max")
+# Scenario fields left out of the artifact's configs (descriptive only).
+_DESCRIPTIVE_FIELDS = ("label", "notes")
+_LEAF_SIZE = 64
+
+
+def parse_objective(text: str) -> Tuple[str, str]:
+    """`"name:sense"` (sense defaults to `min`) -> `(name, sense)`."""
+    name, _, sense = text.partition(":")
+    sense = sense or "min"
+    if sense not in SENSES:
+        raise ValueError(f"objective sense must be one of {SENSES}: {text!r}")
+    return name, sense
+
+
+def dominates(a: Sequence[float], b: Sequence[float]) -> bool:
+    """True if `a` is no worse than `b` everywhere and differs (minimisation)."""
+    return a != b and all(map(le, a, b))
+
+
+def non_dominated_sort(vectors: Sequence[Tuple[float, ...]], max_fronts: int | None = None) -> List[List[int]]:
+    """Indices of `vectors` grouped into fronts, best first (all objectives minimised)."""
+    if max_fronts is not None and max_fronts < 1:
+        raise ValueError("max_fronts must be >= 1")
+    if not vectors:
+        return []
+    width = len(vectors[0])
+    if any(len(v) != width for v in vectors):
+        raise ValueError("objective vectors must share one length")
+    # Identical vectors never dominate each other: rank each distinct vector once.
+    members: Dict[Tuple[float, ...], List[int]] = {}
+    for i, vector in enumerate(vectors):
+        members.setdefault(tuple(vector), []).append(i)
+    points = sorted(members)
+
+    if width <= 2:
+        fronts = _sort_2d(points)
+        if max_fronts is not None:
+            fronts = fronts[:max_fronts]
+    else:
+        fronts = []
+        while points and (max_fronts is None or len(fronts) < max_fronts):
+            front = _kung(points)
+            fronts.append(front)
+            taken = set(front)
+            points = [p for p in points if p not in taken]
+    return [sorted(i for p in front for i in members[p]) for front in fronts]
+
+
+def _sort_2d(points: List[Tuple[float, ...]]) -> List[List[Tuple[float, ...]]]:
+    # Lexicographic order means no later point dominates an earlier one. Each
+    # front's best second objective so far only grows with rank, so a point
+    # joins the first front whose best it strictly beats.
+    fronts: List[List[Tuple[float, ...]]] = []
+    tails: List[float] = []
+    for point in points:
+        second = point[-1]
+        rank = bisect_right(tails, second)
+        if rank == len(fronts):
+            fronts.append([point])
+            tails.append(second)
+        else:
+            fronts[rank].append(point)
+            tails[rank] = second
+    return fronts
+
+
+def _kung(points: List[Tuple[float, ...]]) -> List[Tuple[float, ...]]:
+    """Front of distinct, lexicographically sorted `points` (Kung et al. 1975)."""
+    if len(points) <= _LEAF_SIZE:
+        front: List[Tuple[float, ...]] = []
+        for point in points:
+            if not any(all(map(le, f, point)) for f in front):
+                front.append(point)
+        return front
+    mid = len(points) // 2
+    upper = _kung(points[:mid])
+    # Upper points precede lower ones on the first objective; only the rest decide.
+    return upper + _undominated(upper, _kung(points[mid:]), 1)
+
+
+def _undominated(
+    upper: List[Tuple[float, ...]], lower: List[Tuple[float, ...]], axis: int
+) -> List[Tuple[float, ...]]:
+    """`lower` points no `upper` point weakly beats on axes >= `axis`.
+
+    Callers guarantee every `upper` point is already <= every `lower` point on
+    the axes before `axis`.
+    """
+    if not upper or not lower:
+        return lower
+    width = len(lower[0])
+    if axis == width - 1:
+        best = min(u[axis] for u in upper)
+        return [p for p in lower if p[axis] < best]
+    if len(upper) * len(lower) <= _LEAF_SIZE:
+        return [p for p in lower if not any(all(map(le, u[axis:], p[axis:])) for u in upper)]
+    if axis == width - 2:
+        # Sweep the axis in order, tracking the best final axis among upper points so far.
+        upper = sorted(upper, key=lambda u: u[axis])
+        kept, best, j = [], None, 0
+        for p in sorted(lower, key=lambda q: q[axis]):
+            while j < len(upper) and upper[j][axis] <= p[axis]:
+                if best is None or upper[j][-1] < best:
+                    best = upper[j][-1]
+                j += 1
+            if best is None or p[-1] < best:
+                kept.append(p)
+        return kept
+    if max(u[axis] for u in upper) <= min(p[axis] for p in lower):
+        return _undominated(upper, lower, axis + 1)
+    # Split both sets at a pivot on this axis; low upper points also cover the high lower half.
+    values = sorted([u[axis] for u in upper] + [p[axis] for p in lower])
+    pivot = values[len(values) // 2]
+    if pivot == values[-1]:
+        pivot = values[bisect_left(values, pivot) - 1]
+    upper_low = [u for u in upper if u[axis] <= pivot]
+    upper_high = [u for u in upper if u[axis] > pivot]
+    lower_low = [p for p in lower if p[axis] <= pivot]
+    lower_high = [p for p in lower if p[axis] > pivot]
+    lower_high = _undominated(upper_low, lower_high, axis + 1)
+    return _undominated(upper_low, lower_low, axis) + _undominated(upper_high, lower_high, axis)
+
+
+def pareto_fronts(
+    records: Iterable[Tuple[Mapping, Mapping]],
+    objectives: Sequence[Tuple[str, str]] = OBJECTIVES,
+    max_fronts: int | None = 1,
+) -> dict:
+    """Rank `(scenario, summary)` dict pairs and return the fronts artifact."""
+    if not objectives:
+        raise ValueError("at least one objective is required")
+    for name, sense in objectives:
+        if sense not in SENSES:
+            raise ValueError(f"objective sense must be one of {SENSES}: {name}:{sense}")
+    configs: List[dict] = []
+    vectors: List[Tuple[float, ...]] = []
+    for scenario, summary in records:
+        try:
+            vectors.append(tuple(summary[n] if s == "min" else -summary[n] for n, s in objectives))
+        except KeyError as exc:
+            raise ValueError(f"unknown objective: {exc.args[0]}") from None
+        configs.append({k: v for k, v in scenario.items() if k not in _DESCRIPTIVE_FIELDS})
+
+    fronts = []
+    for rank, front in enumerate(non_dominated_sort(vectors, max_fronts), start=1):
+        front.sort(key=vectors.__getitem__)
+        fronts.append(
+            {
+                "rank": rank,
+                "size": len(front),
+                "objectives": {
+                    name: [vectors[i][k] if sense == "min" else -vectors[i][k] for i in front]
+                    for k, (name, sense) in enumerate(objectives)
+                },
+                "configs": [configs[i] for i in front],
+            }
+        )
+    return {
+        "objectives": [{"name": name, "sense": sense} for name, sense in objectives],
+        "points": len(vectors),
+        "fronts": fronts,
+    }
+
+
+def records_from_results(results: Iterable) -> Iterable[Tuple[Dict, Dict]]:
+    """`(scenario, summary)` dict pairs from in-memory `ScenarioResult`s."""
+    return ((asdict(r.scenario), asdict(r.summary)) for r in results)
+
+
+def write_fronts(artifact: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(artifact, separators=(",", ":"), sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write Pareto fronts of a finished sweep.")
+    parser.add_argument("--queue-dir", type=Path, required=True, help="sweep_queue directory with all results.")
+    parser.add_argument("--out", type=Path, default=Path("game/sim/out/pareto_fronts.json"))
+    parser.add_argument(
+        "--objective",
+        action="append",
+        type=parse_objective,
+        default=None,
+        help="Summary field and sense, e.g. net_inflation_pct:min (repeatable; default: the KPI tradeoff set).",
+    )
+    parser.add_argument("--fronts", type=int, default=1, help="Number of leading fronts to keep.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    try:
+        from .sweep_queue import iter_summaries
+    except ImportError:  # loaded as a top-level module by `python3 game/sim/pareto.py`
+        from sweep_queue import iter_summaries
+
+    args = _parse_args()
+    artifact = pareto_fronts(iter_summaries(args.queue_dir), args.objective or OBJECTIVES, args.fronts)
+    write_fronts(artifact, args.out)
+    print(f"points={artifact['points']}")
+    for front in artifact["fronts"]:
+        print(f"front_{front['rank']}={front['size']}")
+    print(f"out={args.out}")
+
+
+if __name__ == "__main__":
+    main()
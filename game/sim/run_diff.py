@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Diff two bootstrap-world run directories.
+
+Compares `timeseries.csv` and `scenario_comparison.csv` from two runs (for
+example before and after a `SimConfig` default or epoch-equation change):
+
+- Timeseries rows are aligned by (scenario, epoch). Per column the report
+  keeps the maximum absolute and relative drift, the number of divergent
+  cells and the first (scenario, epoch) where it diverged; per scenario, the
+  first divergent epoch and the columns involved.
+- Scenario summaries are compared field by field and every delta is listed.
+- Scenarios, columns or epochs present in only one run are structural
+  differences and always fail the diff.
+
+A cell diverges when `|head - base| > abs_tol + rel_tol * |base|` (the
+`isclose` rule). The base run is loaded into typed columns per scenario and
+the head run is streamed one scenario group at a time, so memory is bounded
+by one run; identical columns are skipped with a single array comparison.
+
+Usage:
+
+```bash
+python3 -m game.sim.run_diff game/sim/out/before game/sim/out/after
+python3 -m game.sim.run_diff base/ head/ --rel-tol 1e-6 --ignore twap_usdc_per_energy --out diff.json
+```
+
+Exits 1 when anything diverges beyond tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+TIMESERIES_FILE = "timeseries.csv"
+COMPARISON_FILE = "scenario_comparison.csv"
+DEFAULT_ABS_TOL = 0.0
+DEFAULT_REL_TOL = 1e-9
+
+Columns = Dict[str, array]
+
+
+def _scenario_groups(path: Path) -> Tuple[List[str], Iterator[Tuple[str, Columns]]]:
+    """Header columns and `(scenario, columns)` per contiguous block of rows."""
+    f = path.open(newline="", encoding="utf-8")
+    reader = csv.reader(f)
+    header = next(reader)
+    if header[0] != "scenario" or "epoch" not in header:
+        f.close()
+        raise ValueError(f"{path}: expected a timeseries.csv header starting with scenario")
+    names = header[1:]
+
+    def groups() -> Iterator[Tuple[str, Columns]]:
+        with f:
+            for scenario, rows in groupby(reader, key=itemgetter(0)):
+                transposed = list(zip(*rows))[1:]
+                yield scenario, {name: array("d", map(float, values)) for name, values in zip(names, transposed)}
+
+    return names, groups()
+
+
+def load_timeseries(path: Path) -> Tuple[List[str], Dict[str, Columns]]:
+    """Column names and typed columns per scenario (repeated blocks are appended)."""
+    names, groups = _scenario_groups(path)
+    scenarios: Dict[str, Columns] = {}
+    for scenario, columns in groups:
+        if scenario in scenarios:
+            for name, values in columns.items():
+                scenarios[scenario][name].extend(values)
+        else:
+            scenarios[scenario] = columns
+    return names, scenarios
+
+
+def load_summaries(path: Path) -> Dict[str, Dict[str, object]]:
+    """`scenario_comparison.csv` rows keyed by scenario, numeric fields as floats."""
+    summaries: Dict[str, Dict[str, object]] = {}
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            parsed: Dict[str, object] = {}
+            for name, value in row.items():
+                try:
+                    parsed[name] = float(value)
+                except ValueError:
+                    parsed[name] = value
+            summaries[row["key"]] = parsed
+    return summaries
+
+
+class _ColumnDrift:
+    __slots__ = ("max_abs", "max_rel", "divergent_cells", "changed_cells", "first")
+
+    def __init__(self) -> None:
+        self.max_abs = 0.0
+        self.max_rel = 0.0
+        self.divergent_cells = 0
+        self.changed_cells = 0
+        self.first: Tuple[str, float] | None = None
+
+    def to_dict(self) -> dict:
+        first = None if self.first is None else {"scenario": self.first[0], "epoch": _number(self.first[1])}
+        return {
+            "max_abs": _number(self.max_abs),
+            "max_rel": self.max_rel,
+            "changed_cells": self.changed_cells,
+            "divergent_cells": self.divergent_cells,
+            "first_divergence": first,
+        }
+
+
+def _align(base: Columns, head: Columns) -> Tuple[Columns, Columns, int, int]:
+    """Restrict both scenarios to their common epochs (in base order)."""
+    if base["epoch"] == head["epoch"]:
+        return base, head, 0, 0
+    head_index = {epoch: i for i, epoch in enumerate(head["epoch"])}
+    base_rows = [i for i, epoch in enumerate(base["epoch"]) if epoch in head_index]
+    head_rows = [head_index[base["epoch"][i]] for i in base_rows]
+    only_base = len(base["epoch"]) - len(base_rows)
+    only_head = len(head["epoch"]) - len(head_rows)
+    take = lambda columns, rows: {n: array("d", map(c.__getitem__, rows)) for n, c in columns.items()}  # noqa: E731
+    return take(base, base_rows), take(head, head_rows), only_base, only_head
+
+
+def diff_runs(
+    base_dir: Path,
+    head_dir: Path,
+    abs_tol: float = DEFAULT_ABS_TOL,
+    rel_tol: float = DEFAULT_REL_TOL,
+    ignore: Sequence[str] = (),
+) -> dict:
+    """Drift report between two run directories; `report["passed"]` is the verdict."""
+    base_names, base_runs = load_timeseries(Path(base_dir) / TIMESERIES_FILE)
+    head_names, head_groups = _scenario_groups(Path(head_dir) / TIMESERIES_FILE)
+    skipped = set(ignore) | {"epoch"}
+    columns = [n for n in base_names if n in head_names and n not in skipped]
+    drift = {name: _ColumnDrift() for name in columns}
+    scenario_drift: Dict[str, dict] = {}
+    seen: set = set()
+    matched: set = set()
+    cells = 0
+
+    for scenario, head in head_groups:
+        if scenario in seen:
+            raise ValueError(f"{head_dir}: rows for scenario {scenario!r} are not contiguous")
+        seen.add(scenario)
+        base = base_runs.pop(scenario, None)
+        if base is None:
+            continue
+        matched.add(scenario)
+        base, head, only_base, only_head = _align(base, head)
+        epochs = base["epoch"]
+        cells += len(epochs) * len(columns)
+        first_epoch = None
+        diverged: List[str] = []
+        for name in columns:
+            b, h = base[name], head[name]
+            if b == h:
+                continue
+            stats = drift[name]
+            column_first = None
+            for i, (x, y) in enumerate(zip(b, h)):
+                if x == y:
+                    continue
+                delta = abs(y - x)
+                stats.changed_cells += 1
+                if delta > stats.max_abs:
+                    stats.max_abs = delta
+                if x and delta / abs(x) > stats.max_rel:
+                    stats.max_rel = delta / abs(x)
+                if delta > abs_tol + rel_tol * abs(x):
+                    stats.divergent_cells += 1
+                    if column_first is None:
+                        column_first = epochs[i]
+            if column_first is not None:
+                diverged.append(name)
+                if stats.first is None:
+                    stats.first = (scenario, column_first)
+                if first_epoch is None or column_first < first_epoch:
+                    first_epoch = column_first
+        if diverged or only_base or only_head:
+            scenario_drift[scenario] = {
+                "first_divergence_epoch": None if first_epoch is None else _number(first_epoch),
+                "columns": diverged,
+                "epochs_only_base": only_base,
+                "epochs_only_head": only_head,
+            }
+
+    only_head_scenarios = sorted(seen - matched)
+    summary_deltas = _summary_deltas(
+        load_summaries(Path(base_dir) / COMPARISON_FILE),
+        load_summaries(Path(head_dir) / COMPARISON_FILE),
+        abs_tol,
+        rel_tol,
+        skipped,
+    )
+    report = {
+        "base": str(base_dir),
+        "head": str(head_dir),
+        "tolerance": {"abs": abs_tol, "rel": rel_tol},
+        "cells_compared": cells,
+        "scenarios": {
+            "compared": len(matched),
+            "only_base": sorted(base_runs),
+            "only_head": only_head_scenarios,
+        },
+        "columns": {
+            "only_base": [n for n in base_names if n not in head_names],
+            "only_head": [n for n in head_names if n not in base_names],
+            "drift": {name: stats.to_dict() for name, stats in drift.items() if stats.changed_cells},
+        },
+        "scenario_drift": scenario_drift,
+        "summary_deltas": summary_deltas,
+    }
+    report["passed"] = not (
+        report["scenarios"]["only_base"]
+        or only_head_scenarios
+        or report["columns"]["only_base"]
+        or report["columns"]["only_head"]
+        or scenario_drift
+        or any(delta["divergent"] for deltas in summary_deltas.values() for delta in deltas.values())
+    )
+    return report
+
+
+def _summary_deltas(
+    base: Dict[str, Dict[str, object]],
+    head: Dict[str, Dict[str, object]],
+    abs_tol: float,
+    rel_tol: float,
+    ignore: Iterable[str],
+) -> Dict[str, Dict[str, dict]]:
+    """Changed summary fields per scenario present in both runs."""
+    deltas: Dict[str, Dict[str, dict]] = {}
+    for key in base.keys() & head.keys():
+        changed: Dict[str, dict] = {}
+        for name, b in base[key].items():
+            h = head[key].get(name)
+            if name in ignore or h == b:
+                continue
+            if isinstance(b, float) and isinstance(h, float):
+                delta = h - b
+                changed[name] = {
+                    "base": _number(b),
+                    "head": _number(h),
+                    "delta": _number(delta),
+                    "rel": abs(delta) / abs(b) if b else None,
+                    "divergent": abs(delta) > abs_tol + rel_tol * abs(b),
+                }
+            else:
+                changed[name] = {"base": b, "head": h, "divergent": True}
+        if changed:
+            deltas[key] = changed
+    return dict(sorted(deltas.items()))
+
+
+def _number(value: float) -> float | int:
+    return int(value) if float(value).is_integer() else value
+
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, separators=(",", ":"), sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Diff two bootstrap-world run directories.")
+    parser.add_argument("base", type=Path, help="Reference run directory.")
+    parser.add_argument("head", type=Path, help="Run directory to compare against it.")
+    parser.add_argument("--abs-tol", type=float, default=DEFAULT_ABS_TOL)
+    parser.add_argument("--rel-tol", type=float, default=DEFAULT_REL_TOL)
+    parser.add_argument(
+        "--ignore", action="append", default=[], help="Column or summary field to leave out (repeatable)."
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Write the full report as compact JSON.")
+    parser.add_argument("--top", type=int, default=10, help="Drifting columns to print.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    report = diff_runs(args.base, args.head, args.abs_tol, args.rel_tol, args.ignore)
+    if args.out is not None:
+        write_report(report, args.out)
+
+    scenarios, columns = report["scenarios"], report["columns"]
+    print(f"scenarios_compared={scenarios['compared']}")
+    print(f"cells_compared={report['cells_compared']}")
+    for label in ("only_base", "only_head"):
+        if scenarios[label]:
+            print(f"scenarios_{label}={','.join(scenarios[label])}")
+        if columns[label]:
+            print(f"columns_{label}={','.join(columns[label])}")
+    ranked = sorted(columns["drift"].items(), key=lambda item: (-item[1]["divergent_cells"], -item[1]["max_abs"]))
+    for name, stats in ranked[: args.top]:
+        first = stats["first_divergence"]
+        where = f" first={first['scenario']}@{first['epoch']}" if first else ""
+        print(
+            f"drift {name}: max_abs={stats['max_abs']} max_rel={stats['max_rel']:.3g} "
+            f"divergent={stats['divergent_cells']}/{stats['changed_cells']}{where}"
+        )
+    changed = sum(len(fields) for fields in report["summary_deltas"].values())
+    print(f"diverged_scenarios={len(report['scenario_drift'])}")
+    print(f"summary_fields_changed={changed}")
+    if args.out is not None:
+        print(f"out={args.out}")
+    print(f"passed={str(report['passed']).lower()}")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Resource-sharing revenue flows for the bootstrap world simulator.
+
+Harvest output on an owner's resources is split among grantees by share
+rules (`sharing_manager.cairo`, settled in `harvesting_manager_contract.cairo`).
+Here the rules are a sparse owner x grantee matrix of share bp:
+
+- Every minted adventurer gets a slot, and the runner's deaths kill random
+  live slots (`churn`); slots are never reused. Dead owners harvest nothing,
+  but dead grantees keep the rules that name them, so shares routed to them
+  are stranded (the contract does not check recipient liveness). `step`
+  returns the stranded energy, which the runner takes out of circulation;
+  shares between live adventurers only move income.
+- A policy owner sets rules at any of the global, hex and area scopes, each
+  with up to `SHARE_RECIPIENT_LIMIT` live recipients and at most 10000 bp in
+  total (`can_add_share`). Harvest is settled against the nearest enabled
+  scope (`nearest_scope_level`); policy mutations toggle scopes every epoch.
+- Each epoch the shareable extraction (the harvester, not miner, share) is
+  split over live slots by fixed harvest weights, and every paying rule gets
+  `bp` of its owner's gross. The owner keeps the residual. Total rule bp never
+  exceeds 10000 and owners never name themselves, so the contract's cap at the
+  actor's remaining quantity never binds.
+
+Every payout is `harvest / live weight` times a fixed per-rule coefficient
+(owner weight x bp), so settlement never visits rules or owners. The layer
+keeps the cumulative harvest per unit of weight plus two coefficient sums:
+over paying rules, and over those naming dead grantees. An epoch costs O(1)
+plus the rules touched by mutations, deaths and mints. A rule's payout is the
+cumulative rate over the epochs it paid times its coefficient, closed when it
+stops paying, and slot income is read the same way. Payouts are unfloored:
+the contract's `alloc_from_bp_floor_u32` floors each settlement, which takes
+less than one energy per paying rule per epoch.
+
+Recipient capacity caps (`max_weight`) are not modelled: energy stands in for
+the shared item quantities.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List
+
+try:
+    from .kpi_stream import ConcentrationIndex
+except ImportError:  # loaded as a top-level module by `python3 game/sim/bootstrap_world_sim.py`
+    from kpi_stream import ConcentrationIndex
+
+BP_DEN = 10_000
+SHARE_RECIPIENT_LIMIT = 8
+
+# sharing_math.cairo scope levels; rules are stored per scope at index level - 1.
+SCOPE_NONE, SCOPE_GLOBAL, SCOPE_HEX, SCOPE_AREA = 0, 1, 2, 3
+SCOPE_NAMES = ("none", "global", "hex", "area")
+
+
+def nearest_scope_level(area_active: bool, hex_active: bool, global_active: bool) -> int:
+    if area_active:
+        return SCOPE_AREA
+    if hex_active:
+        return SCOPE_HEX
+    return SCOPE_GLOBAL if global_active else SCOPE_NONE
+
+
+@dataclass(frozen=True)
+class SharingModel:
+    """Factory for per-scenario sharing matrices (`ScenarioRunner(sharing_model=...)`)."""
+
+    seed: int = 23
+    # Share of adventurers that run a sharing policy, and each scope's odds of
+    # carrying rules for such an owner.
+    policy_bp: int = 3_500
+    global_scope_bp: int = 7_000
+    hex_scope_bp: int = 3_000
+    area_scope_bp: int = 2_000
+    max_recipients: int = 4
+    min_share_bp: int = 100
+    max_share_bp: int = 1_500
+    # Recipient picked in proportion to how many rules already name it
+    # (guilds, hubs) instead of uniformly.
+    preferential_bp: int = 3_000
+    # Policy owners flipping one scope's enabled flag per epoch.
+    mutation_bp: int = 50
+    # Log-normal spread of per-adventurer harvest output.
+    harvest_sigma: float = 0.6
+
+    def for_scenario(self, scenario, config) -> "SharingMatrix":
+        return SharingMatrix(self, initial_adventurers=max(0, scenario.initial_active_adventurers))
+
+
+class SharingMatrix:
+    """Share rules in flat owner-major arrays, settled through coefficient sums."""
+
+    def __init__(self, model: SharingModel, initial_adventurers: int) -> None:
+        self.model = model
+        self._rng = random.Random(model.seed)
+        # Cumulative harvest per unit of live weight.
+        self._rate = 0.0
+        # Per slot: harvest weight, policy rank (-1 if none), position in
+        # `_live` (-1 once dead) and the cumulative rate at birth and death.
+        self.weight = array("l")
+        self._rank_of = array("l")
+        self._live_pos = array("l")
+        self._born_at: List[float] = []
+        self._died_at: List[float] = []
+        self._live: List[int] = []
+        self._live_weight = 0
+        # Per policy owner (by rank): slot, enabled scopes (bit level - 1) and
+        # the scope its harvest settles at.
+        self.owners = array("l")
+        self.enabled = bytearray()
+        self._level = bytearray()
+        self._scope_weight = [0] * len(SCOPE_NAMES)
+        # Per rule, owner-major: owner rank, grantee slot, share bp, scope level,
+        # the rate when it started paying (-1 while not paying) and its closed payout.
+        self.rule_owner = array("l")
+        self.grantee = array("l")
+        self.share_bp = array("l")
+        self.scope = array("b")
+        self._since: List[float] = []
+        self._closed: List[float] = []
+        self.owner_ptr = array("l", [0])
+        self._naming: Dict[int, List[int]] = {}
+        # Sums of owner weight x bp over paying rules, and over those naming dead slots.
+        self._paying = 0
+        self._stranding = 0
+        self._stranded_carry = 0.0
+
+        self.total_gross = 0
+        self.total_shared = 0.0
+        self.total_stranded = 0
+        self.gross_by_scope = [0.0] * len(SCOPE_NAMES)
+        self.mutations = 0
+        self.deaths = 0
+        self._mint(initial_adventurers)
+
+    @property
+    def slots(self) -> int:
+        return len(self.weight)
+
+    @property
+    def live_slots(self) -> int:
+        return len(self._live)
+
+    @property
+    def live_rules(self) -> int:
+        return sum(since >= 0 for since in self._since)
+
+    def _mint(self, count: int) -> None:
+        model, rng = self.model, self._rng
+        first = self.slots
+        # Recipients must already be alive: the initial world at once, later
+        # mints from the slots alive before them (the head of `_live`).
+        pool = len(self._live) if first else count
+        for slot in range(first, first + count):
+            weight = max(1, round(1_000 * rng.lognormvariate(0.0, model.harvest_sigma)))
+            self.weight.append(weight)
+            self._rank_of.append(-1)
+            self._live_pos.append(len(self._live))
+            self._live.append(slot)
+            self._born_at.append(self._rate)
+            self._died_at.append(-1.0)
+            self._live_weight += weight
+        for slot in range(first, first + count):
+            if pool < 2 or rng.random() * BP_DEN >= model.policy_bp:
+                continue
+            rank = len(self.owners)
+            self.owners.append(slot)
+            self._rank_of[slot] = rank
+            flags = 0
+            for level, odds in (
+                (SCOPE_GLOBAL, model.global_scope_bp),
+                (SCOPE_HEX, model.hex_scope_bp),
+                (SCOPE_AREA, model.area_scope_bp),
+            ):
+                if rng.random() * BP_DEN < odds:
+                    flags |= 1 << (level - 1)
+                    self._add_rules(rank, slot, level, pool)
+            self.enabled.append(flags)
+            self._level.append(SCOPE_NONE)
+            self.owner_ptr.append(len(self.grantee))
+            self._route(rank)
+
+    def _add_rules(self, rank: int, slot: int, level: int, pool: int) -> None:
+        model, rng = self.model, self._rng
+        named = set()
+        total = 0
+        for _ in range(rng.randint(1, min(model.max_recipients, SHARE_RECIPIENT_LIMIT))):
+            if self.grantee and rng.random() * BP_DEN < model.preferential_bp:
+                grantee = self.grantee[rng.randrange(len(self.grantee))]
+            else:
+                grantee = self._live[rng.randrange(pool)]
+            share = rng.randint(model.min_share_bp, model.max_share_bp)
+            if self._live_pos[grantee] < 0 or grantee == slot or grantee in named or total + share > BP_DEN:
+                continue  # can_add_share, or a hub that has died
+            named.add(grantee)
+            total += share
+            self._naming.setdefault(grantee, []).append(len(self.grantee))
+            self.rule_owner.append(rank)
+            self.grantee.append(grantee)
+            self.share_bp.append(share)
+            self.scope.append(level)
+            self._since.append(-1.0)
+            self._closed.append(0.0)
+
+    def _set_paying(self, rule: int, paying: bool) -> None:
+        since = self._since[rule]
+        if paying == (since >= 0):
+            return
+        coefficient = self.weight[self.owners[self.rule_owner[rule]]] * self.share_bp[rule]
+        stranding = self._live_pos[self.grantee[rule]] < 0
+        if paying:
+            self._since[rule] = self._rate
+        else:
+            self._closed[rule] += coefficient * (self._rate - since) / BP_DEN
+            self._since[rule] = -1.0
+            coefficient = -coefficient
+        self._paying += coefficient
+        if stranding:
+            self._stranding += coefficient
+
+    def _route(self, rank: int) -> None:
+        """Make the owner's rules at its nearest enabled scope the paying ones."""
+        flags, slot = self.enabled[rank], self.owners[rank]
+        alive = self._live_pos[slot] >= 0
+        level = nearest_scope_level(bool(flags & 4), bool(flags & 2), bool(flags & 1)) if alive else SCOPE_NONE
+        previous = self._level[rank]
+        if level == previous:
+            return
+        if previous != SCOPE_NONE:
+            self._scope_weight[previous] -= self.weight[slot]
+        if level != SCOPE_NONE:
+            self._scope_weight[level] += self.weight[slot]
+        self._level[rank] = level
+        for rule in range(self.owner_ptr[rank], self.owner_ptr[rank + 1]):
+            self._set_paying(rule, self.scope[rule] == level)
+
+    def _mutate(self) -> None:
+        owners, rng = self.owners, self._rng
+        for _ in range(len(owners) * self.model.mutation_bp // BP_DEN):
+            rank = rng.randrange(len(owners))
+            self.enabled[rank] ^= 1 << rng.randrange(3)
+            self._route(rank)
+            self.mutations += 1
+
+    def _kill(self, count: int) -> None:
+        """Kill `count` random live slots."""
+        live, live_pos, rng = self._live, self._live_pos, self._rng
+        for _ in range(min(count, len(live))):
+            pos = rng.randrange(len(live))
+            slot = live[pos]
+            live[pos] = live[-1]
+            live_pos[live[pos]] = pos
+            live.pop()
+            live_pos[slot] = -1
+            self._died_at[slot] = self._rate
+            self._live_weight -= self.weight[slot]
+            self.deaths += 1
+            for rule in self._naming.get(slot, ()):
+                if self._since[rule] >= 0:
+                    self._stranding += self.weight[self.owners[self.rule_owner[rule]]] * self.share_bp[rule]
+            if self._rank_of[slot] >= 0:
+                self._route(self._rank_of[slot])
+
+    def churn(self, *, minted: int, deaths: int) -> None:
+        """Apply an epoch's deaths to random live slots, then add its mints as new slots."""
+        self._kill(max(0, deaths))
+        self._mint(max(0, minted))
+
+    def step(self, *, extraction_energy: int, miner_share_bp: int) -> int:
+        """Settle one epoch of harvest sharing; return the energy stranded on dead grantees."""
+        self._mutate()
+        harvest = extraction_energy * (BP_DEN - miner_share_bp) // BP_DEN
+        if harvest <= 0 or self._live_weight <= 0:
+            return 0
+        rate = harvest / self._live_weight
+        self._rate += rate
+        self.total_gross += harvest
+        self.total_shared += rate * self._paying / BP_DEN
+        for level in (SCOPE_GLOBAL, SCOPE_HEX, SCOPE_AREA):
+            self.gross_by_scope[level] += rate * self._scope_weight[level]
+        owed = self._stranded_carry + rate * self._stranding / BP_DEN
+        stranded = int(owed)
+        self._stranded_carry = owed - stranded
+        self.total_stranded += stranded
+        return stranded
+
+    def rule_paid(self) -> List[int]:
+        """Energy each rule has paid its grantee so far."""
+        rate = self._rate
+        return [
+            round(closed + (self.weight[self.owners[owner]] * bp * (rate - since) / BP_DEN if since >= 0 else 0.0))
+            for closed, since, owner, bp in zip(self._closed, self._since, self.rule_owner, self.share_bp)
+        ]
+
+    def gross_income(self) -> List[int]:
+        """Harvest per slot so far, from the weighted split before flooring."""
+        rate = self._rate
+        return [
+            round(w * ((died if died >= 0 else rate) - born))
+            for w, born, died in zip(self.weight, self._born_at, self._died_at)
+        ]
+
+    def net_income(self) -> List[int]:
+        """Gross harvest less shares paid out plus shares received, per slot."""
+        net = self.gross_income()
+        owners, rule_owner = self.owners, self.rule_owner
+        for rule, energy in enumerate(self.rule_paid()):
+            net[owners[rule_owner[rule]]] -= energy
+            net[self.grantee[rule]] += energy
+        return net
+
+    def metrics(self) -> Dict[str, float]:
+        in_degree: Dict[int, int] = {}
+        for grantee in self.grantee:
+            in_degree[grantee] = in_degree.get(grantee, 0) + 1
+        policy_gross = sum(self.gross_by_scope) or 1
+        total_shared = round(self.total_shared)
+        metrics: Dict[str, float] = {
+            "slots": self.slots,
+            "live_slots": self.live_slots,
+            "deaths": self.deaths,
+            "policy_owners": len(self.owners),
+            "share_rules": len(self.grantee),
+            "live_rules": self.live_rules,
+            "dead_grantee_rules": sum(self._live_pos[grantee] < 0 for grantee in self.grantee),
+            "max_rules_per_grantee": max(in_degree.values(), default=0),
+            "policy_mutations": self.mutations,
+            "gross_energy": self.total_gross,
+            "shared_energy": total_shared,
+            "shared_bp": total_shared * BP_DEN // (self.total_gross or 1),
+            "stranded_energy": self.total_stranded,
+        }
+        for level in (SCOPE_GLOBAL, SCOPE_HEX, SCOPE_AREA):
+            metrics[f"{SCOPE_NAMES[level]}_scope_gross_bp"] = int(self.gross_by_scope[level] * BP_DEN / policy_gross)
+        for label, income in (("gross", self.gross_income()), ("net", self.net_income())):
+            index = ConcentrationIndex()
+            for slot, energy in enumerate(income):
+                if energy > 0:
+                    index.add(slot, energy)
+            top = sorted(income, reverse=True)[: max(1, len(income) // 100)]
+            metrics[f"{label}_income_gini_bp"] = index.gini_bp
+            metrics[f"{label}_income_hhi_bp"] = index.hhi_bp
+            metrics[f"{label}_income_top1pct_bp"] = sum(top) * BP_DEN // (index.total or 1)
+        return metrics
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Local simulation service around `ScenarioRunner`.
+
+Keeps an interpreter warm so dashboards and explorer tooling can ask what-if
+questions without paying process startup per call.
+
+Endpoints (JSON in, NDJSON out, streamed with chunked transfer encoding):
+
+- `POST /scenario` `{"scenario": {...}, "config": {...}}`
+- `POST /sweep` `{"scenarios": [{...}, ...], "config": {...}}`
+- `GET /health`
+
+A scenario spec is `{"base": "<default scenario key>", ...overrides}`; any
+`Scenario` field can be overridden. `config` overrides `SimConfig` fields.
+
+Each response streams `row` messages (one per epoch, with progress), a
+`summary` message per scenario and a final `done` message. Identical requests
+that arrive while a matching job is still running attach to that job instead
+of starting another run. A job keeps only its most recent messages, and the
+service forgets it once it finishes; a subscriber that falls behind gets a
+`gap` message counting what it missed.
+
+Run with `python3 -m game.sim.sim_service --port 8765` (or `python3 game/sim/sim_service.py`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import threading
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Iterator, List, Tuple
+
+try:
+    from .bootstrap_world_sim import (
+        Scenario,
+        ScenarioRunner,
+        SimConfig,
+        config_from_dict,
+        scenario_from_spec,
+    )
+except ImportError:  # loaded as a top-level module by `python3 game/sim/sim_service.py`
+    from bootstrap_world_sim import (
+        Scenario,
+        ScenarioRunner,
+        SimConfig,
+        config_from_dict,
+        scenario_from_spec,
+    )
+
+
+# Messages each job keeps for its subscribers: a 52-week scenario streams 4368 rows.
+DEFAULT_HISTORY = 8_192
+
+
+class ServiceBusy(RuntimeError):
+    pass
+
+
+def _encode(message: dict) -> bytes:
+    return (json.dumps(message, sort_keys=True) + "\n").encode("utf-8")
+
+
+class SimJob:
+    """Bounded NDJSON message ring shared by every subscriber of a request.
+
+    Only the last `history` messages are kept. A subscriber that falls further
+    behind (or attaches late to a long job) receives a `gap` message with the
+    number of messages it missed, then continues from the oldest one kept.
+    """
+
+    def __init__(self, key: str, history: int = DEFAULT_HISTORY) -> None:
+        self.key = key
+        self._messages: Deque[bytes] = deque(maxlen=history)
+        self._published = 0
+        self._done = False
+        self._cond = threading.Condition()
+
+    def publish(self, message: dict) -> None:
+        line = _encode(message)
+        with self._cond:
+            self._messages.append(line)
+            self._published += 1
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._done = True
+            self._cond.notify_all()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def stream(self) -> Iterator[bytes]:
+        """Yield messages from the oldest one kept, blocking until the job closes."""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= self._published and not self._done:
+                    self._cond.wait()
+                oldest = self._published - len(self._messages)
+                skipped = max(0, oldest - index)
+                pending = list(itertools.islice(self._messages, index + skipped - oldest, None))
+                finished = self._done
+            if skipped:
+                yield _encode({"type": "gap", "dropped": skipped})
+            index += skipped + len(pending)
+            yield from pending
+            if finished and not pending:
+                return
+
+
+class SimulationService:
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, history: int = DEFAULT_HISTORY) -> None:
+        self._history = history
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sim-worker")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, SimJob] = {}
+        self.runs_started = 0
+        self.dedup_hits = 0
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def submit(self, payload: dict) -> Tuple[SimJob, bool]:
+        """Return the job for `payload` and whether this call created it."""
+        config, scenarios = self._parse(payload)
+        key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                self.dedup_hits += 1
+                return job, False
+            if not self._slots.acquire(blocking=False):
+                raise ServiceBusy("simulation queue is full")
+            job = SimJob(key, self._history)
+            self._in_flight[key] = job
+            self.runs_started += 1
+
+        self._pool.submit(self._run, job, config, scenarios)
+        return job, True
+
+    def _run(self, job: SimJob, config: SimConfig, scenarios: List[Scenario]) -> None:
+        try:
+            runner = ScenarioRunner(config)
+            for index, scenario in enumerate(scenarios):
+                epochs = max(1, scenario.weeks * config.epochs_per_week)
+
+                def emit(row: Mapping, epochs: int = epochs, index: int = index) -> None:
+                    job.publish(
+                        {
+                            "type": "row",
+                            "scenario_index": index,
+                            "progress": round(row["epoch"] / epochs, 6),
+                            "row": dict(row),
+                        }
+                    )
+
+                result = runner.run_scenario(scenario, on_epoch=emit)
+                job.publish(
+                    {
+                        "type": "summary",
+                        "scenario_index": index,
+                        "summary": asdict(result.summary),
+                        "invariant_violations": result.invariant_violations,
+                    }
+                )
+            job.publish({"type": "done", "scenario_count": len(scenarios)})
+        except Exception as exc:  # surfaced to every subscriber instead of a dead stream
+            job.publish({"type": "error", "error": str(exc)})
+        finally:
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+            self._slots.release()
+            job.close()
+
+    def _parse(self, payload: dict) -> Tuple[SimConfig, List[Scenario]]:
+        config = config_from_dict(payload.get("config", {}))
+        if "scenarios" in payload:
+            specs = payload["scenarios"]
+        elif "scenario" in payload:
+            specs = [payload["scenario"]]
+        else:
+            raise ValueError("request needs `scenario` or `scenarios`")
+        if not specs:
+            raise ValueError("request has no scenarios")
+        return config, [scenario_from_spec(spec) for spec in specs]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: SimulationService
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        service = self.service
+        self._send_json(
+            HTTPStatus.OK,
+            {"ok": True, "runs_started": service.runs_started, "dedup_hits": service.dedup_hits},
+        )
+
+    def do_POST(self) -> None:
+        if self.path not in ("/scenario", "/sweep"):
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            if self.path == "/sweep" and "scenarios" not in payload:
+                raise ValueError("/sweep needs `scenarios`")
+            job, _ = self.service.submit(payload)
+        except ServiceBusy as exc:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)})
+            return
+        except (ValueError, TypeError) as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for line in job.stream():
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, status: HTTPStatus, body: dict) -> None:
+        data = (json.dumps(body, sort_keys=True) + "\n").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    service: SimulationService | None = None,
+) -> ThreadingHTTPServer:
+    handler = type("SimHandler", (_Handler,), {"service": service or SimulationService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve warm ScenarioRunner simulations over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent simulation runs.")
+    parser.add_argument("--max-pending", type=int, default=16, help="Queued runs before 503.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    service = SimulationService(max_workers=args.workers, max_pending=args.max_pending)
+    server = make_server(args.host, args.port, service)
+    print(f"listening=http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
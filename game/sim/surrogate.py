@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Regression surrogate for interactive what-if queries over scenario knobs.
+
+A full `run_scenario` is far too slow behind a slider, so this module fits a
+polynomial ridge regression from sweep results (`Scenario` knobs ->
+`ScenarioSummary` metrics) and answers batched queries from the fitted
+weights:
+
+- Knobs are scaled to [-1, 1] over the training range. The basis is every
+  monomial of the scaled knobs up to `degree` (2 by default: 91 terms for the
+  12 knobs), shared by all targets, so one Cholesky factorisation fits every
+  metric.
+- `fit_surrogate` holds out a seeded share of the samples, reports per-metric
+  RMSE, MAE and R^2 on it, then refits on everything for the stored model.
+- The model file is one compact JSON document (ranges, weights, held-out
+  error), about 10 KB for the full knob set, and needs nothing but this module
+  to load.
+- Every answer says whether the query fell inside the training box. Answers
+  flagged out of range are extrapolations and should be re-run through the
+  simulator.
+
+Usage:
+
+```bash
+python3 -m game.sim.surrogate specs --count 400 --out surrogate-specs.json
+python3 -m game.sim.sweep_queue enqueue --queue-dir /mnt/sweep --specs surrogate-specs.json
+python3 -m game.sim.sweep_queue worker --queue-dir /mnt/sweep
+python3 -m game.sim.surrogate fit --queue-dir /mnt/sweep --out game/sim/out/surrogate.json
+python3 -m game.sim.surrogate query --model game/sim/out/surrogate.json --specs what-if.json
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+from dataclasses import asdict, dataclass
+from itertools import combinations_with_replacement
+from operator import mul
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+try:
+    from .bootstrap_world_sim import Scenario, ScenarioResult, build_default_scenarios, scenario_from_spec
+except ImportError:  # loaded as a top-level module by `python3 game/sim/surrogate.py`
+    from bootstrap_world_sim import Scenario, ScenarioResult, build_default_scenarios, scenario_from_spec
+
+FORMAT = "fractales-surrogate/1"
+
+# Scenario fields the surrogate takes as inputs.
+KNOBS = (
+    "weeks",
+    "demand_shock_bp",
+    "supply_shock_bp",
+    "conversion_tax_override_bp",
+    "collapse_shock_prob_bp",
+    "raider_share_bp",
+    "dca_sell_pressure_bp",
+    "initial_surplus_pool",
+    "initial_price_usdc_per_energy",
+    "initial_energy_supply",
+    "initial_active_adventurers",
+    "initial_controlled_hexes",
+)
+# ScenarioSummary fields the surrogate predicts.
+TARGETS = (
+    "final_active_adventurers",
+    "final_controlled_hexes",
+    "final_energy_supply",
+    "final_surplus_pool",
+    "final_twap_usdc_per_energy",
+    "total_new_hexes",
+    "total_minted_adventurers",
+    "total_deaths",
+    "locked_capital_energy",
+    "total_energy_sources",
+    "total_energy_sinks",
+    "sink_source_ratio",
+    "net_inflation_pct",
+)
+
+
+@dataclass(frozen=True)
+class Answer:
+    metrics: Dict[str, float]
+    # Knobs outside the training range; empty means the answer interpolates.
+    out_of_range: Tuple[str, ...]
+
+    @property
+    def in_range(self) -> bool:
+        return not self.out_of_range
+
+
+class Surrogate:
+    """Fitted polynomial ridge model over `KNOBS` -> `TARGETS`."""
+
+    def __init__(
+        self,
+        *,
+        degree: int,
+        lower: Sequence[float],
+        upper: Sequence[float],
+        weights: Mapping[str, Sequence[float]],
+        holdout: Mapping[str, Mapping[str, float]] | None = None,
+        samples: int = 0,
+    ) -> None:
+        if len(lower) != len(KNOBS) or len(upper) != len(KNOBS):
+            raise ValueError(f"expected {len(KNOBS)} knob bounds")
+        self.degree = degree
+        self.lower = list(lower)
+        self.upper = list(upper)
+        self.samples = samples
+        self.holdout = {name: dict(err) for name, err in (holdout or {}).items()}
+        # Knobs that never varied in training carry no signal and stay out of the basis.
+        self._active = [i for i in range(len(KNOBS)) if upper[i] > lower[i]]
+        self._steps = _basis_steps(len(self._active), degree)
+        self.weights = {name: list(weights[name]) for name in TARGETS}
+        for name, row in self.weights.items():
+            if len(row) != len(self._steps) + 1:
+                raise ValueError(f"{name}: expected {len(self._steps) + 1} weights, got {len(row)}")
+        self._rows = [self.weights[name] for name in TARGETS]
+        self._offset = [lower[i] for i in self._active]
+        self._scale = [2.0 / (upper[i] - lower[i]) for i in self._active]
+
+    def predict(self, points: Iterable[Sequence[float]]) -> List[List[float]]:
+        """Raw predictions (in `TARGETS` order) for knob vectors in `KNOBS` order."""
+        rows = self._rows
+        out = []
+        for point in points:
+            phi = self._basis(point)
+            out.append([sum(map(mul, row, phi)) for row in rows])
+        return out
+
+    def out_of_range(self, point: Sequence[float]) -> Tuple[str, ...]:
+        return tuple(
+            KNOBS[i] for i, (lo, hi) in enumerate(zip(self.lower, self.upper)) if not lo <= point[i] <= hi
+        )
+
+    def query(self, scenarios: Iterable[Scenario | Mapping]) -> List[Answer]:
+        """Answer scenarios or `scenario_from_spec` specs, flagging extrapolation."""
+        points = [knob_vector(s if isinstance(s, Scenario) else scenario_from_spec(dict(s))) for s in scenarios]
+        return [
+            Answer(dict(zip(TARGETS, values)), self.out_of_range(point))
+            for point, values in zip(points, self.predict(points))
+        ]
+
+    def _basis(self, point: Sequence[float]) -> List[float]:
+        z = [(point[i] - o) * s - 1.0 for i, o, s in zip(self._active, self._offset, self._scale)]
+        phi = [1.0]
+        for parent, knob in self._steps:
+            phi.append(phi[parent] * z[knob])
+        return phi
+
+    def to_dict(self) -> dict:
+        return {
+            "format": FORMAT,
+            "degree": self.degree,
+            "knobs": list(KNOBS),
+            "lower": self.lower,
+            "upper": self.upper,
+            "samples": self.samples,
+            "holdout": self.holdout,
+            "weights": self.weights,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping) -> "Surrogate":
+        if payload.get("format") != FORMAT:
+            raise ValueError(f"unsupported surrogate format: {payload.get('format')!r}")
+        if list(payload["knobs"]) != list(KNOBS):
+            raise ValueError("surrogate was trained on a different knob set")
+        return cls(
+            degree=payload["degree"],
+            lower=payload["lower"],
+            upper=payload["upper"],
+            weights=payload["weights"],
+            holdout=payload["holdout"],
+            samples=payload["samples"],
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), separators=(",", ":"), sort_keys=True) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "Surrogate":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def knob_vector(scenario: Scenario) -> List[float]:
+    return [float(getattr(scenario, name)) for name in KNOBS]
+
+
+def fit_surrogate(
+    results: Sequence[ScenarioResult],
+    *,
+    degree: int = 2,
+    ridge: float = 1e-4,
+    holdout: float = 0.2,
+    seed: int = 0,
+) -> Surrogate:
+    """Fit on `results`, scoring a held-out share first when `holdout` > 0."""
+    if degree < 1:
+        raise ValueError("degree must be >= 1")
+    if ridge < 0:
+        raise ValueError("ridge must be >= 0")
+    if not 0 <= holdout < 1:
+        raise ValueError("holdout must be in [0, 1)")
+    points = [knob_vector(r.scenario) for r in results]
+    values = [[float(getattr(r.summary, name)) for name in TARGETS] for r in results]
+
+    errors: Dict[str, Dict[str, float]] = {}
+    held = int(len(results) * holdout)
+    if held:
+        order = list(range(len(results)))
+        random.Random(seed).shuffle(order)
+        test, train = order[:held], order[held:]
+        model = _fit([points[i] for i in train], [values[i] for i in train], degree, ridge)
+        errors = _errors(model.predict([points[i] for i in test]), [values[i] for i in test])
+    model = _fit(points, values, degree, ridge)
+    model.holdout = errors
+    return model
+
+
+def sample_specs(
+    count: int,
+    *,
+    seed: int = 0,
+    bounds: Mapping[str, Tuple[float, float]] | None = None,
+) -> List[dict]:
+    """Latin hypercube of `count` specs over `bounds` (default: the matrix envelope).
+
+    Knobs without bounds keep the `baseline_10k` value.
+    """
+    if bounds is None:
+        matrix = build_default_scenarios()
+        bounds = {
+            name: (min(getattr(s, name) for s in matrix), max(getattr(s, name) for s in matrix)) for name in KNOBS
+        }
+    baseline = build_default_scenarios()[0]
+    rng = random.Random(seed)
+    specs: List[dict] = [{"base": "baseline_10k", "key": f"surrogate_{i:05d}"} for i in range(count)]
+    for name, (lo, hi) in bounds.items():
+        if name not in KNOBS:
+            raise ValueError(f"unknown knob: {name}")
+        is_int = isinstance(getattr(baseline, name), int)
+        strata = list(range(count))
+        rng.shuffle(strata)
+        for spec, stratum in zip(specs, strata):
+            value = lo + (hi - lo) * (stratum + rng.random()) / count
+            spec[name] = int(round(value)) if is_int else value
+    return specs
+
+
+def _basis_steps(width: int, degree: int) -> List[Tuple[int, int]]:
+    """Monomials as `(parent term index, knob)`: term = parent term * z[knob]."""
+    index = {(): 0}
+    steps: List[Tuple[int, int]] = []
+    for d in range(1, degree + 1):
+        for combo in combinations_with_replacement(range(width), d):
+            steps.append((index[combo[:-1]], combo[-1]))
+            index[combo] = len(steps)
+    return steps
+
+
+def _fit(points: List[List[float]], values: List[List[float]], degree: int, ridge: float) -> Surrogate:
+    if not points:
+        raise ValueError("no samples to fit")
+    lower = [min(p[i] for p in points) for i in range(len(KNOBS))]
+    upper = [max(p[i] for p in points) for i in range(len(KNOBS))]
+    active = [i for i in range(len(KNOBS)) if upper[i] > lower[i]]
+    terms = len(_basis_steps(len(active), degree)) + 1
+    if len(points) < terms:
+        raise ValueError(f"{len(points)} samples cannot fit {terms} terms; sweep more or lower the degree")
+    shell = Surrogate(degree=degree, lower=lower, upper=upper, weights={name: [0.0] * terms for name in TARGETS})
+    basis = [shell._basis(p) for p in points]
+
+    # Normal equations (Phi^T Phi / n + ridge * I) w = Phi^T y / n; the intercept is not penalised.
+    n = len(points)
+    gram = [[sum(row[i] * row[j] for row in basis) / n for j in range(terms)] for i in range(terms)]
+    for i in range(1, terms):
+        gram[i][i] += ridge
+    factor = _cholesky(gram)
+    weights = {}
+    for t, name in enumerate(TARGETS):
+        rhs = [sum(row[i] * y[t] for row, y in zip(basis, values)) / n for i in range(terms)]
+        weights[name] = _cholesky_solve(factor, rhs)
+    return Surrogate(degree=degree, lower=lower, upper=upper, weights=weights, samples=n)
+
+
+def _cholesky(matrix: List[List[float]]) -> List[List[float]]:
+    size = len(matrix)
+    lower = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1):
+            total = matrix[i][j] - sum(lower[i][k] * lower[j][k] for k in range(j))
+            if i == j:
+                if total <= 0:
+                    raise ValueError("normal equations are singular; raise ridge")
+                lower[i][i] = math.sqrt(total)
+            else:
+                lower[i][j] = total / lower[j][j]
+    return lower
+
+
+def _cholesky_solve(lower: List[List[float]], rhs: List[float]) -> List[float]:
+    size = len(rhs)
+    y = [0.0] * size
+    for i in range(size):
+        y[i] = (rhs[i] - sum(lower[i][k] * y[k] for k in range(i))) / lower[i][i]
+    x = [0.0] * size
+    for i in reversed(range(size)):
+        x[i] = (y[i] - sum(lower[k][i] * x[k] for k in range(i + 1, size))) / lower[i][i]
+    return x
+
+
+def _errors(predicted: List[List[float]], actual: List[List[float]]) -> Dict[str, Dict[str, float]]:
+    errors = {}
+    for t, name in enumerate(TARGETS):
+        residuals = [p[t] - a[t] for p, a in zip(predicted, actual)]
+        center = sum(a[t] for a in actual) / len(actual)
+        spread = sum((a[t] - center) ** 2 for a in actual)
+        sse = sum(r * r for r in residuals)
+        errors[name] = {
+            "rmse": round(math.sqrt(sse / len(residuals)), 6),
+            "mae": round(sum(abs(r) for r in residuals) / len(residuals), 6),
+            "r2": round(1 - sse / spread, 6) if spread else 1.0,
+        }
+    return errors
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fit and query a regression surrogate of the scenario runner.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    specs = sub.add_parser("specs", help="Write a Latin hypercube of training specs for sweep_queue.")
+    specs.add_argument("--count", type=int, default=400)
+    specs.add_argument("--seed", type=int, default=0)
+    specs.add_argument("--out", type=Path, required=True)
+
+    fit = sub.add_parser("fit", help="Fit a surrogate from a finished sweep queue.")
+    fit.add_argument("--queue-dir", type=Path, required=True)
+    fit.add_argument("--out", type=Path, default=Path("game/sim/out/surrogate.json"))
+    fit.add_argument("--degree", type=int, default=2)
+    fit.add_argument("--ridge", type=float, default=1e-4)
+    fit.add_argument("--holdout", type=float, default=0.2)
+    fit.add_argument("--seed", type=int, default=0)
+
+    query = sub.add_parser("query", help="Answer a JSON list of scenario specs from a fitted surrogate.")
+    query.add_argument("--model", type=Path, required=True)
+    query.add_argument("--specs", type=Path, required=True)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.command == "specs":
+        args.out.write_text(json.dumps(sample_specs(args.count, seed=args.seed), indent=2) + "\n", encoding="utf-8")
+        print(f"specs={args.count}")
+    elif args.command == "fit":
+        try:
+            from .sweep_queue import load_results
+        except ImportError:  # loaded as a top-level module by `python3 game/sim/surrogate.py`
+            from sweep_queue import load_results
+
+        model = fit_surrogate(
+            load_results(args.queue_dir), degree=args.degree, ridge=args.ridge, holdout=args.holdout, seed=args.seed
+        )
+        model.save(args.out)
+        print(f"samples={model.samples}")
+        for name, err in model.holdout.items():
+            print(f"holdout.{name} rmse={err['rmse']} mae={err['mae']} r2={err['r2']}")
+        print(f"model={args.out}")
+    else:
+        model = Surrogate.load(args.model)
+        specs = json.loads(args.specs.read_text(encoding="utf-8"))
+        for answer in model.query(specs):
+            print(json.dumps(asdict(answer), sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
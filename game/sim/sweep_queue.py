@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Distributed sweep execution over a shared-filesystem work queue.
+
+Layout under `--queue-dir` (any directory every host can mount):
+
+```text
+manifest.json            SimConfig + shard count
+shards/shard-00000.json  scenario specs for one shard
+leases/shard-00000.lease owner token; mtime is the heartbeat
+results/shard-00000.json summaries + columnar timeseries, written atomically
+```
+
+Workers claim a shard by creating its lease with `O_EXCL`, touch the lease
+while running, and publish results with an atomic rename. A lease whose mtime
+is older than `lease_timeout` is treated as abandoned (worker killed or host
+gone): a worker renames it to a tombstone unique to that worker, checks the
+tombstone is still stale (another worker may have replaced the lease since the
+first check) and only then creates a fresh lease with `O_EXCL`. A fresh lease
+caught by the rename is linked back and the worker backs off. Results only
+appear once complete, so a killed worker never leaves a partial shard behind.
+`enqueue` first runs `cairo_parity.constant_drift` and refuses to start a sweep
+whose constants no longer match the Cairo sources (`--skip-parity` overrides).
+
+Usage:
+
+```bash
+python3 -m game.sim.sweep_queue enqueue --queue-dir /mnt/sweep --specs sweep.json
+python3 -m game.sim.sweep_queue worker --queue-dir /mnt/sweep   # on each host
+python3 -m game.sim.sweep_queue merge --queue-dir /mnt/sweep --out-dir game/sim/out/sweep
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    from .bootstrap_world_sim import (
+        Scenario,
+        ScenarioResult,
+        ScenarioRunner,
+        ScenarioSummary,
+        SimConfig,
+        Timeseries,
+        build_default_scenarios,
+        config_from_dict,
+        scenario_from_spec,
+    )
+except ImportError:  # loaded as a top-level module by `python3 game/sim/sweep_queue.py`
+    from bootstrap_world_sim import (
+        Scenario,
+        ScenarioResult,
+        ScenarioRunner,
+        ScenarioSummary,
+        SimConfig,
+        Timeseries,
+        build_default_scenarios,
+        config_from_dict,
+        scenario_from_spec,
+    )
+
+DEFAULT_LEASE_TIMEOUT_S = 60.0
+
+
+def enqueue_sweep(
+    queue_dir: Path,
+    scenarios: Sequence[Scenario],
+    config: SimConfig | None = None,
+    shard_size: int = 4,
+) -> int:
+    """Split scenarios into shard files and return the shard count."""
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    if (queue_dir / "manifest.json").exists():
+        raise FileExistsError(f"{queue_dir} already holds a sweep")
+    config = config or SimConfig()
+
+    for name in ("shards", "leases", "results"):
+        (queue_dir / name).mkdir(parents=True, exist_ok=True)
+
+    shard_count = 0
+    for start in range(0, len(scenarios), shard_size):
+        payload = {"scenarios": [asdict(s) for s in scenarios[start : start + shard_size]]}
+        _write_atomic(queue_dir / "shards" / f"{_shard_name(shard_count)}.json", payload)
+        shard_count += 1
+
+    config_payload = asdict(config)
+    config_payload["mode"] = config.mode.value
+    _write_atomic(
+        queue_dir / "manifest.json",
+        {"config": config_payload, "shard_count": shard_count},
+    )
+    return shard_count
+
+
+class SweepWorker:
+    def __init__(
+        self,
+        queue_dir: Path,
+        *,
+        worker_id: str | None = None,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT_S,
+        poll_interval: float = 0.5,
+    ) -> None:
+        self.queue_dir = queue_dir
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = max(0.05, lease_timeout / 4)
+        self.poll_interval = poll_interval
+
+        manifest = _read_json(queue_dir / "manifest.json")
+        self.shard_count = manifest["shard_count"]
+        self.runner = ScenarioRunner(config_from_dict(manifest["config"]))
+        self.completed: List[int] = []
+
+    def run(self) -> List[int]:
+        """Process shards until every shard has a result; return shards done here."""
+        while True:
+            pending = [i for i in range(self.shard_count) if not self._result_path(i).exists()]
+            if not pending:
+                return self.completed
+
+            claimed = next((i for i in pending if self._claim(i)), None)
+            if claimed is None:
+                time.sleep(self.poll_interval)
+                continue
+            self._process(claimed)
+
+    def _process(self, shard: int) -> None:
+        lease = self._lease_path(shard)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(lease, stop), daemon=True)
+        heartbeat.start()
+        try:
+            specs = _read_json(self.queue_dir / "shards" / f"{_shard_name(shard)}.json")
+            results = [self.runner.run_scenario(Scenario(**spec)) for spec in specs["scenarios"]]
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        # A stalled worker whose lease was taken over must not publish.
+        if self._lease_owner(lease) != self.worker_id:
+            return
+        _write_atomic(self._result_path(shard), _encode_results(results))
+        self.completed.append(shard)
+        try:
+            lease.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _claim(self, shard: int) -> bool:
+        lease = self._lease_path(shard)
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._expired(lease):
+                return False
+            # Only one worker wins the rename of a given lease file, but the file
+            # may already be a fresh lease from a worker that took over first.
+            tombstone = lease.with_name(f"{lease.name}.expired-{self.worker_id}")
+            try:
+                os.rename(lease, tombstone)
+            except FileNotFoundError:
+                return False
+            if not self._expired(tombstone):
+                try:
+                    os.link(tombstone, lease)
+                except FileExistsError:
+                    pass
+                tombstone.unlink()
+                return False
+            tombstone.unlink()
+            return self._claim(shard)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(self.worker_id)
+        if self._result_path(shard).exists():
+            lease.unlink()
+            return False
+        return True
+
+    def _expired(self, lease: Path) -> bool:
+        try:
+            return time.time() - lease.stat().st_mtime > self.lease_timeout
+        except FileNotFoundError:
+            return False
+
+    def _heartbeat(self, lease: Path, stop: threading.Event) -> None:
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                os.utime(lease)
+            except FileNotFoundError:
+                # Briefly renamed aside by a worker checking for expiry, or taken over.
+                continue
+
+    @staticmethod
+    def _lease_owner(lease: Path) -> str | None:
+        try:
+            return lease.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _lease_path(self, shard: int) -> Path:
+        return self.queue_dir / "leases" / f"{_shard_name(shard)}.lease"
+
+    def _result_path(self, shard: int) -> Path:
+        return self.queue_dir / "results" / f"{_shard_name(shard)}.json"
+
+
+def load_results(queue_dir: Path) -> List[ScenarioResult]:
+    """Decode every shard result of a finished sweep, in shard order."""
+    manifest = _read_json(queue_dir / "manifest.json")
+    missing = [
+        i
+        for i in range(manifest["shard_count"])
+        if not (queue_dir / "results" / f"{_shard_name(i)}.json").exists()
+    ]
+    if missing:
+        raise RuntimeError(f"sweep incomplete: {len(missing)} shard(s) without results")
+
+    results: List[ScenarioResult] = []
+    for i in range(manifest["shard_count"]):
+        results.extend(_decode_results(_read_json(queue_dir / "results" / f"{_shard_name(i)}.json")))
+    return results
+
+
+def iter_summaries(queue_dir: Path) -> Iterator[Tuple[dict, dict]]:
+    """Yield `(scenario, summary)` dicts per result without rebuilding timeseries."""
+    manifest = _read_json(queue_dir / "manifest.json")
+    for i in range(manifest["shard_count"]):
+        path = queue_dir / "results" / f"{_shard_name(i)}.json"
+        if not path.exists():
+            raise RuntimeError(f"sweep incomplete: {path.name} missing")
+        for item in _read_json(path)["results"]:
+            yield item["scenario"], item["summary"]
+
+
+def merge_results(queue_dir: Path, out_dir: Path) -> List[ScenarioResult]:
+    """Combine shard results into the standard matrix artifacts."""
+    results = load_results(queue_dir)
+    manifest = _read_json(queue_dir / "manifest.json")
+    runner = ScenarioRunner(config_from_dict(manifest["config"]))
+    if results:
+        runner.write_artifacts(results, out_dir)
+    return results
+
+
+def _encode_results(results: Iterable[ScenarioResult]) -> dict:
+    return {
+        "results": [
+            {
+                "scenario": asdict(r.scenario),
+                "summary": asdict(r.summary),
+                "invariant_violations": r.invariant_violations,
+                "components": r.components,
+                "sketches": r.sketches,
+                "timeseries": {name: col.tolist() for name, col in r.timeseries.columns.items()},
+                "timeseries_length": len(r.timeseries),
+            }
+            for r in results
+        ]
+    }
+
+
+def _decode_results(payload: dict) -> List[ScenarioResult]:
+    decoded: List[ScenarioResult] = []
+    for item in payload["results"]:
+        length = item["timeseries_length"]
+        scenario = Scenario(**item["scenario"])
+        columns = {name: values[:length] for name, values in item["timeseries"].items()}
+        decoded.append(
+            ScenarioResult(
+                scenario=scenario,
+                summary=ScenarioSummary(**item["summary"]),
+                timeseries=Timeseries.from_columns(scenario.key, columns),
+                invariant_violations=item["invariant_violations"],
+                components=item.get("components", {}),
+                sketches=item.get("sketches", {}),
+            )
+        )
+    return decoded
+
+
+def _shard_name(index: int) -> str:
+    return f"shard-{index:05d}"
+
+
+def _read_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(json.dumps(payload, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run scenario sweeps over a shared directory queue.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Split a sweep into shards.")
+    enqueue.add_argument("--queue-dir", type=Path, required=True)
+    enqueue.add_argument(
+        "--specs",
+        type=Path,
+        default=None,
+        help='JSON list of scenario specs ({"base": key, ...overrides}); defaults to the matrix.',
+    )
+    enqueue.add_argument("--config", type=Path, default=None, help="JSON SimConfig overrides.")
+    enqueue.add_argument("--shard-size", type=int, default=4)
+    enqueue.add_argument(
+        "--skip-parity",
+        action="store_true",
+        help="Enqueue even if Python/JSON constants have drifted from the Cairo sources.",
+    )
+
+    worker = sub.add_parser("worker", help="Claim and run shards until the sweep is done.")
+    worker.add_argument("--queue-dir", type=Path, required=True)
+    worker.add_argument("--lease-timeout", type=float, default=DEFAULT_LEASE_TIMEOUT_S)
+
+    merge = sub.add_parser("merge", help="Write matrix artifacts from shard results.")
+    merge.add_argument("--queue-dir", type=Path, required=True)
+    merge.add_argument("--out-dir", type=Path, default=Path("game/sim/out/bootstrap-world"))
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.command == "enqueue":
+        if not args.skip_parity:
+            try:
+                from .cairo_parity import constant_drift
+            except ImportError:  # loaded as a top-level module by `python3 game/sim/sweep_queue.py`
+                from cairo_parity import constant_drift
+
+            drift = constant_drift()
+            if drift:
+                raise SystemExit("constants drifted from the Cairo sources:\n" + "\n".join(drift))
+        if args.specs is not None:
+            scenarios = [scenario_from_spec(spec) for spec in _read_json_list(args.specs)]
+        else:
+            scenarios = build_default_scenarios()
+        config = config_from_dict(_read_json(args.config)) if args.config else SimConfig()
+        shards = enqueue_sweep(args.queue_dir, scenarios, config, args.shard_size)
+        print(f"shards={shards}")
+    elif args.command == "worker":
+        worker = SweepWorker(args.queue_dir, lease_timeout=args.lease_timeout)
+        done = worker.run()
+        print(f"worker={worker.worker_id}")
+        print(f"shards_completed={len(done)}")
+    else:
+        results = merge_results(args.queue_dir, args.out_dir)
+        print(f"scenarios={len(results)}")
+        print(f"out_dir={args.out_dir}")
+
+
+def _read_json_list(path: Path) -> list:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""Spatial territory layer for the bootstrap world simulator.
+
+Replaces the single `controlled_hexes` counter with owned hexes on cube/axial
+coordinates. Coordinates pack exactly like `coord_codec.cairo`, neighbours
+follow `adjacency.cairo`, and decay is the `process_hex_decay_once_with_status`
+transition from `models/economics.cairo` with the `biome_profiles.cairo`
+upkeep table.
+
+Decay is lazy, as on-chain: a hex that stops being maintained gets one entry
+in a due-block heap at the block where its reserve plus headroom runs out, and
+is only processed when the window containing that block is reached. Hexes
+that become claimable enter a `ClaimableIndex` ordered by
+`claimable_since_block`, so raiders take the oldest claimable hex and stale
+hexes expire in O(log n) per hex instead of a scan of the whole map.
+
+Claims go through `claim_escrow.ClaimEscrowBook`: before the grace period a
+claim only locks an escrow the controller may defend, and expired escrows
+are refunded in one batch per window before new claims are made.
+
+Controller concentration (HHI/Gini), time-to-claimable and churn are kept
+online through `kpi_stream`, so `metrics()` never walks the hex columns.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    from . import claim_escrow
+    from .kpi_stream import ConcentrationIndex, QuantileSketch
+except ImportError:  # loaded as a top-level module by `python3 game/sim/bootstrap_world_sim.py`
+    import claim_escrow
+    from kpi_stream import ConcentrationIndex, QuantileSketch
+
+CLAIM_GRACE_BLOCKS = claim_escrow.CLAIM_GRACE_BLOCKS
+
+# coord_codec.cairo
+AXIS_OFFSET = 1_048_576
+PACK_X_MULT = 1 << 42
+PACK_Y_MULT = 1 << 21
+PACK_RANGE = 1 << 21
+AXIS_MASK = PACK_RANGE - 1
+MAX_PACKED = (1 << 63) - 1
+
+# adjacency.cairo HexDirection order.
+HEX_DIRECTIONS = (
+    (1, -1, 0),
+    (1, 0, -1),
+    (-1, 1, 0),
+    (0, 1, -1),
+    (-1, 0, 1),
+    (0, -1, 1),
+)
+
+# economic_manager_contract.cairo
+DECAY_PERIOD_BLOCKS = 100
+CLAIMABLE_DECAY_THRESHOLD = 80
+DECAY_RECOVERY_BP = 20
+
+# biome_profiles.cairo upkeep_per_period
+BIOME_UPKEEP = {
+    "plains": 25,
+    "forest": 35,
+    "mountain": 45,
+    "desert": 55,
+    "swamp": 65,
+    "tundra": 70,
+    "taiga": 50,
+    "jungle": 75,
+    "savanna": 40,
+    "grassland": 30,
+    "canyon": 60,
+    "badlands": 68,
+    "volcanic": 90,
+    "glacier": 85,
+    "wetlands": 62,
+    "steppe": 38,
+    "oasis": 58,
+    "mire": 72,
+    "highlands": 52,
+    "coast": 48,
+    "unknown": 35,
+}
+BIOMES = tuple(BIOME_UPKEEP)
+
+# HEX_DIRECTIONS indices in rotational order, for walking a ring.
+_RING_WALK = (0, 1, 3, 2, 4, 5)
+
+Cube = Tuple[int, int, int]
+
+_PACKED_STEPS = tuple(dx * PACK_X_MULT + dy * PACK_Y_MULT + dz for dx, dy, dz in HEX_DIRECTIONS)
+
+
+def encode_cube(coord: Cube) -> Optional[int]:
+    x, y, z = coord
+    if x + y + z != 0:
+        return None
+    if any(v < -AXIS_OFFSET or v > AXIS_OFFSET - 1 for v in coord):
+        return None
+    return (x + AXIS_OFFSET) * PACK_X_MULT + (y + AXIS_OFFSET) * PACK_Y_MULT + (z + AXIS_OFFSET)
+
+
+def decode_cube(encoded: int) -> Optional[Cube]:
+    if encoded < 0 or encoded > MAX_PACKED:
+        return None
+    x = encoded // PACK_X_MULT
+    y = (encoded // PACK_Y_MULT) % PACK_RANGE
+    z = encoded % PACK_RANGE
+    if x > AXIS_MASK:
+        return None
+    coord = (x - AXIS_OFFSET, y - AXIS_OFFSET, z - AXIS_OFFSET)
+    return coord if sum(coord) == 0 else None
+
+
+def neighbor(coord: Cube, direction: int) -> Cube:
+    dx, dy, dz = HEX_DIRECTIONS[direction]
+    return (coord[0] + dx, coord[1] + dy, coord[2] + dz)
+
+
+def neighbor_packed(packed: int, direction: int) -> int:
+    """`neighbor` on encoded coordinates (valid away from the axis limits)."""
+    return packed + _PACKED_STEPS[direction]
+
+
+def is_adjacent(a: Cube, b: Cube) -> bool:
+    dx, dy, dz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    return dx + dy + dz == 0 and abs(dx) + abs(dy) + abs(dz) == 2
+
+
+def spiral(count: int) -> Iterator[Cube]:
+    """Yield `count` coordinates ring by ring around the origin."""
+    if count <= 0:
+        return
+    yield (0, 0, 0)
+    produced = 1
+    radius = 1
+    while produced < count:
+        dx, dy, dz = HEX_DIRECTIONS[4]
+        coord = (dx * radius, dy * radius, dz * radius)
+        for direction in _RING_WALK:
+            for _ in range(radius):
+                yield coord
+                produced += 1
+                if produced >= count:
+                    return
+                coord = neighbor(coord, direction)
+        radius += 1
+
+
+class DecayResult(NamedTuple):
+    reserve: int
+    decay_level: int
+    last_decay_processed_block: int
+    claimable_since_block: int
+    periods_processed: int
+    became_claimable: bool
+
+
+def process_hex_decay(
+    reserve: int,
+    decay_level: int,
+    last_decay_processed_block: int,
+    claimable_since_block: int,
+    now_block: int,
+    period_blocks: int,
+    upkeep_per_period: int,
+    claimable_threshold: int,
+) -> DecayResult:
+    """Port of `process_hex_decay_once_with_status` (economics.cairo)."""
+    elapsed_periods = max(0, now_block - last_decay_processed_block) // period_blocks if period_blocks else 0
+    if elapsed_periods == 0:
+        return DecayResult(
+            reserve, decay_level, last_decay_processed_block, claimable_since_block, 0, False
+        )
+
+    prior_decay = decay_level
+    total_upkeep = upkeep_per_period * elapsed_periods
+    if reserve >= total_upkeep:
+        reserve -= total_upkeep
+    else:
+        deficit = total_upkeep - reserve
+        reserve = 0
+        decay_level += min(deficit, max(0, 100 - decay_level))
+
+    last_decay_processed_block += elapsed_periods * period_blocks
+    became_claimable = prior_decay < claimable_threshold <= decay_level
+    if became_claimable and claimable_since_block == 0:
+        claimable_since_block = now_block
+    return DecayResult(
+        reserve,
+        decay_level,
+        last_decay_processed_block,
+        claimable_since_block,
+        elapsed_periods,
+        became_claimable,
+    )
+
+
+def maintenance_decay_recovery(energy_paid: int, upkeep_per_period: int, recovery_bp: int) -> int:
+    """Port of `decay_math::maintenance_decay_recovery`."""
+    if upkeep_per_period == 0 or energy_paid == 0:
+        return 0
+    recovery_per_period = recovery_bp // 5 if recovery_bp >= 5 else 1
+    return min(100, energy_paid // upkeep_per_period * recovery_per_period)
+
+
+def periods_until_claimable(reserve: int, decay_level: int, upkeep: int, claimable_threshold: int) -> int:
+    """Unmaintained decay periods before `decay_level` reaches the threshold."""
+    headroom = max(0, claimable_threshold - decay_level)
+    return max(1, -(-(reserve + headroom) // max(1, upkeep)))
+
+
+class ClaimableIndex:
+    """Claimable hexes ordered by `claimable_since_block` (oldest first).
+
+    A binary heap with lazy deletion: removing a hex only drops it from the
+    membership map, and stale heap entries are skipped when they surface.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int]] = []
+        self._since: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._since)
+
+    def __contains__(self, hex_id: int) -> bool:
+        return hex_id in self._since
+
+    def push(self, hex_id: int, claimable_since_block: int) -> None:
+        self._since[hex_id] = claimable_since_block
+        heapq.heappush(self._heap, (claimable_since_block, hex_id))
+
+    def discard(self, hex_id: int) -> None:
+        self._since.pop(hex_id, None)
+
+    def peek_oldest(self) -> Optional[Tuple[int, int]]:
+        """Return `(claimable_since_block, hex_id)` of the oldest claimable hex."""
+        heap = self._heap
+        while heap and self._since.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def pop_oldest(self) -> Optional[Tuple[int, int]]:
+        entry = self.peek_oldest()
+        if entry is not None:
+            heapq.heappop(self._heap)
+            del self._since[entry[1]]
+        return entry
+
+
+@dataclass(frozen=True)
+class TerritoryModel:
+    """Factory for per-scenario territories (`ScenarioRunner(territory_model=...)`)."""
+
+    seed: int = 11
+    initial_reserve_periods: int = 4
+    base_lapse_bp: int = 15
+    starved_lapse_bp_per_band: int = 25
+    base_raider_share_bp: int = 1_500
+    claim_attempt_bp: int = 100
+    defend_bp: int = 3_000
+    abandon_after_blocks: int = 4 * CLAIM_GRACE_BLOCKS
+
+    def for_scenario(self, scenario, config) -> "Territory":
+        return Territory(
+            self,
+            initial_hexes=max(1, scenario.initial_controlled_hexes),
+            owner_count=max(1, config.active_owner_count),
+            raider_share_bp=scenario.raider_share_bp,
+        )
+
+
+class Territory:
+    """Owned hexes in column arrays, a lazy decay heap and a claimable index."""
+
+    def __init__(self, model: TerritoryModel, initial_hexes: int, owner_count: int, raider_share_bp: int) -> None:
+        self.model = model
+        self.raider_share_bp = max(0, model.base_raider_share_bp + raider_share_bp)
+        self._rng = random.Random(model.seed)
+        self._next_controller = owner_count
+
+        self.packed = array("q")  # coord_codec encoding of each slot's hex
+        self.biome = array("B")  # index into BIOMES
+        self.reserve = array("q")
+        self.decay_level = array("q")
+        self.last_processed = array("q")
+        self.claimable_since = array("q")
+        self.lapsed_block = array("q")
+        self.controller = array("q")
+        self.owned = array("b")
+        self._slot: Dict[int, int] = {}
+        self._owned_slots: List[int] = []
+        self._owned_pos: Dict[int, int] = {}
+
+        self._due: List[Tuple[int, int, int]] = []  # (due_block, slot, lapsed_block)
+        self.claimable = ClaimableIndex()
+        self.escrow = claim_escrow.ClaimEscrowBook()
+
+        self.total_claims = 0
+        self.total_defended = 0
+        self.total_abandoned = 0
+        self.total_lapses = 0
+        self.total_expansions = 0
+        self.time_to_claimable = QuantileSketch()
+        self.concentration = ConcentrationIndex()
+        self._controlled_hex_steps = 0
+        self._steps = 0
+
+        for index, coord in enumerate(spiral(initial_hexes)):
+            self._acquire(encode_cube(coord), index % owner_count, block_number=0)
+
+    @property
+    def controlled_hexes(self) -> int:
+        return len(self._owned_slots)
+
+    def step(
+        self,
+        *,
+        block_number: int,
+        active_adventurers: int,
+        new_hexes: int,
+        surplus_band: int,
+    ) -> int:
+        """Advance one processed window and return the controlled hex count."""
+        model = self.model
+        self._expand(new_hexes, block_number)
+
+        lapse_bp = model.base_lapse_bp + max(0, -surplus_band) * model.starved_lapse_bp_per_band
+        self._lapse(self.controlled_hexes * lapse_bp // 10_000, block_number)
+        self._process_due(block_number)
+        self._resolve_expired_claims(block_number)
+
+        raiders = active_adventurers * self.raider_share_bp // 10_000
+        self._claim(raiders * model.claim_attempt_bp // 10_000, block_number)
+        self._abandon_stale(block_number)
+        self._controlled_hex_steps += self.controlled_hexes
+        self._steps += 1
+        return self.controlled_hexes
+
+    @property
+    def churn_rate_bp(self) -> int:
+        """Ownership changes (claims + abandonment) per average controlled hex, in bp."""
+        average = self._controlled_hex_steps / self._steps if self._steps else self.controlled_hexes
+        return int((self.total_claims + self.total_abandoned) * 10_000 / average) if average else 0
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "controlled_hexes": self.controlled_hexes,
+            "claimable_hexes": len(self.claimable),
+            "total_claims": self.total_claims,
+            "total_abandoned": self.total_abandoned,
+            "total_lapses": self.total_lapses,
+            "total_defended": self.total_defended,
+            "pending_claims": self.escrow.total_pending,
+            "expired_claims": self.escrow.total_expired,
+            "active_escrows": self.escrow.active_count,
+            "escrow_locked_energy": self.escrow.locked_energy,
+            "escrow_refunded_energy": self.escrow.total_refunded,
+            "median_time_to_claimable_blocks": round(self.time_to_claimable.quantile(0.5)),
+            "p95_time_to_claimable_blocks": round(self.time_to_claimable.quantile(0.95)),
+            "controller_hhi_bp": self.concentration.hhi_bp,
+            "controller_gini_bp": self.concentration.gini_bp,
+            "churn_rate_bp": self.churn_rate_bp,
+        }
+
+    def sketches(self) -> Dict[str, dict]:
+        return {"time_to_claimable_blocks": self.time_to_claimable.to_dict()}
+
+    def _acquire(self, packed: int, controller: int, block_number: int) -> None:
+        slot = self._slot.get(packed)
+        upkeep_periods = self.model.initial_reserve_periods
+        if slot is None:
+            slot = len(self.packed)
+            self._slot[packed] = slot
+            self.packed.append(packed)
+            biome = self._rng.randrange(len(BIOMES))
+            self.biome.append(biome)
+            for column in (
+                self.reserve,
+                self.decay_level,
+                self.last_processed,
+                self.claimable_since,
+                self.lapsed_block,
+                self.controller,
+                self.owned,
+            ):
+                column.append(0)
+        self.reserve[slot] = BIOME_UPKEEP[BIOMES[self.biome[slot]]] * upkeep_periods
+        self.decay_level[slot] = 0
+        self.last_processed[slot] = block_number
+        self.claimable_since[slot] = 0
+        self.lapsed_block[slot] = 0
+        if self.owned[slot]:
+            self.concentration.move(self.controller[slot], controller)
+        else:
+            self.concentration.add(controller)
+        self.controller[slot] = controller
+        if not self.owned[slot]:
+            self.owned[slot] = 1
+            self._owned_pos[slot] = len(self._owned_slots)
+            self._owned_slots.append(slot)
+
+    def _release(self, slot: int) -> None:
+        self.concentration.remove(self.controller[slot])
+        self.owned[slot] = 0
+        self.lapsed_block[slot] = 0
+        pos = self._owned_pos.pop(slot)
+        last = self._owned_slots.pop()
+        if last != slot:
+            self._owned_slots[pos] = last
+            self._owned_pos[last] = pos
+
+    def _expand(self, count: int, block_number: int) -> None:
+        """Claim `count` unowned hexes, each adjacent to an owned hex.
+
+        Explorers leave a random owned hex in a random direction and take the
+        first unowned hex on that line, so expansion always reaches the frontier.
+        """
+        rng = self._rng
+        owned = self._owned_slots
+        for _ in range(count):
+            if not owned:
+                return
+            slot = owned[rng.randrange(len(owned))]
+            direction = rng.randrange(6)
+            while True:
+                packed = neighbor_packed(self.packed[slot], direction)
+                next_slot = self._slot.get(packed)
+                if next_slot is None or not self.owned[next_slot]:
+                    break
+                slot = next_slot
+            self._acquire(packed, self.controller[slot], block_number)
+            self.total_expansions += 1
+
+    def _lapse(self, count: int, block_number: int) -> None:
+        """Stop maintenance on `count` random owned hexes and schedule their decay."""
+        rng = self._rng
+        owned = self._owned_slots
+        for _ in range(min(count, len(owned))):
+            slot = owned[rng.randrange(len(owned))]
+            if self.lapsed_block[slot]:
+                continue
+            self.lapsed_block[slot] = block_number
+            self.last_processed[slot] = block_number
+            self.total_lapses += 1
+            upkeep = BIOME_UPKEEP[BIOMES[self.biome[slot]]]
+            periods = periods_until_claimable(
+                self.reserve[slot], self.decay_level[slot], upkeep, CLAIMABLE_DECAY_THRESHOLD
+            )
+            heapq.heappush(self._due, (block_number + periods * DECAY_PERIOD_BLOCKS, slot, block_number))
+
+    def _process_due(self, block_number: int) -> None:
+        due = self._due
+        while due and due[0][0] <= block_number:
+            _, slot, lapsed = heapq.heappop(due)
+            if not self.owned[slot] or self.lapsed_block[slot] != lapsed:
+                continue  # claimed, abandoned or re-maintained since scheduling
+            result = process_hex_decay(
+                self.reserve[slot],
+                self.decay_level[slot],
+                self.last_processed[slot],
+                self.claimable_since[slot],
+                block_number,
+                DECAY_PERIOD_BLOCKS,
+                BIOME_UPKEEP[BIOMES[self.biome[slot]]],
+                CLAIMABLE_DECAY_THRESHOLD,
+            )
+            self.reserve[slot] = result.reserve
+            self.decay_level[slot] = result.decay_level
+            self.last_processed[slot] = result.last_decay_processed_block
+            self.claimable_since[slot] = result.claimable_since_block
+            if result.became_claimable:
+                self.claimable.push(slot, result.claimable_since_block)
+                self.time_to_claimable.add(result.claimable_since_block - lapsed)
+
+    def _resolve_expired_claims(self, block_number: int) -> None:
+        """Refund expired pending claims; their hexes become claimable again."""
+        batch = self.escrow.resolve_expired(block_number)
+        for _, slot, _, _ in batch.refunds:
+            if self.owned[slot] and self.claimable_since[slot]:
+                self.claimable.push(slot, self.claimable_since[slot])
+
+    def _claim(self, attempts: int, block_number: int) -> None:
+        """Raiders claim the oldest claimable hexes through the escrow book."""
+        rng = self._rng
+        for _ in range(attempts):
+            entry = self.claimable.pop_oldest()
+            if entry is None:
+                return
+            since, slot = entry
+            upkeep = BIOME_UPKEEP[BIOMES[self.biome[slot]]]
+            offer = claim_escrow.min_claim_energy(upkeep, self.decay_level[slot], CLAIMABLE_DECAY_THRESHOLD)
+            claimant = self._next_controller
+            self._next_controller += 1
+            outcome, _ = self.escrow.initiate(
+                hex_id=slot,
+                claimant=claimant,
+                energy_offered=offer,
+                min_energy=offer,
+                now_block=block_number,
+                claimable_since_block=since,
+            )
+            if outcome is claim_escrow.ClaimOutcome.APPLIED_IMMEDIATE:
+                self._transfer(slot, claimant, offer)
+            elif rng.randrange(10_000) < self.model.defend_bp:
+                defended, _ = self.escrow.defend(hex_id=slot, defense_energy=offer, now_block=block_number)
+                if defended is claim_escrow.DefendOutcome.APPLIED:
+                    self._maintain(slot, offer)
+
+    def _transfer(self, slot: int, controller: int, energy: int) -> None:
+        """Immediate claim: the claimant takes the hex and its offer tops up the reserve."""
+        self.concentration.move(self.controller[slot], controller)
+        self.controller[slot] = controller
+        self.reserve[slot] += energy
+        self.decay_level[slot] = 0
+        self.claimable_since[slot] = 0
+        self.lapsed_block[slot] = 0
+        self.total_claims += 1
+
+    def _maintain(self, slot: int, energy: int) -> None:
+        """Defence spend: added to the reserve with bounded decay recovery."""
+        upkeep = BIOME_UPKEEP[BIOMES[self.biome[slot]]]
+        self.reserve[slot] += energy
+        recovery = maintenance_decay_recovery(energy, upkeep, DECAY_RECOVERY_BP)
+        self.decay_level[slot] = max(0, self.decay_level[slot] - recovery)
+        if self.decay_level[slot] < CLAIMABLE_DECAY_THRESHOLD:
+            # Recovered below the threshold: the defender resumes upkeep, which
+            # cancels the scheduled decay entry.
+            self.claimable_since[slot] = 0
+            self.lapsed_block[slot] = 0
+        else:
+            # Still claimable: the hex stays lapsed and keeps its place in the
+            # index, so it is claimed or abandoned like any unpaid hex.
+            self.claimable.push(slot, self.claimable_since[slot])
+        self.total_defended += 1
+
+    def _abandon_stale(self, block_number: int) -> None:
+        cutoff = block_number - self.model.abandon_after_blocks
+        while True:
+            entry = self.claimable.peek_oldest()
+            if entry is None or entry[0] > cutoff:
+                return
+            self.claimable.pop_oldest()
+            self._release(entry[1])
+            self.total_abandoned += 1
@@ -0,0 +1,166 @@
+import random
+import time
+import unittest
+from collections import Counter
+from dataclasses import replace
+
+from game.sim.adventurer_policy import (
+    ACTIONS,
+    ARCHETYPES,
+    CLAIM,
+    CONVERT,
+    EXPLORE,
+    FRONTIER,
+    HARVEST,
+    IDLE,
+    KEY_COUNT,
+    STATE_COUNT,
+    WORK_HEX,
+    PolicyModel,
+    PolicyPopulation,
+    PolicyTable,
+    decode_state,
+    encode_state,
+    environment_outcomes,
+    one_hot,
+    state_key,
+    transition_table,
+    utility_matrix,
+    weight_matrix,
+)
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+
+
+class PolicyScoringTests(unittest.TestCase):
+    def test_state_codec_and_utility_matrix(self) -> None:
+        self.assertEqual(STATE_COUNT, 216)
+        for code in range(STATE_COUNT):
+            self.assertEqual(encode_state(*decode_state(code)), code)
+        with self.assertRaises(ValueError):
+            encode_state(4, 0, 0, 0, 0)
+
+        code = encode_state(3, 1, WORK_HEX, 1, 0)
+        weights = weight_matrix(1)
+        row = utility_matrix(1)[code]
+        self.assertAlmostEqual(row[HARVEST], sum(w * x for w, x in zip(weights[HARVEST], one_hot(code))))
+        self.assertEqual(row[EXPLORE], float("-inf"))
+        self.assertEqual(row[IDLE], 0.0)
+
+    def test_argmax_follows_archetype_and_local_state(self) -> None:
+        table = PolicyTable(temperature=0.0)
+        explorer, harvester, raider, passive = range(len(ARCHETYPES))
+        cases = [
+            (explorer, encode_state(3, 0, FRONTIER, 0, 0), EXPLORE),
+            (harvester, encode_state(2, 0, WORK_HEX, 0, 0), HARVEST),
+            (raider, encode_state(3, 0, WORK_HEX, 0, 1), CLAIM),
+            (harvester, encode_state(0, 2, WORK_HEX, 0, 0), CONVERT),
+            (passive, encode_state(2, 0, FRONTIER, 0, 0), IDLE),
+        ]
+        keys = [state_key(archetype, code) for archetype, code, _ in cases]
+        self.assertEqual(list(table.decide(keys)), [action for _, _, action in cases])
+        self.assertEqual(table.decide(keys, random.Random(1)), table.decide(keys))
+
+    def test_softmax_sampling_matches_probabilities(self) -> None:
+        table = PolicyTable(temperature=0.5)
+        key = state_key(0, encode_state(2, 1, FRONTIER, 1, 1))
+        draws = Counter(table.decide([key] * 40_000, random.Random(3)))
+        for action, probability in enumerate(table.probabilities[key]):
+            self.assertAlmostEqual(draws[action] / 40_000, probability, delta=0.01)
+        self.assertGreater(len(draws), 2)
+
+
+def _mix(population: PolicyPopulation) -> list:
+    counts = population.key_counts()
+    return [sum(counts[a * STATE_COUNT : (a + 1) * STATE_COUNT]) for a in range(len(ARCHETYPES))]
+
+
+class PolicyPopulationTests(unittest.TestCase):
+    def test_population_keeps_mix_and_counts_due_decisions(self) -> None:
+        population = PolicyPopulation(PolicyModel(decision_epochs=2))
+        counts = population.step(block_number=100, active_adventurers=1_000, surplus_band=0)
+        self.assertAlmostEqual(sum(counts.values()), 500, delta=len(counts))
+        self.assertEqual(set(counts), set(ACTIONS) | {"idle"})
+        mix = _mix(population)
+        for share, expected in zip(mix, [400, 350, 150, 100]):
+            self.assertAlmostEqual(share, expected, places=6)
+
+        decisions = sum(counts.values())
+        for block in range(200, 2_000, 100):
+            decisions += sum(population.step(block_number=block, active_adventurers=1_000, surplus_band=-4).values())
+        # Each action carries its fractional remainder, so only the open carries are missing.
+        self.assertLessEqual(0, 500 * 19 - decisions)
+        self.assertLess(500 * 19 - decisions, IDLE + 1)
+        for phase in population.phases:
+            self.assertAlmostEqual(sum(phase), 500, places=6)
+        for share, expected in zip(_mix(population), mix):
+            self.assertAlmostEqual(share, expected, places=6)
+        metrics = population.metrics()
+        shares = [metrics[f"{name}_share_bp"] for name in ACTIONS + ("idle",)]
+        self.assertAlmostEqual(sum(shares), 10_000, delta=len(shares))
+        self.assertGreater(metrics["mean_starved_share_bp"], 0)
+
+        shrunk = PolicyPopulation(PolicyModel(decision_epochs=2))
+        for block, active in [(100, 1_000), (200, 800), (300, 900)]:
+            shrunk.step(block_number=block, active_adventurers=active, surplus_band=1)
+        self.assertEqual(shrunk.size, 900)
+        self.assertAlmostEqual(sum(map(sum, shrunk.phases)), 900, places=6)
+        self.assertEqual(shrunk.minted, 1_100)
+
+    def test_epoch_table_matches_world_then_decision(self) -> None:
+        population = PolicyPopulation(PolicyModel())
+        environment = environment_outcomes(6_000, 1_500, 1_000, 1_500, 1_000)
+        transitions = transition_table()
+        key = state_key(1, encode_state(2, 1, WORK_HEX, 1, 1))
+        expected_keys = [0.0] * KEY_COUNT
+        expected_actions = [0.0] * (IDLE + 1)
+        for next_code, p_world in environment[key % STATE_COUNT]:
+            decided = state_key(1, next_code)
+            for action, p_action in enumerate(population.table.probabilities[decided]):
+                expected_keys[transitions[decided * (IDLE + 1) + action]] += 7.0 * p_world * p_action
+                expected_actions[action] += 7.0 * p_world * p_action
+
+        counts = [0.0] * KEY_COUNT
+        counts[key] = 7.0
+        advanced, actions = population._epoch_table(0).advance(counts)
+        for got, expected in zip(advanced + actions, expected_keys + expected_actions):
+            self.assertAlmostEqual(got, expected, places=9)
+        self.assertAlmostEqual(sum(advanced), 7.0, places=9)
+
+    def test_deaths_scale_every_phase_and_key(self) -> None:
+        population = PolicyPopulation(PolicyModel())
+        for block in range(100, 1_300, 100):
+            population.step(block_number=block, active_adventurers=2_000_000, surplus_band=0)
+        before = [phase[:] for phase in population.phases]
+        population._resize(1_000_000)
+        self.assertEqual(population.size, 1_000_000)
+        for old, new in zip(before, population.phases):
+            self.assertTrue(all(abs(n - o / 2) <= 1e-6 for o, n in zip(old, new)))
+        # Births resume the archetype pattern rather than refilling removed adventurers.
+        population._resize(1_000_020)
+        self.assertEqual(population.minted, 2_000_020)
+
+    def test_epoch_cost_does_not_grow_with_the_population(self) -> None:
+        timings = []
+        for active in (1_000, 1_000_000):
+            population = PolicyPopulation(PolicyModel())
+            start = time.perf_counter()
+            for block in range(100, 4_100, 100):
+                population.step(block_number=block, active_adventurers=active, surplus_band=block // 1_000 - 1)
+            timings.append(time.perf_counter() - start)
+        self.assertLess(timings[1], 3 * timings[0] + 0.05)
+
+
+class PolicyRunnerTests(unittest.TestCase):
+    def test_runner_takes_miner_share_from_harvest_decisions(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=1)
+        result = ScenarioRunner(policy_model=PolicyModel()).run_scenario(scenario)
+        metrics = result.components["policy"]
+        self.assertGreater(metrics["harvest_share_bp"], 0)
+        self.assertEqual(result.invariant_violations, [])
+        default = ScenarioRunner().run_scenario(scenario)
+        self.assertNotEqual(result.summary.total_deaths, default.summary.total_deaths)
+        self.assertNotIn("policy", default.components)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,12 @@ from dataclasses import replace
 from pathlib import Path
 
 from game.sim.bootstrap_world_sim import (
+    TIMESERIES_FIELDS,
     ModelMode,
     Scenario,
     ScenarioRunner,
+    SimConfig,
+    Timeseries,
     build_default_scenarios,
     oscillation_sign_changes,
 )
@@ -114,6 +117,40 @@ class BootstrapWorldSimTests(unittest.TestCase):
         sign_changes = oscillation_sign_changes(policy_signal, deadband=25)
         self.assertLessEqual(sign_changes, 24)
 
+    def test_timeseries_columns_back_lazy_row_view(self) -> None:
+        runner = ScenarioRunner()
+        baseline = next(s for s in build_default_scenarios() if s.key == "baseline_10k")
+        result = runner.run_scenario(replace(baseline, weeks=1))
+        series = result.timeseries
+        self.assertEqual(len(series), 84)
+        self.assertEqual(series.column("epoch").tolist(), list(range(1, 85)))
+        last = series[-1]
+        self.assertEqual(last["scenario"], "baseline_10k")
+        self.assertEqual(last["energy_supply"], series.column("energy_supply")[-1])
+        self.assertEqual(list(dict(last)), ["scenario"] + [name for name, _ in TIMESERIES_FIELDS])
+        self.assertEqual(len(series[10:20]), 10)
+
+    def test_timeseries_grows_past_capacity(self) -> None:
+        series = Timeseries("grow", capacity=1)
+        for epoch in range(1, 4):
+            series.record(epoch=epoch, twap_usdc_per_energy=0.5)
+        self.assertEqual([row["epoch"] for row in series], [1, 2, 3])
+        self.assertEqual(series[2]["twap_usdc_per_energy"], 0.5)
+        with self.assertRaises(IndexError):
+            series[3]
+
+    def test_timeseries_widens_columns_that_overflow_32_bits(self) -> None:
+        series = Timeseries("wide", capacity=2)
+        series.record(epoch=1, surplus_pool_energy=7)
+        series.record(epoch=2, surplus_pool_energy=7_167_176_583)
+        series.record(epoch=3, energy_supply=0)
+        series.record(epoch=4, energy_supply=1 << 40)
+        self.assertEqual(series.columns["epoch"].typecode, "i")
+        self.assertEqual(series.column("surplus_pool_energy").tolist(), [7, 7_167_176_583, 0, 0])
+        self.assertEqual(series.column("energy_supply").tolist(), [0, 0, 0, 1 << 40])
+        columns = {name: series.column(name).tolist() for name, _ in TIMESERIES_FIELDS}
+        self.assertEqual(list(Timeseries.from_columns("wide", columns).iter_values()), list(series.iter_values()))
+
 
 if __name__ == "__main__":
     unittest.main()
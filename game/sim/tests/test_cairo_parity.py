@@ -0,0 +1,88 @@
+import copy
+import shutil
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.cairo_parity import (
+    CAIRO_SRC,
+    LIBS,
+    CairoPanic,
+    check_golden,
+    constant_drift,
+    fuzz,
+    golden_vectors,
+    load_balance_config,
+    mul_bp_floor,
+    reference_ports,
+)
+
+
+class GoldenVectorTests(unittest.TestCase):
+    def test_ports_reproduce_every_cairo_unit_test_vector(self) -> None:
+        vectors = golden_vectors()
+        self.assertEqual({v.path.split("::")[0] for v in vectors}, set(LIBS))
+        self.assertIn(("math_bp::mul_bp_floor", (333, 1500), 49), [(v.path, v.args, v.expected) for v in vectors])
+        self.assertEqual(check_golden(reference_ports(), vectors), [])
+
+    def test_stale_json_values_fail_the_cairo_vectors(self) -> None:
+        config = load_balance_config()
+        config["resource_energy_values"]["ORE_IRON"] = 9
+        failures = check_golden(reference_ports(config), golden_vectors())
+        self.assertTrue(any("resource_energy_value('ORE_IRON',)" in f for f in failures))
+        self.assertTrue(any("capex_energy_equivalent('SMELTER',)" in f for f in failures))
+        with self.assertRaises(CairoPanic):
+            mul_bp_floor(1 << 127, 2)
+
+
+class FuzzTests(unittest.TestCase):
+    def test_models_match_ports_and_a_planted_bug_is_found(self) -> None:
+        ports = reference_ports()
+        report = fuzz(ports, samples=20_000, seed=3)
+        self.assertEqual(report.mismatches, {})
+        self.assertEqual(report.samples, 20_000 * sum(p.model is not None for p in ports.values()))
+
+        path = "conversion_math::quote_energy"
+        unsaturated = {path: replace(ports[path], model=lambda quantity, rate: quantity * rate)}
+        report = fuzz(unsaturated, samples=5_000, seed=3, keep=2)
+        self.assertEqual(len(report.mismatches[path]), 2)
+        (quantity, rate), cairo, python = report.mismatches[path][0]
+        self.assertEqual((cairo, python), (65_535, quantity * rate))
+
+
+class ConstantDriftTests(unittest.TestCase):
+    def test_repo_constants_match_cairo(self) -> None:
+        self.assertEqual(constant_drift(), [])
+
+    def test_reports_json_and_cairo_side_drift(self) -> None:
+        config = copy.deepcopy(load_balance_config())
+        smelter = next(b for b in config["buildings"] if b["id"] == "SMELTER")
+        smelter["recipe"]["ORE_COAL"] = 41
+        smelter["upkeep_per_100_blocks"] = 10
+
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp)
+            for name in (
+                "libs/construction_balance.cairo",
+                "libs/conversion_math.cairo",
+                "libs/biome_profiles.cairo",
+                "libs/sharing_math.cairo",
+                "systems/economic_manager_contract.cairo",
+            ):
+                (src / name).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(CAIRO_SRC / name, src / name)
+            profiles = src / "libs" / "biome_profiles.cairo"
+            text = profiles.read_text().replace("Biome::Plains => profile(25_u32", "Biome::Plains => profile(26_u32")
+            profiles.write_text(text)
+            drift = constant_drift(config, src)
+
+        labels = sorted(line.split(":")[0] for line in drift)
+        self.assertEqual(
+            labels,
+            ["buildings.SMELTER.recipe", "buildings.SMELTER.upkeep_per_100_blocks", "territory.BIOME_UPKEEP.plains"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import time
+import unittest
+
+from game.sim.claim_escrow import (
+    ClaimEscrowBook,
+    ClaimOutcome,
+    DefendOutcome,
+    EscrowStatus,
+    min_claim_energy,
+)
+
+
+def _claim(book: ClaimEscrowBook, hex_id: int, now: int, since: int, offer: int = 40, claimant: int = 7):
+    return book.initiate(
+        hex_id=hex_id,
+        claimant=claimant,
+        energy_offered=offer,
+        min_energy=30,
+        now_block=now,
+        claimable_since_block=since,
+    )
+
+
+class ClaimEscrowTests(unittest.TestCase):
+    def test_grace_decides_pending_or_immediate(self) -> None:
+        book = ClaimEscrowBook(timeout_blocks=100, grace_blocks=500)
+        self.assertEqual(_claim(book, 1, now=1_000, since=0)[0], ClaimOutcome.NOT_CLAIMABLE)
+        self.assertEqual(_claim(book, 1, now=1_000, since=600, offer=20)[0], ClaimOutcome.BELOW_MINIMUM)
+        self.assertEqual(_claim(book, 1, now=1_000, since=600, offer=0)[0], ClaimOutcome.INVALID_AMOUNT)
+
+        outcome, pending = _claim(book, 1, now=1_000, since=600)
+        self.assertEqual(outcome, ClaimOutcome.APPLIED_PENDING)
+        self.assertEqual(book.expiry_block[pending], 1_100)
+        self.assertEqual(book.locked_energy, 40)
+        self.assertEqual(_claim(book, 1, now=1_050, since=600)[0], ClaimOutcome.ESCROW_ALREADY_ACTIVE)
+
+        outcome, immediate = _claim(book, 2, now=1_000, since=500)
+        self.assertEqual(outcome, ClaimOutcome.APPLIED_IMMEDIATE)
+        self.assertEqual(book.status[immediate], EscrowStatus.RESOLVED.value)
+        self.assertEqual(book.active_count, 1)
+
+    def test_defend_refunds_claimant_once(self) -> None:
+        book = ClaimEscrowBook()
+        _claim(book, 1, now=1_000, since=900)
+        self.assertEqual(book.defend(hex_id=1, defense_energy=39, now_block=1_050), (DefendOutcome.INVALID_AMOUNT, 0))
+        self.assertEqual(book.defend(hex_id=1, defense_energy=40, now_block=1_100), (DefendOutcome.APPLIED, 40))
+        self.assertEqual(book.defend(hex_id=1, defense_energy=40, now_block=1_100), (DefendOutcome.NO_ACTIVE_CLAIM, 0))
+        self.assertEqual(book.resolve_expired(5_000).expired, 0)
+        self.assertEqual((book.locked_energy, book.total_refunded, book.total_defended), (0, 40, 1))
+
+        _, late = _claim(book, 2, now=1_000, since=900)
+        self.assertEqual(book.defend(hex_id=2, defense_energy=99, now_block=1_101), (DefendOutcome.CLAIM_EXPIRED, 40))
+        self.assertEqual(book.status[late], EscrowStatus.EXPIRED.value)
+        with self.assertRaises(RuntimeError):
+            book._close(late, EscrowStatus.EXPIRED)
+
+    def test_batch_expiry_only_takes_escrows_past_expiry(self) -> None:
+        book = ClaimEscrowBook(timeout_blocks=100)
+        for hex_id, now in [(1, 1_000), (2, 1_000), (3, 1_050), (4, 1_200)]:
+            _claim(book, hex_id, now=now, since=now - 10, claimant=hex_id * 10)
+        self.assertEqual(book.resolve_expired(1_100).expired, 0)
+
+        batch = book.resolve_expired(1_101)
+        self.assertEqual(sorted(hex_id for _, hex_id, _, _ in batch.refunds), [1, 2])
+        self.assertEqual(batch.refunded_energy, 80)
+        self.assertEqual(sorted(c for _, _, c, _ in batch.refunds), [10, 20])
+        self.assertEqual(book.resolve_expired(1_101).expired, 0)
+        self.assertEqual(book.resolve_expired(1_400).expired, 2)
+        self.assertEqual(book.active_count, 0)
+
+    def test_thousands_of_concurrent_claims_keep_locked_energy_exact(self) -> None:
+        rng = random.Random(3)
+        book = ClaimEscrowBook(timeout_blocks=300)
+        offered = 0
+        start = time.perf_counter()
+        for window in range(1, 41):
+            now = window * 100
+            book.resolve_expired(now)
+            for hex_id in rng.sample(range(50_000), 2_000):
+                outcome, _ = _claim(book, hex_id, now=now, since=now - 50, offer=rng.randint(30, 100))
+                if outcome is ClaimOutcome.APPLIED_PENDING:
+                    offered += book.energy_locked[-1]
+            for hex_id in rng.sample(range(50_000), 500):
+                book.defend(hex_id=hex_id, defense_energy=100, now_block=now)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertGreater(book.active_count, 4_000)
+        self.assertEqual(book.locked_energy, sum(book.energy_locked))
+        self.assertEqual(offered, book.locked_energy + book.total_refunded)
+
+    def test_min_claim_energy_matches_decay_math(self) -> None:
+        self.assertEqual(min_claim_energy(25, 70, 80), 50)
+        self.assertEqual(min_claim_energy(25, 85, 80), 75)
+        self.assertEqual(min_claim_energy(45, 90, 80), 100)
+        self.assertEqual(min_claim_energy(0, 0, 80), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
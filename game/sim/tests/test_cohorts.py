@@ -0,0 +1,85 @@
+import unittest
+from dataclasses import replace
+
+from game.sim.bootstrap_world_sim import ModelMode, ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.cohorts import STRATEGIES, CohortModel, CohortTable, split_by_share
+
+
+def _step(table: CohortTable, epoch: int, **overrides) -> tuple:
+    args = dict(
+        epoch=epoch,
+        minted=0,
+        bond_unit=100,
+        miner_share_bp=5_000,
+        collapse_prob_bp=200,
+        player_extraction=10_000,
+        roster_upkeep_per_adv=0.0,
+    )
+    args.update(overrides)
+    return table.step(**args)
+
+
+class CohortTableTests(unittest.TestCase):
+    def test_split_by_share_sums_to_count(self) -> None:
+        for count in (0, 1, 7, 999, 10_001):
+            parts = split_by_share(count, [3_500, 3_500, 1_500, 1_500])
+            self.assertEqual(sum(parts), count)
+            self.assertLessEqual(abs(parts[0] - parts[1]), 1)
+
+    def test_mature_population_extracts_at_headcount(self) -> None:
+        table = CohortModel().for_scenario(build_default_scenarios()[0], SimConfig())
+        self.assertAlmostEqual(table.effective_adventurers(1), table.active_adventurers, delta=1.0)
+
+    def test_deaths_lock_the_cohorts_own_bond(self) -> None:
+        model = CohortModel(ramp_epochs=10, bucket_epochs=1)
+        table = CohortTable(model, 1_000)
+        _step(table, 1, minted=1_000, bond_unit=100)
+        for epoch in range(2, 40):
+            deaths, locked = _step(table, epoch, bond_unit=10_000)
+            # Nobody bonded at 10_000: every death locks the 100 paid at mint.
+            self.assertEqual(locked, deaths * 100)
+        self.assertEqual(table.active_adventurers + sum(table.deaths), 2_000)
+        metrics = table.metrics()
+        self.assertEqual(sum(metrics[f"{name}_alive"] for name in STRATEGIES), table.active_adventurers)
+        self.assertEqual(sum(metrics[f"{name}_locked_energy"] for name in STRATEGIES), sum(table.locked))
+
+    def test_novices_ramp_extraction_and_die_faster(self) -> None:
+        model = CohortModel(ramp_epochs=20, bucket_epochs=1)
+        veterans, novices = CohortTable(model, 2_000), CohortTable(model, 1)
+        _step(novices, 0, minted=2_000)
+        self.assertLess(novices.effective_adventurers(1), 0.8 * veterans.effective_adventurers(1))
+        self.assertAlmostEqual(novices.effective_adventurers(20), veterans.effective_adventurers(20), delta=5.0)
+        for epoch in range(1, 20):
+            _step(veterans, epoch)
+            _step(novices, epoch)
+        self.assertGreater(sum(veterans.alive), sum(novices.alive))
+        self.assertGreater(novices.metrics()["novice_death_share_bp"], 9_000)
+
+    def test_external_deaths_are_spread_by_hazard(self) -> None:
+        table = CohortTable(CohortModel(bucket_epochs=1), 500)
+        deaths, _ = _step(table, 1, deaths=37)
+        self.assertEqual(deaths, 37)
+        deaths, _ = _step(table, 2, deaths=10_000)
+        self.assertEqual((deaths, table.active_adventurers), (463, 0))
+
+
+class CohortModeRunnerTests(unittest.TestCase):
+    def test_cohort_mode_tracks_the_aggregate_headcount(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=2)
+        result = ScenarioRunner(SimConfig(mode=ModelMode.COHORT)).run_scenario(scenario)
+        self.assertEqual(result.invariant_violations, [])
+        cohorts = result.components["cohorts"]
+        alive = sum(cohorts[f"{name}_alive"] for name in STRATEGIES)
+        self.assertEqual(alive, result.summary.final_active_adventurers)
+        self.assertGreater(cohorts["cohorts"], 1)
+        self.assertNotIn("cohorts", ScenarioRunner().run_scenario(scenario).components)
+
+    def test_cohort_model_requires_cohort_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            ScenarioRunner(cohort_model=CohortModel())
+        with self.assertRaises(ValueError):
+            CohortModel(bucket_epochs=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from dataclasses import replace
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+from game.sim.conversion_window import (
+    ConversionBook,
+    ConversionModel,
+    VolumeRing,
+    effective_rate,
+    effective_rate_for_window,
+    penalty_bp_for_units,
+    quote_batch,
+    quote_energy,
+)
+
+
+class ConversionMathParityTests(unittest.TestCase):
+    # Mirrors game/src/libs/conversion_math.cairo.
+
+    def test_penalty_steps_and_effective_rate(self) -> None:
+        self.assertEqual(
+            [penalty_bp_for_units(u) for u in (0, 9, 10, 499, 500, 10_000)],
+            [0, 0, 100, 4_900, 5_000, 5_000],
+        )
+        self.assertEqual(effective_rate_for_window(10, 0), 10)
+        self.assertEqual(effective_rate_for_window(10, 500), 5)
+        self.assertEqual(effective_rate_for_window(1, 500), 1)
+        self.assertEqual(effective_rate(10, 12, 100, 500, 199, 100), 5)
+        self.assertEqual(effective_rate(10, 12, 100, 500, 200, 100), 12)
+        self.assertEqual(effective_rate(10, 12, 100, 500, 50, 0), 12)
+        self.assertEqual(quote_energy(1_000, 120), 65_535)
+
+    def test_batch_quote_matches_per_event_loop(self) -> None:
+        rng = random.Random(5)
+        for _ in range(300):
+            rate, window = rng.randint(1, 120), rng.randint(0, 600)
+            quantity, conversions = rng.randint(1, 40), rng.randint(0, 80)
+            expected = sum(
+                quote_energy(quantity, effective_rate_for_window(rate, window + k * quantity))
+                for k in range(conversions)
+            )
+            self.assertEqual(quote_batch(rate, window, quantity, conversions), expected)
+
+
+class VolumeRingTests(unittest.TestCase):
+    def test_window_slides_bucket_by_bucket(self) -> None:
+        ring = VolumeRing(2, window_blocks=100, slots=10)
+        ring.add(0, 30, 0)
+        ring.add(0, 20, 55)
+        self.assertEqual(ring.window_units(0, 99), 50)
+        self.assertEqual(ring.window_units(0, 100), 20)
+        ring.add(0, 5, 90)  # late write lands in the newest bucket
+        self.assertEqual(ring.window_units(0, 159), 5)
+        self.assertEqual(ring.window_units(0, 5_000), 0)
+        self.assertEqual(ring.window_units(1, 5_000), 0)
+
+    def test_book_tracks_items_and_adventurers(self) -> None:
+        book = ConversionBook(item_count=1)
+        first = book.convert(adventurer=3, item=0, quantity=10, base_rate=100, now_block=0)
+        batch = book.convert_batch(item=0, quantity=10, base_rate=100, now_block=10, adventurers=[3, 7, 7])
+        self.assertEqual(first, 1_000)
+        self.assertEqual(batch, 990 + 980 + 970)
+        self.assertEqual(book.item_penalty_bp(0, 50), 400)
+        self.assertEqual(book.adventurers.window_units(7, 50), 20)
+        self.assertEqual(book.adventurers.window_units(3, 105), 10)
+        self.assertEqual(book.item_penalty_bp(0, 200), 0)
+
+
+class ConversionRunnerTests(unittest.TestCase):
+    def test_runner_taxes_conversion_by_window_volume(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=2)
+        result = ScenarioRunner(conversion_model=ConversionModel()).run_scenario(scenario)
+        metrics = result.components["conversion"]
+        self.assertGreater(metrics["converted_units"], 0)
+        self.assertEqual(metrics["peak_penalty_bp"], 5_000)
+        taxes = list(result.timeseries.column("conversion_tax_bp"))
+        self.assertTrue(all(0 < bp <= 5_000 for bp in taxes))
+        self.assertEqual(result.invariant_violations, [])
+
+        pinned = replace(scenario, conversion_tax_override_bp=500)
+        pinned_result = ScenarioRunner(conversion_model=ConversionModel()).run_scenario(pinned)
+        self.assertEqual(set(pinned_result.timeseries.column("conversion_tax_bp")), {500})
+        self.assertGreater(pinned_result.components["conversion"]["converted_units"], 0)
+
+        self.assertNotIn("conversion", ScenarioRunner().run_scenario(scenario).components)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ModelMode, SimConfig
+from game.sim.event_ingest import (
+    EVENT_EMITTED_SELECTOR,
+    STORE_SET_RECORD_SELECTOR,
+    EpochCsvWriter,
+    EventIngester,
+    ingest_dump,
+    load_selector_names,
+)
+
+NAMES = {name: selector for selector, name in load_selector_names().items()}
+
+
+def _emitted(block: int, name: str, keys, values) -> dict:
+    data = [len(keys), *keys, len(values), *values]
+    return {
+        "block_number": block,
+        "keys": [hex(EVENT_EMITTED_SELECTOR), hex(NAMES[name]), "0x1"],
+        "data": [hex(v) for v in data],
+    }
+
+
+def _model_write(block: int, name: str) -> dict:
+    return {
+        "block_number": hex(block),
+        "keys": [hex(STORE_SET_RECORD_SELECTOR), hex(NAMES[name]), "0x99"],
+        "data": ["0x0", "0x0"],
+    }
+
+
+def _dump(events) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(e) + "\n" for e in events).encode("utf-8"))
+
+
+class EventIngestTests(unittest.TestCase):
+    def test_manifest_names_cover_script_models(self) -> None:
+        for name in ("Hex", "HexArea", "PlantNode", "BackpackItem", "ClaimEscrow", "MineCollapsed"):
+            self.assertIn(name, NAMES)
+
+    def test_epochs_aggregate_rates_and_fill_gaps(self) -> None:
+        events = [
+            _emitted(5, "AdventurerCreated", [1], [0xA]),
+            _emitted(6, "AdventurerCreated", [2], [0xB]),
+            _emitted(10, "ItemsConverted", [1], [0x77, 3, 40]),
+            _emitted(20, "HexEnergyPaid", [0x500], [1, 30]),
+            _emitted(21, "HexEnergyPaid", [0x500], [1, 10]),
+            _emitted(30, "MiningStarted", [2, 0x9], [30]),
+            _model_write(40, "Hex"),
+            _emitted(350, "MineCollapsed", [0x9], [1, 1]),
+            _emitted(351, "MiningContinued", [2, 0x9], [5, 3]),
+        ]
+        rows = []
+        ingester = EventIngester(load_selector_names(), on_sealed=rows.append)
+        ingester.ingest_stream(_dump(events))
+        ingester.finish()
+
+        self.assertEqual([r.epoch for r in rows], [0, 1, 2, 3])
+        first = rows[0]
+        self.assertEqual(first.active_adventurers, 2)
+        self.assertEqual(first.conversion_energy, 40)
+        self.assertEqual((first.upkeep_energy, first.upkeep_hexes), (40, 1))
+        self.assertEqual(first.miners, 1)
+        self.assertEqual(first.by_selector["Hex"], 1)
+        self.assertEqual(rows[1].first_offset, -1)
+        self.assertEqual(rows[3].collapse_deaths, 1)
+
+        overrides = ingester.calibration()["sim_config"]
+        self.assertEqual(overrides["extraction_energy_per_adv_epoch"], 5)
+        self.assertEqual(overrides["upkeep_energy_per_hex_epoch"], 40)
+        self.assertEqual(overrides["base_collapse_prob_bp"], 5_000)
+
+    def test_unknown_selectors_are_skipped(self) -> None:
+        rows = []
+        ingester = EventIngester(load_selector_names(), on_sealed=rows.append)
+        ingester.ingest({"block_number": 1, "keys": ["0x1", "0x2"], "data": []})
+        ingester.finish()
+        self.assertEqual(ingester.skipped_count, 1)
+        self.assertEqual(rows, [])
+
+    def test_events_behind_reorder_window_are_rejected(self) -> None:
+        ingester = EventIngester(load_selector_names(), reorder_window_epochs=1)
+        ingester.ingest(_emitted(1_000, "AdventurerCreated", [1], [0xA]))
+        ingester.ingest(_emitted(950, "AdventurerCreated", [2], [0xA]))
+        with self.assertRaises(ValueError):
+            ingester.ingest(_emitted(50, "AdventurerCreated", [3], [0xA]))
+
+    def test_sealed_rows_stream_to_csv_without_being_retained(self) -> None:
+        handle = io.StringIO()
+        writer = EpochCsvWriter(handle, NAMES)
+        ingester = EventIngester(load_selector_names(), reorder_window_epochs=0, on_sealed=writer)
+        for epoch in range(50):
+            ingester.ingest(_emitted(epoch * 100 + 1, "AdventurerCreated", [epoch], [0xA]))
+            self.assertLessEqual(len(ingester._open), 1)
+        ingester.finish()
+        self.assertEqual((writer.rows, ingester.totals.epochs, ingester.totals.adventurer_epochs), (50, 50, 1_275))
+        header, *lines = handle.getvalue().splitlines()
+        self.assertIn("n_AdventurerCreated", header.split(","))
+        self.assertEqual(len(lines), 50)
+
+    def test_sim_config_loads_calibration(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dump = Path(tmp) / "events.jsonl"
+            dump.write_bytes(
+                _dump(
+                    [_emitted(1, "AdventurerCreated", [1], [0xA]), _emitted(2, "ItemsConverted", [1], [0x77, 1, 9])]
+                ).getvalue()
+            )
+            out_dir = Path(tmp) / "out"
+            ingest_dump(dump, out_dir)
+            self.assertTrue((out_dir / "calibration_epochs.csv").exists())
+            config = SimConfig.from_calibration(
+                out_dir / "calibration.json", mode=ModelMode.DESIGN_INTENDED
+            )
+        self.assertEqual(config.extraction_energy_per_adv_epoch, 9)
+        self.assertEqual(config.mode, ModelMode.DESIGN_INTENDED)
+        self.assertEqual(config.upkeep_energy_per_hex_epoch, SimConfig().upkeep_energy_per_hex_epoch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from dataclasses import replace
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.hex_histogram import (
+    BIOME_ROLL_SHARE_BP,
+    MAX_DECAY,
+    HexHistogram,
+    HexHistogramModel,
+)
+from game.sim.territory import BIOME_UPKEEP, BIOMES, TerritoryModel
+
+
+class HexHistogramTests(unittest.TestCase):
+    def test_new_hexes_follow_biome_roll_shares_exactly(self) -> None:
+        histogram = HexHistogram(HexHistogramModel(), initial_hexes=7, raider_share_bp=0)
+        for count in (13, 1, 979):
+            histogram.advance(active_adventurers=0, new_hexes=count)
+        counts = {biome: sum(levels.values()) for biome, levels in histogram.by_biome().items()}
+        self.assertEqual(sum(counts.values()), 1_000)
+        self.assertNotIn("unknown", counts)
+        for biome, share in zip(BIOMES, BIOME_ROLL_SHARE_BP):
+            if share:
+                self.assertEqual(counts[biome], 1_000 * share // 10_000)
+
+    def test_calibrated_upkeep_averages_the_configured_charge(self) -> None:
+        model = HexHistogramModel(lapse_bp=0)
+        calibrated = HexHistogram(model, 20_000, 0, upkeep_per_hex=17)
+        raw = HexHistogram(model, 20_000, 0)
+        self.assertEqual(calibrated.charge_upkeep(surplus_band=0), 20_000 * 17)
+        self.assertEqual(raw.charge_upkeep(surplus_band=0), sum(2 * share * BIOME_UPKEEP[b] for b, share in zip(BIOMES, BIOME_ROLL_SHARE_BP)))
+
+    def test_starvation_decays_claims_and_abandons_conserving_hexes(self) -> None:
+        model = HexHistogramModel(lapse_bp=10_000, resume_bp=0, claim_attempt_bp=10_000, abandon_bp=5_000)
+        histogram = HexHistogram(model, initial_hexes=2_000, raider_share_bp=0)
+        for _ in range(3):
+            histogram.charge_upkeep(surplus_band=-2)
+            histogram.advance(active_adventurers=0, new_hexes=0)
+        bins = histogram.by_biome()
+        for biome, levels in bins.items():
+            upkeep = BIOME_UPKEEP[biome]
+            self.assertEqual(set(levels), {min(MAX_DECAY, 3 * upkeep)}, biome)
+        self.assertEqual(histogram.total_claims, 0)
+
+        self.assertGreater(histogram.metrics()["claimable_hexes"], 300)
+        histogram.charge_upkeep(surplus_band=-2)
+        histogram.advance(active_adventurers=2_000, new_hexes=0)  # 300 raiders, 300 claim attempts
+        self.assertEqual(histogram.total_claims, 300)
+        self.assertGreater(histogram.total_abandoned, 0)
+        self.assertEqual(histogram.controlled_hexes, 2_000 - histogram.total_abandoned)
+        self.assertEqual(histogram.controlled_hexes, sum(histogram.cells.values()))
+        # Claims take the most decayed bins first and reset them to 0.
+        claimed = sum(levels.get(0, 0) for levels in histogram.by_biome().values())
+        self.assertEqual(claimed, 300)
+
+
+class HexRunnerTests(unittest.TestCase):
+    def test_runner_charges_on_chain_upkeep_without_collapsing_supply(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=4)
+        flat = ScenarioRunner(SimConfig()).run_scenario(scenario)
+        result = ScenarioRunner(SimConfig(), hex_model=HexHistogramModel()).run_scenario(scenario)
+        self.assertNotIn("hexes", flat.components)
+        hexes = result.components["hexes"]
+        self.assertEqual(hexes["controlled_hexes"], result.summary.final_controlled_hexes)
+        weighted = sum(share * BIOME_UPKEEP[b] for b, share in zip(BIOMES, BIOME_ROLL_SHARE_BP)) / 10_000
+        self.assertAlmostEqual(hexes["mean_upkeep_per_paid_hex"], weighted, delta=1.0)
+        # Starved owners let hexes lapse, so territory shrinks instead of draining supply.
+        self.assertLess(result.summary.final_controlled_hexes, flat.summary.final_controlled_hexes)
+        self.assertGreater(result.summary.net_inflation_pct, -10)
+
+        calibrated = ScenarioRunner(SimConfig(), hex_model=HexHistogramModel(calibrated_upkeep=True)).run_scenario(scenario)
+        self.assertAlmostEqual(calibrated.components["hexes"]["mean_upkeep_per_paid_hex"], 17, delta=0.1)
+        drift = abs(calibrated.summary.final_controlled_hexes / flat.summary.final_controlled_hexes - 1)
+        self.assertLess(drift, 0.02)
+
+    def test_hex_model_excludes_territory_model(self) -> None:
+        with self.assertRaises(ValueError):
+            ScenarioRunner(SimConfig(), hex_model=HexHistogramModel(), territory_model=TerritoryModel())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import random
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+from game.sim.kpi_stream import ConcentrationIndex, QuantileSketch, merge_bands
+from game.sim.territory import TerritoryModel
+
+
+class QuantileSketchTests(unittest.TestCase):
+    def test_quantiles_stay_within_relative_accuracy(self) -> None:
+        rng = random.Random(3)
+        samples = [rng.lognormvariate(6, 1.5) for _ in range(20_000)] + [0.0] * 500
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in samples:
+            sketch.add(value)
+        samples.sort()
+        for q in (0.0, 0.05, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0):
+            exact = samples[int(q * (len(samples) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * exact + 1e-9, q)
+        self.assertEqual((sketch.count, sketch.min, sketch.max), (len(samples), 0.0, samples[-1]))
+        self.assertLess(len(sketch.buckets), 1_000)
+
+    def test_merge_and_round_trip_match_single_sketch(self) -> None:
+        rng = random.Random(8)
+        whole, parts = QuantileSketch(), [QuantileSketch() for _ in range(4)]
+        for i in range(4_000):
+            value = rng.randint(0, 5_000)
+            whole.add(value)
+            parts[i % 4].add(value)
+        merged = QuantileSketch()
+        for part in parts:
+            merged.merge(QuantileSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+        self.assertEqual(merge_bands([{"x": p.to_dict()} for p in parts]), {"x": whole.bands()})
+        with self.assertRaises(ValueError):
+            merged.merge(QuantileSketch(relative_accuracy=0.02))
+
+
+class ConcentrationIndexTests(unittest.TestCase):
+    def test_hhi_and_gini_match_brute_force(self) -> None:
+        rng = random.Random(11)
+        index = ConcentrationIndex()
+        counts = {}
+        for _ in range(3_000):
+            controller = rng.randrange(40)
+            if counts.get(controller) and rng.random() < 0.4:
+                target = rng.randrange(40)
+                index.move(controller, target)
+                counts[controller] -= 1
+                counts[target] = counts.get(target, 0) + 1
+            else:
+                index.add(controller)
+                counts[controller] = counts.get(controller, 0) + 1
+        held = sorted(n for n in counts.values() if n)
+        total = sum(held)
+        hhi = sum(n * n for n in held) * 10_000 // (total * total)
+        gini = sum((2 * (i + 1) - len(held) - 1) * n for i, n in enumerate(held)) / (len(held) * total)
+        self.assertEqual(index.hhi_bp, hhi)
+        self.assertEqual(index.gini_bp, round(gini * 10_000))
+        with self.assertRaises(ValueError):
+            index.remove(99)
+
+
+class KpiBandsRunnerTests(unittest.TestCase):
+    def test_run_summary_merges_sketches_across_seeds(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=3)
+        results = [
+            ScenarioRunner(territory_model=TerritoryModel(seed=seed)).run_scenario(scenario) for seed in (1, 2)
+        ]
+        sketches = [r.sketches["territory.time_to_claimable_blocks"] for r in results]
+        self.assertTrue(all(s["count"] for s in sketches))
+        self.assertIn("controller_hhi_bp", results[0].components["territory"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ScenarioRunner().write_artifacts(results, Path(tmp))
+            summary = json.loads((Path(tmp) / "run_summary.json").read_text())
+        bands = summary["kpi_bands"][scenario.key]["territory.time_to_claimable_blocks"]
+        self.assertEqual(bands["count"], sum(s["count"] for s in sketches))
+        self.assertLessEqual(bands["p05"], bands["median"])
+        self.assertLessEqual(bands["median"], bands["p95"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import time
+import unittest
+from dataclasses import replace
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.mine_population import (
+    MinePopulationModel,
+    compute_stress_delta,
+    compute_tick_energy_cost,
+    compute_tick_yield,
+    swarm_energy_surcharge,
+    will_collapse,
+)
+
+
+def _scenario(key: str, weeks: int = 2):
+    by_key = {s.key: s for s in build_default_scenarios()}
+    return replace(by_key[key], weeks=weeks)
+
+
+class MiningMathParityTests(unittest.TestCase):
+    # Mirrors game/src/tests/unit/mining_math_test.cairo.
+
+    def test_swarm_surcharge_matches_contract(self) -> None:
+        self.assertEqual([swarm_energy_surcharge(n, 2) for n in (1, 2, 3, 4)], [0, 2, 8, 18])
+        costs = [compute_tick_energy_cost(3, 2, 1, n, 2) for n in (1, 3, 5)]
+        self.assertEqual(costs, sorted(set(costs)))
+
+    def test_stress_grows_with_density_and_risk(self) -> None:
+        low = compute_stress_delta(10, 20, 1, 5, 8, 10_000, 10_000, 120, 500)
+        high_density = compute_stress_delta(10, 20, 4, 5, 8, 10_000, 10_000, 120, 500)
+        high_risk = compute_stress_delta(10, 20, 4, 5, 8, 12_000, 13_000, 120, 500)
+        self.assertEqual(low, 200)
+        self.assertLess(low, high_density)
+        self.assertLess(high_density, high_risk)
+
+    def test_collapse_and_yield_penalty(self) -> None:
+        self.assertFalse(will_collapse(90, 100))
+        self.assertTrue(will_collapse(100, 100))
+        self.assertFalse(will_collapse(100, 0))
+        self.assertEqual(compute_tick_yield(20, 0, 100, 8_500, 4), 80)
+        self.assertEqual(compute_tick_yield(20, 50, 100, 8_500, 4), 40)
+        self.assertEqual(compute_tick_yield(20, 500, 100, 8_500, 4), 12)
+
+
+class MinePopulationTests(unittest.TestCase):
+    def test_collapses_kill_whole_crews_and_send_mines_to_repair(self) -> None:
+        model = MinePopulationModel(mine_count=2_000)
+        population = model.for_scenario(_scenario("collapse_wave"), SimConfig())
+        deaths = sum(
+            population.step(active_adventurers=10_000, miner_share_bp=2_200) for _ in range(50)
+        )
+        self.assertGreater(population.total_collapses, 0)
+        self.assertEqual(deaths, population.total_deaths)
+        self.assertGreaterEqual(deaths, population.total_collapses)
+        self.assertGreater(population.total_ore, 0)
+        self.assertGreater(population.repairing_mines, 0)
+        open_mines = population.staffed_mines + sum(population.idle.values())
+        self.assertEqual(open_mines + population.repairing_mines, 2_000)
+
+    def test_threshold_bands_keep_weak_and_strong_mines_apart(self) -> None:
+        population = MinePopulationModel(mine_count=2_000).for_scenario(_scenario("baseline_10k"), SimConfig())
+        plains_common = [
+            mine.threshold
+            for mine in population.classes
+            if (mine.biome_risk_bp, mine.base_stress, mine.rarity_risk_bp) == (10_000, 8, 10_000)
+        ]
+        # Tier 0 thresholds roll over 9000..12000; four bands keep their spread.
+        self.assertEqual(len(plains_common), 4)
+        self.assertGreater(max(plains_common) - min(plains_common), 2_000)
+
+    def test_calibrated_deaths_follow_the_aggregate_rate(self) -> None:
+        model = MinePopulationModel(mine_count=2_000, calibrated_collapse=True)
+        population = model.for_scenario(_scenario("baseline_10k"), SimConfig())
+        deaths = sum(
+            population.step(active_adventurers=10_000, miner_share_bp=2_200, collapse_prob_bp=40)
+            for _ in range(100)
+        )
+        # The aggregate floors 2_200 miners * 0.4% per epoch; whole crews die, so allow one crew of slack.
+        self.assertLessEqual(abs(deaths - 100 * (2_200 * 40 // 10_000)), population.model.crew_size + 1)
+        self.assertGreater(population.total_collapses, 0)
+
+    def test_swarm_surcharge_limits_settles_paid_from_the_tick_budget(self) -> None:
+        config = SimConfig()
+        scenario = _scenario("baseline_10k")
+        population = MinePopulationModel().for_scenario(scenario, config)
+        self.assertEqual(
+            population._crew_tick_cost(0, 4) - population._crew_tick_cost(0, 1),
+            swarm_energy_surcharge(4, 2),
+        )
+        population.step(active_adventurers=10_000, miner_share_bp=2_200)
+        self.assertGreater(population.metrics()["tick_energy_spent"], 0)
+
+        broke = MinePopulationModel(tick_energy_budget=0).for_scenario(scenario, config)
+        broke.step(active_adventurers=10_000, miner_share_bp=2_200)
+        self.assertEqual((broke.total_ore, broke.total_tick_energy), (0, 0))
+
+    def test_runner_uses_per_mine_deaths_and_locks_their_bonds(self) -> None:
+        model = MinePopulationModel()
+        runner = ScenarioRunner(collapse_model=model)
+        baseline = runner.run_scenario(_scenario("baseline_10k"))
+        shocked = runner.run_scenario(_scenario("collapse_wave"))
+
+        self.assertEqual(baseline.invariant_violations, [])
+        self.assertGreater(shocked.summary.total_deaths, baseline.summary.total_deaths)
+        self.assertGreater(
+            shocked.summary.locked_capital_energy, baseline.summary.locked_capital_energy
+        )
+        self.assertEqual(
+            runner.run_scenario(_scenario("baseline_10k")).summary, baseline.summary
+        )
+        self.assertEqual(shocked.components["mines"]["total_deaths"], shocked.summary.total_deaths)
+
+    def test_full_scenarios_track_the_aggregate_model(self) -> None:
+        # Raw stress odds land within 3% of aggregate deaths on the two tuning
+        # scenarios; calibrated totals stay within 1% of deaths and 0.1
+        # percentage points of net inflation over the full horizon.
+        by_key = {s.key: s for s in build_default_scenarios()}
+        for key in ("baseline_10k", "collapse_wave"):
+            aggregate = ScenarioRunner().run_scenario(by_key[key]).summary
+            start = time.perf_counter()
+            raw = ScenarioRunner(collapse_model=MinePopulationModel()).run_scenario(by_key[key]).summary
+            self.assertLess(time.perf_counter() - start, 2.0, key)
+            self.assertAlmostEqual(raw.total_deaths / aggregate.total_deaths, 1.0, delta=0.03, msg=key)
+
+            calibrated_model = MinePopulationModel(calibrated_collapse=True)
+            calibrated = ScenarioRunner(collapse_model=calibrated_model).run_scenario(by_key[key]).summary
+            self.assertAlmostEqual(calibrated.total_deaths / aggregate.total_deaths, 1.0, delta=0.01, msg=key)
+            self.assertAlmostEqual(calibrated.net_inflation_pct, aggregate.net_inflation_pct, delta=0.1, msg=key)
+
+    def test_idle_mines_do_not_slow_the_epoch(self) -> None:
+        population = MinePopulationModel(mine_count=50_000).for_scenario(
+            _scenario("baseline_10k"), SimConfig()
+        )
+        start = time.perf_counter()
+        for _ in range(84):
+            population.step(active_adventurers=1_000, miner_share_bp=2_200)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertLessEqual(population.staffed_mines, 1_000 * 2_200 // 10_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
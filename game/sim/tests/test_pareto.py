@@ -0,0 +1,75 @@
+import json
+import random
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+from game.sim.pareto import (
+    dominates,
+    non_dominated_sort,
+    parse_objective,
+    pareto_fronts,
+    records_from_results,
+    write_fronts,
+)
+
+
+def _brute_force(vectors):
+    remaining, fronts = set(range(len(vectors))), []
+    while remaining:
+        front = sorted(i for i in remaining if not any(dominates(vectors[j], vectors[i]) for j in remaining))
+        fronts.append(front)
+        remaining -= set(front)
+    return fronts
+
+
+class NonDominatedSortTests(unittest.TestCase):
+    def test_matches_brute_force_with_ties(self) -> None:
+        rng = random.Random(5)
+        for width in (1, 2, 3, 4, 5):
+            for _ in range(20):
+                vectors = [tuple(rng.randint(0, 9) for _ in range(width)) for _ in range(rng.randint(1, 200))]
+                self.assertEqual(non_dominated_sort(vectors), _brute_force(vectors), width)
+
+    def test_max_fronts_truncates(self) -> None:
+        vectors = [(i, -i, i % 7) for i in range(200)] + [(i + 1, -i + 1, 9) for i in range(200)]
+        fronts = non_dominated_sort(vectors, max_fronts=1)
+        self.assertEqual(fronts, _brute_force(vectors)[:1])
+        with self.assertRaises(ValueError):
+            non_dominated_sort(vectors, max_fronts=0)
+
+
+class ParetoArtifactTests(unittest.TestCase):
+    def test_fronts_carry_configs_and_objective_values(self) -> None:
+        results = [ScenarioRunner().run_scenario(replace(s, weeks=1)) for s in build_default_scenarios()]
+        objectives = [parse_objective("net_inflation_pct"), parse_objective("total_new_hexes:max")]
+        artifact = pareto_fronts(records_from_results(results), objectives, max_fronts=None)
+
+        self.assertEqual(artifact["points"], len(results))
+        self.assertEqual(sum(f["size"] for f in artifact["fronts"]), len(results))
+        best = artifact["fronts"][0]
+        by_key = {r.scenario.key: r.summary for r in results}
+        for config, inflation, hexes in zip(
+            best["configs"], best["objectives"]["net_inflation_pct"], best["objectives"]["total_new_hexes"]
+        ):
+            summary = by_key[config["key"]]
+            self.assertEqual((summary.net_inflation_pct, summary.total_new_hexes), (inflation, hexes))
+            self.assertNotIn("notes", config)
+        lowest = min(results, key=lambda r: (r.summary.net_inflation_pct, -r.summary.total_new_hexes))
+        self.assertIn(lowest.scenario.key, [c["key"] for c in best["configs"]])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            write_fronts(artifact, Path(tmp) / "fronts.json")
+            self.assertEqual(json.loads((Path(tmp) / "fronts.json").read_text()), artifact)
+
+    def test_rejects_unknown_objectives(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_objective("net_inflation_pct:lowest")
+        with self.assertRaises(ValueError):
+            pareto_fronts([({}, {"net_inflation_pct": 1.0})], [("no_such_metric", "min")])
+
+
+if __name__ == "__main__":
+    unittest.main()
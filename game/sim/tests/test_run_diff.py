@@ -0,0 +1,73 @@
+import csv
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.run_diff import diff_runs
+
+
+def _write_run(out_dir: Path, config: SimConfig) -> None:
+    runner = ScenarioRunner(config)
+    scenarios = [replace(s, weeks=1) for s in build_default_scenarios()[:3]]
+    runner.write_artifacts([runner.run_scenario(s) for s in scenarios], out_dir)
+
+
+class RunDiffTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls._tmp.name)
+        _write_run(cls.root / "base", SimConfig())
+        _write_run(cls.root / "same", SimConfig())
+        _write_run(cls.root / "changed", SimConfig(target_mints_per_epoch=150))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._tmp.cleanup()
+
+    def test_identical_runs_pass(self) -> None:
+        report = diff_runs(self.root / "base", self.root / "same")
+        self.assertTrue(report["passed"])
+        self.assertEqual(report["scenarios"]["compared"], 3)
+        self.assertEqual(report["columns"]["drift"], {})
+        self.assertEqual(report["summary_deltas"], {})
+        self.assertEqual(report["cells_compared"], 3 * 84 * 18)  # every column but epoch
+
+    def test_config_change_reports_first_divergence_and_summary_deltas(self) -> None:
+        report = diff_runs(self.root / "base", self.root / "changed")
+        self.assertFalse(report["passed"])
+        for key, drift in report["scenario_drift"].items():
+            self.assertEqual(drift["first_divergence_epoch"], 1, key)
+            self.assertIn("minted_adventurers", drift["columns"])
+        minted = report["columns"]["drift"]["minted_adventurers"]
+        self.assertGreater(minted["divergent_cells"], 0)
+        self.assertEqual(minted["first_divergence"]["epoch"], 1)
+        deltas = report["summary_deltas"]["baseline_10k"]["total_minted_adventurers"]
+        self.assertAlmostEqual(deltas["delta"], deltas["head"] - deltas["base"])
+
+        loose = diff_runs(self.root / "base", self.root / "changed", rel_tol=10.0, abs_tol=1e12)
+        self.assertTrue(loose["passed"])
+        self.assertEqual(loose["columns"]["drift"].keys(), report["columns"]["drift"].keys())
+
+    def test_missing_scenarios_and_epochs_are_structural(self) -> None:
+        head = self.root / "trimmed"
+        head.mkdir()
+        (head / "scenario_comparison.csv").write_text((self.root / "base" / "scenario_comparison.csv").read_text())
+        with (self.root / "base" / "timeseries.csv").open(newline="") as f:
+            rows = list(csv.reader(f))
+        last = rows[-1][0]
+        kept = [rows[0]] + [r for r in rows[1:] if r[0] != "baseline_10k" and not (r[0] == last and r[1] == "84")]
+        with (head / "timeseries.csv").open("w", newline="") as f:
+            csv.writer(f).writerows(kept)
+
+        report = diff_runs(self.root / "base", head)
+        self.assertFalse(report["passed"])
+        self.assertEqual(report["scenarios"]["only_base"], ["baseline_10k"])
+        trimmed = report["scenario_drift"][last]
+        self.assertEqual((trimmed["epochs_only_base"], trimmed["columns"]), (1, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
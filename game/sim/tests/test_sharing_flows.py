@@ -0,0 +1,124 @@
+import unittest
+from dataclasses import replace
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.cairo_parity import alloc_from_bp_floor_u32, nearest_scope_level
+from game.sim.sharing_flows import SHARE_RECIPIENT_LIMIT, SharingMatrix, SharingModel
+
+
+def _settle_by_rule(matrix: SharingMatrix, harvest: int) -> tuple:
+    """One epoch rule by rule from the matrix's current routing: exact and contract-floored payouts."""
+    alive = [pos >= 0 for pos in matrix._live_pos]
+    weights = sum(w for w, live in zip(matrix.weight, alive) if live)
+    exact, floored = [], []
+    for rule, grantee in enumerate(matrix.grantee):
+        rank = matrix.rule_owner[rule]
+        slot, flags = matrix.owners[rank], matrix.enabled[rank]
+        settles_at = nearest_scope_level(bool(flags & 4), bool(flags & 2), bool(flags & 1))
+        paying = alive[slot] and matrix.scope[rule] == settles_at
+        gross = harvest * matrix.weight[slot] / weights if paying else 0.0
+        exact.append(gross * matrix.share_bp[rule] / 10_000)
+        floored.append(alloc_from_bp_floor_u32(int(gross), matrix.share_bp[rule]))
+    return exact, floored
+
+
+class SharingMatrixTests(unittest.TestCase):
+    def test_settlement_matches_rule_by_rule_allocation(self) -> None:
+        model = SharingModel(policy_bp=6_000, max_recipients=8, mutation_bp=2_000)
+        matrix = SharingMatrix(model, initial_adventurers=300)
+        exact_paid, floored_paid = [], []
+        stranded = expected_stranded = 0.0
+        churn = ((0, 0), (40, 0), (0, 60), (10, 30), (110, 0), (0, 0), (0, 160), (5, 5))
+        for epoch, (minted, deaths) in enumerate(churn):
+            matrix.churn(minted=minted, deaths=deaths)
+            stranded += matrix.step(extraction_energy=91_357 + epoch, miner_share_bp=3_000)
+            exact, floored = _settle_by_rule(matrix, (91_357 + epoch) * 7_000 // 10_000)
+            for paid, epoch_paid in ((exact_paid, exact), (floored_paid, floored)):
+                paid.extend([0] * (len(epoch_paid) - len(paid)))
+                paid[:] = [a + b for a, b in zip(paid, epoch_paid)]
+            dead = [matrix._live_pos[grantee] < 0 for grantee in matrix.grantee]
+            expected_stranded += sum(p for p, d in zip(exact, dead) if d)
+
+        self.assertEqual(matrix.live_slots, 300 + 165 - 255)
+        self.assertEqual(matrix.slots, 465)
+        rule_paid = matrix.rule_paid()
+        for got, exact, floored in zip(rule_paid, exact_paid, floored_paid):
+            self.assertLessEqual(abs(got - exact), 0.5 + 1e-6)
+            # The contract floors each settlement: under one energy per epoch.
+            self.assertLessEqual(0, got - floored + 0.5)
+            self.assertLessEqual(got - floored, len(churn))
+        self.assertAlmostEqual(matrix.total_shared, sum(exact_paid), delta=1e-6 * sum(exact_paid))
+        self.assertEqual(matrix.total_stranded, stranded)
+        self.assertLess(expected_stranded - stranded, 1.0)
+        self.assertGreater(stranded, 0)
+        self.assertGreater(matrix.mutations, 0)
+
+    def test_deaths_pick_random_slots_and_mints_never_revive_them(self) -> None:
+        matrix = SharingMatrix(SharingModel(), initial_adventurers=1_000)
+        matrix.churn(minted=0, deaths=500)
+        dead = {slot for slot, pos in enumerate(matrix._live_pos) if pos < 0}
+        self.assertEqual(len(dead), 500)
+        # Not the newest half: deaths land across the whole population.
+        self.assertGreater(len(dead & set(range(500))), 150)
+        matrix.churn(minted=200, deaths=0)
+        self.assertEqual(matrix.slots, 1_200)
+        self.assertEqual(matrix.live_slots, 700)
+        self.assertTrue(all(matrix._live_pos[slot] < 0 for slot in dead))
+        self.assertTrue(all(matrix._live_pos[slot] >= 0 for slot in range(1_000, 1_200)))
+        # New rules only name live adventurers.
+        first_new = matrix.owner_ptr[next(r for r, slot in enumerate(matrix.owners) if slot >= 1_000)]
+        self.assertFalse(any(grantee in dead for grantee in matrix.grantee[first_new:]))
+
+    def test_rules_respect_contract_limits_and_income_is_conserved(self) -> None:
+        matrix = SharingMatrix(SharingModel(max_recipients=12), initial_adventurers=2_000)
+        for minted, deaths in ((0, 0), (100, 0), (0, 200)):
+            matrix.churn(minted=minted, deaths=deaths)
+            matrix.step(extraction_energy=500_000, miner_share_bp=2_500)
+        totals: dict = {}
+        for rule, grantee in enumerate(matrix.grantee):
+            key = (matrix.rule_owner[rule], matrix.scope[rule])
+            count, bp = totals.get(key, (0, 0))
+            totals[key] = (count + 1, bp + matrix.share_bp[rule])
+            self.assertNotEqual(grantee, matrix.owners[matrix.rule_owner[rule]])
+        self.assertTrue(all(count <= SHARE_RECIPIENT_LIMIT and bp <= 10_000 for count, bp in totals.values()))
+        self.assertEqual(sum(matrix.net_income()), sum(matrix.gross_income()))
+
+        metrics = matrix.metrics()
+        self.assertEqual((metrics["slots"], metrics["live_slots"]), (2_100, 1_900))
+        self.assertGreater(metrics["shared_bp"], 0)
+        self.assertGreater(metrics["dead_grantee_rules"], 0)
+        self.assertNotEqual(metrics["net_income_gini_bp"], metrics["gross_income_gini_bp"])
+
+
+class SharingRunnerTests(unittest.TestCase):
+    def test_sharing_without_deaths_leaves_energy_accounting_unchanged(self) -> None:
+        config = SimConfig(base_collapse_prob_bp=0)
+        scenario = replace(
+            build_default_scenarios()[0], weeks=1, initial_active_adventurers=2_000, collapse_shock_prob_bp=-100
+        )
+        flat = ScenarioRunner(config).run_scenario(scenario)
+        self.assertEqual(flat.summary.total_deaths, 0)
+        shared = ScenarioRunner(config, sharing_model=SharingModel()).run_scenario(scenario)
+        self.assertEqual(shared.summary, flat.summary)
+        sharing = shared.components["sharing"]
+        self.assertEqual(sharing["slots"], 2_000 + flat.summary.total_minted_adventurers)
+        self.assertGreater(sharing["shared_energy"], 0)
+        self.assertEqual(sharing["stranded_energy"], 0)
+
+    def test_shares_stranded_on_dead_grantees_leave_circulation(self) -> None:
+        scenario = replace(build_default_scenarios()[0], weeks=2)
+        flat = ScenarioRunner(SimConfig()).run_scenario(scenario)
+        shared = ScenarioRunner(SimConfig(), sharing_model=SharingModel()).run_scenario(scenario)
+        sharing = shared.components["sharing"]
+        self.assertEqual(sharing["deaths"], shared.summary.total_deaths)
+        self.assertEqual(sharing["live_slots"], shared.summary.final_active_adventurers)
+        stranded = sharing["stranded_energy"]
+        self.assertGreater(stranded, 0)
+        # Stranded shares are locked net of the conversion tax they never pay.
+        locked = shared.summary.locked_capital_energy - flat.summary.locked_capital_energy
+        self.assertGreater(locked, 0)
+        self.assertLessEqual(locked, stranded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import http.client
+import json
+import threading
+import unittest
+
+from game.sim.sim_service import ServiceBusy, SimJob, SimulationService, make_server
+
+
+def _messages(job) -> list:
+    return [json.loads(line) for line in job.stream()]
+
+
+class SimulationServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = SimulationService(max_workers=1, max_pending=4)
+
+    def tearDown(self) -> None:
+        self.service.shutdown()
+
+    def test_scenario_streams_rows_then_summary(self) -> None:
+        job, created = self.service.submit({"scenario": {"base": "baseline_10k", "weeks": 1}})
+        self.assertTrue(created)
+        messages = _messages(job)
+        rows = [m for m in messages if m["type"] == "row"]
+        self.assertEqual(len(rows), 84)
+        self.assertEqual(rows[-1]["progress"], 1.0)
+        self.assertEqual(messages[-2]["type"], "summary")
+        self.assertEqual(messages[-2]["summary"]["epochs"], 84)
+        self.assertEqual(messages[-1], {"type": "done", "scenario_count": 1})
+
+    def test_identical_in_flight_requests_share_one_run(self) -> None:
+        blocker, _ = self.service.submit({"scenario": {"base": "collapse_wave", "weeks": 24}})
+        payload = {"scenario": {"base": "baseline_10k", "weeks": 2}}
+        first, created_first = self.service.submit(payload)
+        second, created_second = self.service.submit(payload)
+        self.assertTrue(created_first)
+        self.assertFalse(created_second)
+        self.assertIs(first, second)
+        self.assertEqual(_messages(first), _messages(second))
+        _messages(blocker)
+        self.assertEqual(self.service.runs_started, 2)
+        self.assertEqual(self.service.dedup_hits, 1)
+
+    def test_invalid_requests_are_rejected_before_queueing(self) -> None:
+        with self.assertRaises(ValueError):
+            self.service.submit({"scenario": {"base": "nope"}})
+        with self.assertRaises(ValueError):
+            self.service.submit({"scenario": {"weeks": 1, "bogus": 1}})
+        self.assertEqual(self.service.runs_started, 0)
+
+    def test_job_keeps_a_bounded_ring_and_reports_gaps(self) -> None:
+        job = SimJob("k", history=10)
+        early = job.stream()
+        job.publish({"n": 0})
+        self.assertEqual(json.loads(next(early)), {"n": 0})
+        for n in range(1, 30):
+            job.publish({"n": n})
+        job.close()
+        self.assertEqual(len(job._messages), 10)
+        self.assertEqual(
+            [json.loads(line) for line in early],
+            [{"type": "gap", "dropped": 19}] + [{"n": n} for n in range(20, 30)],
+        )
+        self.assertEqual(_messages(job)[0], {"type": "gap", "dropped": 20})
+
+    def test_full_queue_reports_busy(self) -> None:
+        service = SimulationService(max_workers=1, max_pending=0)
+        try:
+            job, _ = service.submit({"scenario": {"weeks": 8}})
+            with self.assertRaises(ServiceBusy):
+                service.submit({"scenario": {"weeks": 9}})
+            _messages(job)
+        finally:
+            service.shutdown()
+
+    def test_http_sweep_streams_ndjson(self) -> None:
+        server = make_server(port=0, service=self.service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+            body = json.dumps(
+                {
+                    "scenarios": [{"weeks": 1}, {"base": "whale_pressure", "weeks": 1}],
+                    "config": {"mode": "design_intended"},
+                }
+            )
+            conn.request("POST", "/sweep", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            messages = [json.loads(line) for line in response.read().splitlines()]
+            summaries = [m["summary"] for m in messages if m["type"] == "summary"]
+            self.assertEqual([s["key"] for s in summaries], ["baseline_10k", "whale_pressure"])
+            self.assertEqual(summaries[0]["mode"], "design_intended")
+
+            for body in ("[]", "1", '"scenario"'):
+                conn.request("POST", "/scenario", body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                self.assertEqual(response.status, 400, body)
+                self.assertIn("JSON object", json.loads(response.read())["error"])
+
+            conn.request("GET", "/health")
+            health = json.loads(conn.getresponse().read())
+            self.assertTrue(health["ok"])
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, scenario_from_spec
+from game.sim.surrogate import KNOBS, TARGETS, Surrogate, fit_surrogate, knob_vector, sample_specs
+
+BOUNDS = {
+    "demand_shock_bp": (-3_000, 3_000),
+    "raider_share_bp": (1_000, 3_500),
+    "initial_active_adventurers": (6_000, 14_000),
+}
+INSIDE = {
+    "base": "baseline_10k",
+    "weeks": 1,
+    "demand_shock_bp": 500,
+    "raider_share_bp": 2_000,
+    "initial_active_adventurers": 9_000,
+}
+
+
+class SurrogateTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        runner = ScenarioRunner()
+        specs = sample_specs(90, seed=4, bounds=BOUNDS)
+        cls.results = [runner.run_scenario(scenario_from_spec({**spec, "weeks": 1})) for spec in specs]
+        cls.model = fit_surrogate(cls.results, holdout=0.25)
+
+    def test_sample_specs_stratify_each_knob(self) -> None:
+        specs = sample_specs(10, seed=1, bounds={"raider_share_bp": (0, 1_000)})
+        self.assertEqual(sorted(s["raider_share_bp"] // 100 for s in specs), list(range(10)))
+        self.assertEqual(len({s["key"] for s in specs}), 10)
+
+    def test_fit_reports_held_out_error(self) -> None:
+        self.assertEqual(self.model.samples, 90)
+        self.assertEqual(set(self.model.holdout), set(TARGETS))
+        for name in ("final_active_adventurers", "total_minted_adventurers", "total_energy_sources"):
+            self.assertGreater(self.model.holdout[name]["r2"], 0.95, name)
+
+    def test_round_trip_and_range_flags(self) -> None:
+        inside, outside = INSIDE, dict(INSIDE, demand_shock_bp=6_000)
+        with tempfile.TemporaryDirectory() as tmp:
+            self.model.save(Path(tmp) / "model.json")
+            loaded = Surrogate.load(Path(tmp) / "model.json")
+        answers = loaded.query([inside, outside])
+        self.assertEqual(answers[0].metrics, self.model.query([inside])[0].metrics)
+        self.assertTrue(answers[0].in_range)
+        self.assertEqual(answers[1].out_of_range, ("demand_shock_bp",))
+        # Knobs held fixed in training count as out of range when moved.
+        self.assertIn("weeks", self.model.query([dict(inside, weeks=2)])[0].out_of_range)
+
+        actual = ScenarioRunner().run_scenario(scenario_from_spec(inside)).summary
+        predicted = answers[0].metrics["total_minted_adventurers"]
+        self.assertLess(abs(predicted - actual.total_minted_adventurers), 0.05 * actual.total_minted_adventurers)
+
+    def test_rejects_underdetermined_fit(self) -> None:
+        with self.assertRaises(ValueError):
+            fit_surrogate(self.results[:5], holdout=0)
+        self.assertEqual(len(knob_vector(self.results[0].scenario)), len(KNOBS))
+
+
+if __name__ == "__main__":
+    unittest.main()
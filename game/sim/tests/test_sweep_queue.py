@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+from game.sim.sweep_queue import SweepWorker, enqueue_sweep, merge_results
+
+
+def _short_matrix():
+    return [replace(s, weeks=1) for s in build_default_scenarios()]
+
+
+def _work(queue_dir: str) -> None:
+    SweepWorker(Path(queue_dir), lease_timeout=5.0, poll_interval=0.05).run()
+
+
+class SweepQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.queue_dir = self.tmp / "queue"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _assert_matches_direct_run(self, out_dir: Path) -> None:
+        direct_dir = self.tmp / "direct"
+        ScenarioRunner().run_matrix(_short_matrix(), direct_dir)
+        for name in ("scenario_comparison.csv", "timeseries.csv", "run_summary.json"):
+            self.assertEqual(
+                (out_dir / name).read_bytes(), (direct_dir / name).read_bytes(), name
+            )
+
+    def test_worker_processes_share_queue_and_merge_matches_run_matrix(self) -> None:
+        self.assertEqual(enqueue_sweep(self.queue_dir, _short_matrix(), shard_size=2), 6)
+        workers = [
+            multiprocessing.Process(target=_work, args=(str(self.queue_dir),)) for _ in range(3)
+        ]
+        for proc in workers:
+            proc.start()
+        for proc in workers:
+            proc.join(timeout=60)
+            self.assertEqual(proc.exitcode, 0)
+
+        self.assertEqual(list((self.queue_dir / "leases").iterdir()), [])
+        out_dir = self.tmp / "merged"
+        self.assertEqual(len(merge_results(self.queue_dir, out_dir)), 12)
+        self._assert_matches_direct_run(out_dir)
+
+    def test_abandoned_lease_is_taken_over_after_expiry(self) -> None:
+        enqueue_sweep(self.queue_dir, _short_matrix(), shard_size=6)
+        lease = self.queue_dir / "leases" / "shard-00000.lease"
+        lease.write_text("killed-worker", encoding="utf-8")
+        stale = time.time() - 30
+        os.utime(lease, (stale, stale))
+
+        worker = SweepWorker(self.queue_dir, lease_timeout=10.0, poll_interval=0.01)
+        self.assertEqual(sorted(worker.run()), [0, 1])
+        out_dir = self.tmp / "merged"
+        merge_results(self.queue_dir, out_dir)
+        self._assert_matches_direct_run(out_dir)
+
+    def test_killed_worker_process_does_not_block_the_sweep(self) -> None:
+        enqueue_sweep(self.queue_dir, [replace(s, weeks=52) for s in _short_matrix()[:2]], shard_size=1)
+        victim = multiprocessing.Process(target=_work, args=(str(self.queue_dir),))
+        victim.start()
+        lease = self.queue_dir / "leases" / "shard-00000.lease"
+        deadline = time.time() + 30
+        while not lease.exists() and time.time() < deadline:
+            time.sleep(0.005)
+        victim.kill()
+        victim.join()
+
+        worker = SweepWorker(self.queue_dir, lease_timeout=0.5, poll_interval=0.05)
+        worker.run()
+        self.assertEqual(len(merge_results(self.queue_dir, self.tmp / "merged")), 2)
+
+    def test_late_takeover_backs_off_from_a_replaced_lease(self) -> None:
+        enqueue_sweep(self.queue_dir, _short_matrix()[:2], shard_size=1)
+        lease = self.queue_dir / "leases" / "shard-00000.lease"
+        lease.write_text("winner", encoding="utf-8")
+        worker = SweepWorker(self.queue_dir, lease_timeout=60.0)
+        # The expiry check saw the old, stale lease; the winner has replaced it since.
+        checks = iter([True])
+        real_expired = worker._expired
+        worker._expired = lambda path: next(checks, None) or real_expired(path)
+        self.assertFalse(worker._claim(0))
+        self.assertEqual(lease.read_text(encoding="utf-8"), "winner")
+        self.assertEqual(list((self.queue_dir / "leases").iterdir()), [lease])
+
+    def test_live_lease_is_not_stolen_and_merge_requires_all_shards(self) -> None:
+        enqueue_sweep(self.queue_dir, _short_matrix()[:2], shard_size=1)
+        (self.queue_dir / "leases" / "shard-00000.lease").write_text("busy", encoding="utf-8")
+        worker = SweepWorker(self.queue_dir, lease_timeout=60.0)
+        self.assertFalse(worker._claim(0))
+        self.assertTrue(worker._claim(1))
+        with self.assertRaises(RuntimeError):
+            merge_results(self.queue_dir, self.tmp / "merged")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import json
+import tempfile
+import unittest
+from collections import Counter
+from dataclasses import replace
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, SimConfig, build_default_scenarios
+from game.sim.territory import (
+    AXIS_OFFSET,
+    BIOME_UPKEEP,
+    BIOMES,
+    CLAIMABLE_DECAY_THRESHOLD,
+    DECAY_PERIOD_BLOCKS,
+    ClaimableIndex,
+    Territory,
+    TerritoryModel,
+    decode_cube,
+    encode_cube,
+    is_adjacent,
+    neighbor,
+    neighbor_packed,
+    periods_until_claimable,
+    process_hex_decay,
+    spiral,
+)
+
+
+class HexCodecTests(unittest.TestCase):
+    def test_encode_matches_coord_codec_packing(self) -> None:
+        self.assertEqual(encode_cube((0, 0, 0)), AXIS_OFFSET * ((1 << 42) + (1 << 21) + 1))
+        self.assertIsNone(encode_cube((1, 1, 0)))
+        self.assertIsNone(encode_cube((AXIS_OFFSET, -AXIS_OFFSET, 0)))
+        for coord in [(3, -5, 2), (-AXIS_OFFSET, AXIS_OFFSET - 1, 1), (0, 7, -7)]:
+            self.assertEqual(decode_cube(encode_cube(coord)), coord)
+        for direction in range(6):
+            coord = (4, -1, -3)
+            self.assertTrue(is_adjacent(coord, neighbor(coord, direction)))
+            self.assertEqual(
+                neighbor_packed(encode_cube(coord), direction), encode_cube(neighbor(coord, direction))
+            )
+
+    def test_spiral_fills_rings_without_gaps(self) -> None:
+        coords = list(spiral(19))
+        self.assertEqual(len(set(coords)), 19)
+        ring_one = coords[1:7]
+        self.assertTrue(all(is_adjacent((0, 0, 0), c) for c in ring_one))
+        ring_two = coords[7:]
+        for a, b in zip(ring_two, ring_two[1:] + ring_two[:1]):
+            self.assertTrue(is_adjacent(a, b))
+
+
+class HexDecayTests(unittest.TestCase):
+    def test_decay_transition_matches_contract(self) -> None:
+        covered = process_hex_decay(100, 0, 0, 0, 250, 100, 25, 80)
+        self.assertEqual((covered.reserve, covered.decay_level, covered.periods_processed), (50, 0, 2))
+        self.assertEqual(covered.last_decay_processed_block, 200)
+
+        tipped = process_hex_decay(10, 60, 0, 0, 100, 100, 45, 80)
+        self.assertEqual((tipped.reserve, tipped.decay_level), (0, 95))
+        self.assertTrue(tipped.became_claimable)
+        self.assertEqual(tipped.claimable_since_block, 100)
+
+        capped = process_hex_decay(0, 95, 100, 100, 600, 100, 90, 80)
+        self.assertEqual(capped.decay_level, 100)
+        self.assertFalse(capped.became_claimable)
+        self.assertEqual(capped.claimable_since_block, 100)
+
+        idle = process_hex_decay(10, 0, 100, 0, 150, 100, 25, 80)
+        self.assertEqual(idle.periods_processed, 0)
+        self.assertEqual(periods_until_claimable(100, 0, 25, 80), 8)
+
+    def test_claimable_index_returns_oldest_and_skips_removed(self) -> None:
+        index = ClaimableIndex()
+        for hex_id, since in [(1, 300), (2, 100), (3, 200)]:
+            index.push(hex_id, since)
+        index.discard(2)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.pop_oldest(), (200, 3))
+        self.assertEqual(index.peek_oldest(), (300, 1))
+        self.assertNotIn(3, index)
+
+
+class TerritoryTests(unittest.TestCase):
+    def test_lapsed_hexes_decay_lazily_then_expire_unclaimed(self) -> None:
+        model = TerritoryModel(base_lapse_bp=10_000, claim_attempt_bp=0, abandon_after_blocks=300)
+        territory = Territory(model, initial_hexes=7, owner_count=2, raider_share_bp=0)
+        territory.step(block_number=100, active_adventurers=0, new_hexes=0, surplus_band=0)
+        self.assertGreater(territory.total_lapses, 0)
+        self.assertEqual(len(territory.claimable), 0)
+        territory.model = replace(model, base_lapse_bp=0)
+
+        lapsed = [s for s in range(7) if territory.lapsed_block[s] == 100]
+        due = {
+            s: 100
+            + DECAY_PERIOD_BLOCKS
+            * periods_until_claimable(
+                territory.reserve[s], 0, BIOME_UPKEEP[BIOMES[territory.biome[s]]], CLAIMABLE_DECAY_THRESHOLD
+            )
+            for s in lapsed
+        }
+        block = 100
+        while len(territory.claimable) + territory.total_abandoned < len(lapsed):
+            block += DECAY_PERIOD_BLOCKS
+            territory.step(block_number=block, active_adventurers=0, new_hexes=0, surplus_band=0)
+        self.assertEqual(block, max(due.values()))
+        waits = [d - 100 for d in due.values()]
+        self.assertEqual(territory.time_to_claimable.count, len(lapsed))
+        self.assertEqual((territory.time_to_claimable.min, territory.time_to_claimable.max), (min(waits), max(waits)))
+        self.assertEqual(territory.concentration.total, territory.controlled_hexes)
+
+        for _ in range(4):
+            block += DECAY_PERIOD_BLOCKS
+            territory.step(block_number=block, active_adventurers=0, new_hexes=0, surplus_band=0)
+        self.assertEqual(territory.total_abandoned, len(lapsed))
+        self.assertEqual(territory.controlled_hexes, 7 - len(lapsed))
+
+    def test_raiders_claim_oldest_claimable_hexes(self) -> None:
+        model = TerritoryModel(base_lapse_bp=10_000, claim_attempt_bp=10_000)
+        territory = Territory(model, initial_hexes=37, owner_count=3, raider_share_bp=0)
+        for block in range(100, 2_100, 100):
+            territory.step(block_number=block, active_adventurers=100, new_hexes=1, surplus_band=0)
+        self.assertGreater(territory.total_claims, 0)
+        self.assertEqual(territory.controlled_hexes, 37 + territory.total_expansions - territory.total_abandoned)
+        self.assertGreater(max(territory.controller), 2)
+        held = Counter(territory.controller[s] for s in range(len(territory.controller)) if territory.owned[s])
+        self.assertEqual(territory.concentration.counts, dict(held))
+        self.assertGreater(territory.metrics()["churn_rate_bp"], 0)
+
+    def test_defended_hex_that_stays_claimable_stays_lapsed_until_abandoned(self) -> None:
+        model = TerritoryModel(base_lapse_bp=0, claim_attempt_bp=0, abandon_after_blocks=300)
+        territory = Territory(model, initial_hexes=2, owner_count=1, raider_share_bp=0)
+        for slot in (0, 1):
+            territory.lapsed_block[slot] = 100
+            territory.decay_level[slot] = 100
+            territory.claimable_since[slot] = 200
+        upkeep = BIOME_UPKEEP[BIOMES[territory.biome[0]]]
+        # One period of upkeep recovers 4 decay: still claimable, still lapsed.
+        territory._maintain(0, upkeep)
+        self.assertEqual((territory.decay_level[0], territory.lapsed_block[0]), (96, 100))
+        self.assertIn(0, territory.claimable)
+        # Enough to recover below the threshold resumes upkeep.
+        territory._maintain(1, 100 * BIOME_UPKEEP[BIOMES[territory.biome[1]]])
+        self.assertEqual((territory.decay_level[1], territory.lapsed_block[1], territory.claimable_since[1]), (0, 0, 0))
+
+        territory.step(block_number=500, active_adventurers=0, new_hexes=0, surplus_band=0)
+        self.assertEqual((territory.total_abandoned, territory.controlled_hexes), (1, 1))
+        self.assertFalse(territory.owned[0])
+
+
+class TerritoryRunnerTests(unittest.TestCase):
+    def test_runner_reports_territory_metrics_in_run_summary(self) -> None:
+        scenarios = [replace(s, weeks=2) for s in build_default_scenarios()[:2]]
+        runner = ScenarioRunner(SimConfig(), territory_model=TerritoryModel())
+        with tempfile.TemporaryDirectory() as tmp:
+            results = runner.run_matrix(scenarios, Path(tmp))
+            summary = json.loads((Path(tmp) / "run_summary.json").read_text(encoding="utf-8"))
+        for result in results:
+            metrics = result.components["territory"]
+            self.assertEqual(metrics["controlled_hexes"], result.summary.final_controlled_hexes)
+            self.assertGreater(metrics["total_claims"], 0)
+        self.assertEqual(
+            summary["components"]["baseline_10k"]["territory"], results[0].components["territory"]
+        )
+
+        default = ScenarioRunner().run_scenario(scenarios[0])
+        self.assertEqual(default.components, {})
+
+    def test_unclaimed_lapses_are_abandoned_unlike_the_aggregate_counter(self) -> None:
+        choke = next(s for s in build_default_scenarios() if s.key == "deflationary_choke")
+        scenario = replace(choke, weeks=2)
+        flat = ScenarioRunner(SimConfig()).run_scenario(scenario)
+        # Without standing raiders most lapsed hexes go unclaimed and are abandoned;
+        # the aggregate counter only ever trims expansion.
+        result = ScenarioRunner(SimConfig(), territory_model=TerritoryModel(base_raider_share_bp=0)).run_scenario(
+            scenario
+        )
+        territory = result.components["territory"]
+        self.assertGreater(territory["total_abandoned"], 0)
+        self.assertLess(result.summary.final_controlled_hexes, flat.summary.final_controlled_hexes * 0.95)
+        self.assertNotEqual(result.summary.total_energy_sinks, flat.summary.total_energy_sinks)
+
+
+if __name__ == "__main__":
+    unittest.main()
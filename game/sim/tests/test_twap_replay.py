@@ -0,0 +1,68 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from game.sim.bootstrap_world_sim import ScenarioRunner, build_default_scenarios
+from game.sim.twap_replay import compile_price_file, load_price_stream
+
+
+def _write_csv(path: Path, ticks) -> None:
+    lines = ["block_number,price_usdc_per_energy"]
+    lines.extend(f"{block},{price}" for block, price in ticks)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class TwapReplayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.csv_path = self.tmp / "prices.csv"
+        _write_csv(self.csv_path, [(1_000, 0.08), (1_050, 0.10), (1_200, 0.06)])
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_epoch_twaps_are_time_weighted(self) -> None:
+        stream = load_price_stream(self.csv_path)
+        twaps = stream.epoch_twaps(epochs=3, blocks_per_epoch=100)
+        self.assertAlmostEqual(twaps[0], (50 * 0.08 + 50 * 0.10) / 100)
+        self.assertAlmostEqual(twaps[1], (100 * 0.10 + 0 * 0.06) / 100)
+        # Last price is held flat past the final tick.
+        self.assertAlmostEqual(twaps[2], 0.06)
+
+    def test_binary_file_matches_csv_and_is_memory_mapped(self) -> None:
+        bin_path = self.tmp / "prices.bin"
+        self.assertEqual(compile_price_file(self.csv_path, bin_path), 3)
+        from_csv = load_price_stream(self.csv_path).epoch_twaps(5, 100, start_block=900)
+        with load_price_stream(bin_path) as stream:
+            self.assertIsInstance(stream.blocks, memoryview)
+            self.assertEqual(stream.epoch_twaps(5, 100, start_block=900), from_csv)
+
+    def test_pickle_reopens_mapping_by_path(self) -> None:
+        bin_path = self.tmp / "prices.bin"
+        compile_price_file(self.csv_path, bin_path)
+        with load_price_stream(bin_path) as stream:
+            clone = pickle.loads(pickle.dumps(stream))
+            with clone:
+                self.assertEqual(clone.path, bin_path)
+                self.assertEqual(clone.epoch_twaps(2, 100), stream.epoch_twaps(2, 100))
+
+    def test_unsorted_csv_is_rejected(self) -> None:
+        bad = self.tmp / "bad.csv"
+        _write_csv(bad, [(200, 0.1), (100, 0.1)])
+        with self.assertRaises(ValueError):
+            load_price_stream(bad)
+
+    def test_runner_feeds_replayed_twap_into_timeseries(self) -> None:
+        stream = load_price_stream(self.csv_path)
+        runner = ScenarioRunner(twap_source=stream)
+        baseline = next(s for s in build_default_scenarios() if s.key == "baseline_10k")
+        result = runner.run_scenario(baseline)
+        expected = stream.epoch_twaps(result.summary.epochs, runner.config.blocks_per_epoch)
+        self.assertAlmostEqual(result.timeseries[0]["twap_usdc_per_energy"], round(expected[0], 6))
+        self.assertEqual(result.summary.final_twap_usdc_per_energy, 0.06)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Recorded TWAP replay for the bootstrap world simulator.
+
+Replays a recorded USDC/energy price stream (for example exported Ekubo swap
+ticks) instead of the synthetic TWAP path in `ScenarioRunner.run_scenario`.
+
+Two input formats are supported:
+
+- CSV with `block_number,price_usdc_per_energy` columns (header required).
+- A compiled binary file produced by `compile_price_file`. The binary layout is
+  columnar so it can be memory mapped and read without parsing:
+
+  ```text
+  magic      8 bytes   b"TWAPREP1"
+  count      int64
+  blocks     int64[count]    tick block numbers, ascending
+  prices     float64[count]  spot price after the tick
+  cumulative float64[count]  price * blocks integral up to each tick
+  ```
+
+Resampling to epoch boundaries uses the cumulative column (the same shape as
+an Ekubo oracle snapshot), so each epoch TWAP costs two binary searches instead
+of a scan over the ticks in its window.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import sys
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+BINARY_MAGIC = b"TWAPREP1"
+_HEADER_BYTES = len(BINARY_MAGIC) + 8
+_CSV_BLOCK_COLUMNS = ("block_number", "block")
+_CSV_PRICE_COLUMNS = ("price_usdc_per_energy", "price")
+
+
+class PriceStream:
+    """Read-only view over recorded price ticks.
+
+    Columns are exposed as sequences so they can be backed either by arrays
+    (CSV input) or by memoryviews over a read-only memory map (binary input).
+    Pickling reopens the source path, so worker processes share the mapped
+    pages through the OS page cache instead of copying the columns.
+    """
+
+    def __init__(
+        self,
+        blocks: Sequence[int],
+        prices: Sequence[float],
+        cumulative: Sequence[float],
+        *,
+        path: Path | None = None,
+        _mapping: mmap.mmap | None = None,
+    ) -> None:
+        if not (len(blocks) == len(prices) == len(cumulative)):
+            raise ValueError("price stream columns must have equal length")
+        if len(blocks) == 0:
+            raise ValueError("price stream has no ticks")
+        self.blocks = blocks
+        self.prices = prices
+        self.cumulative = cumulative
+        self.path = path
+        self._mapping = _mapping
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __reduce__(self):
+        if self.path is None:
+            return (
+                PriceStream,
+                (array("q", self.blocks), array("d", self.prices), array("d", self.cumulative)),
+            )
+        return (load_price_stream, (self.path,))
+
+    def __enter__(self) -> "PriceStream":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mapping is None:
+            return
+        for column in (self.blocks, self.prices, self.cumulative):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mapping.close()
+        self._mapping = None
+
+    @property
+    def first_block(self) -> int:
+        return int(self.blocks[0])
+
+    def cumulative_at(self, block: int) -> float:
+        """Price integral from the first tick up to `block`.
+
+        The price is held flat before the first tick and after the last one.
+        """
+        first = self.blocks[0]
+        if block <= first:
+            return self.prices[0] * (block - first)
+        idx = bisect_right(self.blocks, block) - 1
+        return self.cumulative[idx] + self.prices[idx] * (block - self.blocks[idx])
+
+    def twap(self, start_block: int, end_block: int) -> float:
+        if end_block <= start_block:
+            raise ValueError("twap window must span at least one block")
+        return (self.cumulative_at(end_block) - self.cumulative_at(start_block)) / (
+            end_block - start_block
+        )
+
+    def epoch_twaps(
+        self,
+        epochs: int,
+        blocks_per_epoch: int,
+        start_block: int | None = None,
+    ) -> List[float]:
+        """Resample to per-epoch TWAPs; entry `k` covers epoch `k + 1`."""
+        if blocks_per_epoch <= 0:
+            raise ValueError("blocks_per_epoch must be positive")
+        origin = self.first_block if start_block is None else start_block
+        boundaries = [self.cumulative_at(origin + i * blocks_per_epoch) for i in range(epochs + 1)]
+        return [
+            (boundaries[i + 1] - boundaries[i]) / blocks_per_epoch for i in range(epochs)
+        ]
+
+
+def load_price_stream(path: str | Path) -> PriceStream:
+    """Open a CSV or compiled binary price file through a read-only mmap."""
+    path = Path(path)
+    with path.open("rb") as handle:
+        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapping[: len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return _map_binary(path, mapping)
+
+    try:
+        blocks, prices = _parse_csv(mapping)
+    finally:
+        mapping.close()
+    return PriceStream(blocks, prices, _cumulative(blocks, prices), path=path)
+
+
+def compile_price_file(src: str | Path, dst: str | Path) -> int:
+    """Convert a CSV price file into the memory-mappable binary layout."""
+    stream = load_price_stream(src)
+    with stream:
+        blocks = array("q", stream.blocks)
+        prices = array("d", stream.prices)
+        cumulative = array("d", stream.cumulative)
+
+    with Path(dst).open("wb") as handle:
+        handle.write(BINARY_MAGIC)
+        handle.write(array("q", [len(blocks)]).tobytes())
+        blocks.tofile(handle)
+        prices.tofile(handle)
+        cumulative.tofile(handle)
+    return len(blocks)
+
+
+def _map_binary(path: Path, mapping: mmap.mmap) -> PriceStream:
+    if sys.byteorder != "little":
+        mapping.close()
+        raise ValueError("binary price files are little-endian only")
+
+    view = memoryview(mapping)
+    count = view[len(BINARY_MAGIC) : _HEADER_BYTES].cast("q")[0]
+    expected = _HEADER_BYTES + count * 8 * 3
+    if count <= 0 or len(mapping) != expected:
+        view.release()
+        mapping.close()
+        raise ValueError(f"corrupt price file {path}: expected {expected} bytes")
+
+    def column(index: int, fmt: str) -> memoryview:
+        start = _HEADER_BYTES + index * count * 8
+        return view[start : start + count * 8].cast(fmt)
+
+    stream = PriceStream(
+        column(0, "q"),
+        column(1, "d"),
+        column(2, "d"),
+        path=path,
+        _mapping=mapping,
+    )
+    view.release()
+    return stream
+
+
+def _parse_csv(mapping: mmap.mmap) -> Tuple[array, array]:
+    header = mapping.readline().decode("utf-8").strip().split(",")
+    block_col = _column_index(header, _CSV_BLOCK_COLUMNS)
+    price_col = _column_index(header, _CSV_PRICE_COLUMNS)
+
+    blocks = array("q")
+    prices = array("d")
+    for raw in iter(mapping.readline, b""):
+        line = raw.strip()
+        if not line:
+            continue
+        fields = line.split(b",")
+        block = int(fields[block_col])
+        if blocks and block < blocks[-1]:
+            raise ValueError(f"price ticks must be sorted by block (saw {block} after {blocks[-1]})")
+        blocks.append(block)
+        prices.append(float(fields[price_col]))
+    return blocks, prices
+
+
+def _column_index(header: List[str], candidates: Sequence[str]) -> int:
+    for name in candidates:
+        if name in header:
+            return header.index(name)
+    raise ValueError(f"price CSV is missing a column named one of {', '.join(candidates)}")
+
+
+def _cumulative(blocks: Sequence[int], prices: Sequence[float]) -> array:
+    cumulative = array("d", [0.0]) * len(blocks)
+    total = 0.0
+    for i in range(1, len(blocks)):
+        total += prices[i - 1] * (blocks[i] - blocks[i - 1])
+        cumulative[i] = total
+    return cumulative
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compile recorded price ticks into a memory-mappable TWAP replay file.",
+    )
+    parser.add_argument("src", type=Path, help="CSV price file to compile.")
+    parser.add_argument("dst", type=Path, help="Binary output path.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    count = compile_price_file(args.src, args.dst)
+    print(f"ticks={count}")
+    print(f"out={args.dst}")
+
+
+if __name__ == "__main__":
+    main()